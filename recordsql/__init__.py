@@ -4,18 +4,57 @@ from .query import (
     SelectQuery,
     WithQuery,
     JoinQuery,
+    CompoundQuery,
+    ColumnarReader,
+    ExportStats,
     UPDATE,
     UpdateQuery,
     DELETE,
     DeleteQuery,
+    PurgeProgress,
     INSERT,
     InsertQuery,
     OnConflictQuery,
+    excluded,
     COUNT,
     CountQuery,
+    CountStrategy,
+    ExactCount,
+    StatEstimateCount,
+    CachedCount,
+    CounterTableCount,
     EXISTS,
     ExistsQuery,
+    batch,
+    BatchQuery,
+    Window,
+    WindowFunction,
+    over,
+    ROW_NUMBER,
+    RANK,
+    DENSE_RANK,
+    PERCENT_RANK,
+    CUME_DIST,
+    NTILE,
+    LAG,
+    LEAD,
+    FIRST_VALUE,
+    LAST_VALUE,
+    NTH_VALUE,
 )
+from .engine import Engine, ResultCache, Router, ShardedWriter, ShardLoad, Transaction, Writer, WriteResult
+from .instrumentation import (
+    Instrumentation,
+    QueryEvent,
+    LatencyAggregator,
+    CompositeInstrumentation,
+    fingerprint,
+    normalize_sql,
+    get_instrumentation,
+    set_instrumentation,
+    instrumented,
+)
+from .slowlog import SlowQueryLog
 from .types import SQLCol, SQLInput, SQLOrderBy
 
 from .dependencies import cols, col, text, set_expr, num, Func
@@ -32,15 +71,62 @@ __all__ = [
     "UpdateQuery",
     "DELETE",
     "DeleteQuery",
+    "PurgeProgress",
     "COUNT",
     "CountQuery",
+    "CountStrategy",
+    "ExactCount",
+    "StatEstimateCount",
+    "CachedCount",
+    "CounterTableCount",
     "EXISTS",
     "ExistsQuery",
     "WITH",
     "WithQuery",
+    "batch",
+    "BatchQuery",
     # Special query types
     "JoinQuery",
+    "CompoundQuery",
+    "ColumnarReader",
+    "ExportStats",
     "OnConflictQuery",
+    "excluded",
+    # Execution
+    "Engine",
+    "ResultCache",
+    "Router",
+    "ShardedWriter",
+    "ShardLoad",
+    "Transaction",
+    "Writer",
+    "WriteResult",
+    # Instrumentation
+    "Instrumentation",
+    "QueryEvent",
+    "LatencyAggregator",
+    "CompositeInstrumentation",
+    "SlowQueryLog",
+    "fingerprint",
+    "normalize_sql",
+    "get_instrumentation",
+    "set_instrumentation",
+    "instrumented",
+    # Window functions
+    "Window",
+    "WindowFunction",
+    "over",
+    "ROW_NUMBER",
+    "RANK",
+    "DENSE_RANK",
+    "PERCENT_RANK",
+    "CUME_DIST",
+    "NTILE",
+    "LAG",
+    "LEAD",
+    "FIRST_VALUE",
+    "LAST_VALUE",
+    "NTH_VALUE",
     # Type definitions
     "SQLCol",
     "SQLInput",
@@ -17,13 +17,26 @@ The RecordQuery class provides:
 from .dependencies import SQLExpression
 from typing import List, Any, Tuple, Optional
 from .validators import validate_name
+from .references import References, ReferencesMixin
+from .instrumentation import instrument_build
+from .profiling import profile_class
 
 
-class RecordQuery(SQLExpression):
+class RecordQuery(ReferencesMixin, SQLExpression):
     """
     Base class for all query builders.
+
+    Each subclass's `placeholder_pair` is wrapped so builds report to the
+    active Instrumentation (see recordsql.instrumentation), and its builder
+    methods are profiled when RECORDSQL_PROFILE is set (see recordsql.profiling).
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "placeholder_pair" in cls.__dict__:
+            cls.placeholder_pair = instrument_build(cls.__dict__["placeholder_pair"])
+        profile_class(cls)
+
     def __init__(
         self,
         table_name=None,
@@ -71,6 +84,13 @@ class RecordQuery(SQLExpression):
             validate_name(value)
         self._table_name = value
 
+    def _collect_references(self, refs: References) -> None:
+        refs.add_table(self.table_name)
+        for attribute in ("condition", "having"):
+            refs.add(getattr(self, attribute, None))
+        for attribute in ("group_by", "returning"):
+            refs.add_columns(getattr(self, attribute, None))
+
     def build(self):
         """
         Build the query.
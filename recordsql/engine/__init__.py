@@ -0,0 +1,28 @@
+"""
+Execution layer for recordsql queries.
+
+Key Classes:
+    - Engine: Executes queries on a DB-API connection
+    - ResultCache: Caches read results with table-level invalidation
+    - Router: Sends reads to a read-only pool and writes to a single writer
+    - Writer, WriteResult: Serialized writes with group commit
+    - ShardedWriter, ShardLoad: Inserts spread over several SQLite files by a key column
+    - Transaction: Counters and timings of an `Engine.transaction()` block
+"""
+from .cache import ResultCache
+from .engine import Engine
+from .router import Router
+from .shards import ShardedWriter, ShardLoad
+from .transaction import Transaction
+from .writer import Writer, WriteResult
+
+__all__ = [
+    "Engine",
+    "ResultCache",
+    "Router",
+    "ShardedWriter",
+    "ShardLoad",
+    "Transaction",
+    "Writer",
+    "WriteResult",
+]
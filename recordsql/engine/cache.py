@@ -0,0 +1,137 @@
+from __future__ import annotations
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+CacheKey = Tuple[str, Tuple[Any, ...]]
+
+
+def _normalize_table(table_name: str) -> str:
+    """SQLite table names are case-insensitive and may come quoted."""
+    return table_name.strip().strip('"').lower()
+
+
+def _query_tables(query: Any) -> FrozenSet[str]:
+    """Returns the normalized names of the tables a query reads from."""
+    return frozenset(_normalize_table(table) for table in query.referenced_tables())
+
+
+class ResultCache:
+    """
+    An LRU cache of fetched rows keyed by `(rendered SQL, params)`.
+
+    Bounded by `maxsize` entries and, optionally, by a `ttl` in seconds. Each
+    entry remembers the tables it was read from so writes can drop exactly the
+    entries they make stale. Safe to share between threads.
+
+    Every invalidation bumps a generation counter of its tables. Readers take
+    `generation(tables)` before running a query and pass it to `put`, which
+    skips rows read while one of their tables was invalidated.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[CacheKey, Tuple[Optional[float], List[Any], FrozenSet[str]]] = OrderedDict()
+        self._by_table: Dict[str, Set[CacheKey]] = {}
+        self._generations: Dict[str, int] = {}
+        self._cleared = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey, default: Any = None) -> Any:
+        """
+        Returns a copy of the cached rows for `key`, or `default` if absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, rows, _ = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return list(rows)
+                self._discard(key)
+            self.misses += 1
+            return default
+
+    def _generation(self, tables: FrozenSet[str]) -> Tuple[int, ...]:
+        return (self._cleared,) + tuple(self._generations.get(table, 0) for table in sorted(tables))
+
+    def generation(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Returns the invalidation generation of `tables`, to be passed to `put` after the read.
+        """
+        tables = frozenset(_normalize_table(table) for table in tables)
+        with self._lock:
+            return self._generation(tables)
+
+    def put(
+        self, key: CacheKey, rows: Iterable[Any], tables: Iterable[str], generation: Optional[Tuple[int, ...]] = None
+    ) -> None:
+        """
+        Stores `rows` under `key`, tagged with the tables they were read from.
+        Args:
+            key (CacheKey): The rendered SQL and its params.
+            rows (Iterable[Any]): The fetched rows.
+            tables (Iterable[str]): The tables the rows were read from.
+            generation (Optional[Tuple[int, ...]]): `generation(tables)` taken before the read. The rows
+                are not stored if any of the tables was invalidated since.
+        """
+        tables = frozenset(_normalize_table(table) for table in tables)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if generation is not None and generation != self._generation(tables):
+                return
+            self._discard(key)
+            self._entries[key] = (expires, list(rows), tables)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """
+        Drops every entry that reads from any of `tables`.
+        Returns:
+            int: The number of dropped entries.
+        """
+        dropped = 0
+        with self._lock:
+            for table in tables:
+                table = _normalize_table(table)
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._by_table.get(table, ())):
+                    self._discard(key)
+                    dropped += 1
+        return dropped
+
+    def clear(self) -> None:
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._cleared += 1
+
+    def _discard(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for table in entry[2]:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ResultCache(maxsize={self.maxsize}, ttl={self.ttl}, entries={len(self)})"
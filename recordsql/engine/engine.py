@@ -0,0 +1,211 @@
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+from ..query import (
+    SelectQuery,
+    CompoundQuery,
+    CountQuery,
+    ExistsQuery,
+    InsertQuery,
+    UpdateQuery,
+    DeleteQuery,
+)
+from ..instrumentation import QueryEvent, get_instrumentation
+from .cache import ResultCache, _query_tables
+from .transaction import TRANSACTION_MODES, Transaction, _retry_busy
+
+READ_QUERY_TYPES = (SelectQuery, CompoundQuery, CountQuery, ExistsQuery)
+WRITE_QUERY_TYPES = (InsertQuery, UpdateQuery, DeleteQuery)
+_MISSING = object()
+
+
+class Engine:
+    """
+    Executes recordsql queries on a DB-API connection.
+
+    With a ResultCache, the rows of SELECT, COUNT and EXISTS queries are served
+    from the cache, and every INSERT, UPDATE or DELETE executed through the
+    engine drops the cached results that read from its table.
+
+    Example:
+        >>> engine = Engine(sqlite3.connect("app.db"), cache=ResultCache(maxsize=4096, ttl=30))
+        >>> engine.fetchall(SELECT("id", "name").FROM("users").WHERE(col("active") == 1))
+        >>> engine.execute(UPDATE("users").SET(active=0).WHERE(col("id") == 7))  # invalidates "users"
+    """
+
+    def __init__(
+        self,
+        connection: Any,
+        cache: Optional[ResultCache] = None,
+        on_transaction: Optional[Callable[[Transaction], None]] = None,
+    ) -> None:
+        self.connection = connection
+        self.cache = cache
+        self.on_transaction = on_transaction
+        self.current_transaction: Optional[Transaction] = None
+        self.last_transaction: Optional[Transaction] = None
+
+    @staticmethod
+    def _render(query: Any) -> Tuple[str, List[Any]]:
+        if isinstance(query, (SelectQuery, CompoundQuery)):
+            return query.placeholder_pair(include_alias=False)
+        return query.placeholder_pair()
+
+    def execute(self, query: Any) -> Any:
+        """
+        Executes any query and returns the cursor. Writes invalidate the cached reads of their table.
+        Args:
+            query (RecordQuery): The query to execute.
+        Returns:
+            Any: The DB-API cursor.
+        """
+        build_start = time.perf_counter_ns()
+        sql, params = self._render(query)
+        exec_start = time.perf_counter_ns()
+        cursor = self.connection.execute(sql, params)
+        self._report_execute(query, sql, params, exec_start - build_start, time.perf_counter_ns() - exec_start)
+        written = query.table_name if isinstance(query, WRITE_QUERY_TYPES) else None
+        if written is not None:
+            self.invalidate(written)
+        if self.current_transaction is not None:
+            self.current_transaction._record_statement(written)
+        return cursor
+
+    def fetchall(self, query: Any) -> List[Any]:
+        """
+        Returns every row of a query, from the cache when possible.
+        Args:
+            query (RecordQuery): The query to run.
+        Returns:
+            List[Any]: The fetched rows.
+        """
+        if not isinstance(query, READ_QUERY_TYPES):
+            return self.execute(query).fetchall()
+        build_start = time.perf_counter_ns()
+        sql, params = self._render(query)
+        exec_start = time.perf_counter_ns()
+        if self.current_transaction is not None:
+            self.current_transaction._record_statement()
+        cached = False
+        if self.cache is None:
+            rows = self._fetch_rows(sql, params)
+        else:
+            key = (sql, tuple(params))
+            rows = self.cache.get(key, _MISSING)
+            cached = rows is not _MISSING
+            if not cached:
+                # A write committed during the read must not leave its stale rows cached
+                tables = _query_tables(query)
+                generation = self.cache.generation(tables)
+                rows = self._fetch_rows(sql, params)
+                self.cache.put(key, rows, tables, generation)
+        self._report_execute(
+            query, sql, params, exec_start - build_start, time.perf_counter_ns() - exec_start, cached
+        )
+        return rows
+
+    @staticmethod
+    def _report_execute(
+        query: Any, sql: str, params: List[Any], build_ns: int, exec_ns: int, cached: bool = False
+    ) -> None:
+        hooks = get_instrumentation()
+        if hooks is not None:
+            hooks.on_execute(QueryEvent(query, sql, params, build_ns, exec_ns, cached))
+
+    def _fetch_rows(self, sql: str, params: List[Any]) -> List[Any]:
+        return self.connection.execute(sql, params).fetchall()
+
+    def fetchone(self, query: Any) -> Optional[Any]:
+        """Returns the first row of a query, or None."""
+        rows = self.fetchall(query)
+        return rows[0] if rows else None
+
+    def scalar(self, query: Any) -> Any:
+        """Returns the first column of the first row of a query, e.g. a COUNT or EXISTS result."""
+        row = self.fetchone(query)
+        return row[0] if row is not None else None
+
+    @contextmanager
+    def transaction(self, mode: str = "DEFERRED", retries: int = 5, backoff: float = 0.05) -> Iterator[Transaction]:
+        """
+        Runs the block as one unit of work: `BEGIN <mode>` ... `COMMIT`, or ROLLBACK on error.
+
+        Nested blocks become savepoints, so an inner block can fail and roll
+        back without aborting the outer one. When the database is busy, BEGIN
+        and COMMIT are retried up to `retries` times with exponential backoff;
+        the block itself is never replayed. IMMEDIATE takes the write lock at
+        BEGIN, which is where a busy database is best retried.
+
+        Cached reads of the tables written inside a rolled-back block are dropped.
+        The finished Transaction is stored in `last_transaction` and passed to
+        `on_transaction`, e.g. to log its `elapsed_seconds`.
+
+        Args:
+            mode (str): DEFERRED, IMMEDIATE or EXCLUSIVE. Ignored for nested blocks.
+            retries (int): Maximum retries while the database is busy.
+            backoff (float): Initial delay in seconds between retries, doubled each time.
+        Yields:
+            Transaction: Live counters and timings of the block.
+        Example:
+            >>> with engine.transaction("IMMEDIATE") as tx:
+            ...     engine.execute(INSERT("name").INTO("users").VALUES("ann"))
+            ...     with engine.transaction():  # SAVEPOINT
+            ...         engine.execute(DELETE().FROM("logs"))
+            >>> tx.elapsed_seconds
+        """
+        mode = mode.strip().upper()
+        if mode not in TRANSACTION_MODES:
+            raise ValueError(f"Unsupported transaction mode: {mode}")
+        if retries < 0:
+            raise ValueError("retries cannot be negative.")
+        parent = self.current_transaction
+        connection = self.connection
+        # A transaction opened outside the engine is joined through savepoints and never committed here
+        if parent is None and not connection.in_transaction:
+            transaction = Transaction(mode, 0)
+            begin, commit, rollback = f"BEGIN {mode}", "COMMIT", ["ROLLBACK"]
+        else:
+            transaction = Transaction(mode, parent.depth + 1 if parent is not None else 1, parent)
+            savepoint = transaction.savepoint
+            begin, commit = f"SAVEPOINT {savepoint}", f"RELEASE {savepoint}"
+            rollback = [f"ROLLBACK TO {savepoint}", f"RELEASE {savepoint}"]
+        started = time.perf_counter()
+        _retry_busy(lambda: connection.execute(begin), transaction, retries, backoff)
+        transaction.wait_seconds = time.perf_counter() - started
+        self.current_transaction = transaction
+        try:
+            yield transaction
+            self.current_transaction = parent
+            started = time.perf_counter()
+            _retry_busy(lambda: connection.execute(commit), transaction, retries, backoff)
+            transaction.wait_seconds += time.perf_counter() - started
+        except BaseException:
+            self.current_transaction = parent
+            if connection.in_transaction:
+                for statement in rollback:
+                    connection.execute(statement)
+            transaction._finish(committed=False)
+            self.invalidate(*transaction.written_tables)
+            self._report(transaction)
+            raise
+        transaction._finish(committed=True)
+        self._report(transaction)
+
+    def _report(self, transaction: Transaction) -> None:
+        self.last_transaction = transaction
+        if self.on_transaction is not None:
+            self.on_transaction(transaction)
+
+    def invalidate(self, *tables: str) -> int:
+        """
+        Drops the cached results that read from any of `tables`.
+        Returns:
+            int: The number of dropped entries.
+        """
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate_tables(tables)
+
+    def __repr__(self) -> str:
+        return f"Engine(connection={self.connection!r}, cache={self.cache!r})"
@@ -0,0 +1,130 @@
+from __future__ import annotations
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple
+from .cache import ResultCache
+from .engine import Engine, READ_QUERY_TYPES, WRITE_QUERY_TYPES
+from .writer import Writer
+
+
+class Router(Engine):
+    """
+    Splits reads and writes across SQLite connections.
+
+    SELECT, COUNT and EXISTS queries run on a pool of read-only connections
+    (`mode=ro`), so readers never wait on each other. INSERT, UPDATE and DELETE
+    queries go to a single writer connection through a Writer, which serializes
+    them, merges single-row inserts and commits in groups (see Writer). The database is switched to WAL so readers and
+    the writer do not block each other.
+
+    Example:
+        >>> with Router("app.db", readers=8, cache=ResultCache(ttl=30)) as router:
+        ...     router.execute(INSERT("name").INTO("users").VALUES("ann"))
+        ...     router.fetchall(SELECT("name").FROM("users"))
+    """
+
+    def __init__(
+        self,
+        database: str,
+        readers: int = 4,
+        cache: Optional[ResultCache] = None,
+        max_batch: int = 256,
+        max_delay: float = 0.0,
+        timeout: float = 5.0,
+    ) -> None:
+        if readers < 1:
+            raise ValueError("readers must be at least 1.")
+        writer_connection = sqlite3.connect(database, timeout=timeout, isolation_level=None, check_same_thread=False)
+        writer_connection.execute("PRAGMA journal_mode=WAL")
+        super().__init__(writer_connection, cache=cache)
+        self.database = database
+        self.readers = readers
+        self.timeout = timeout
+        self.writer = Writer(writer_connection, max_batch=max_batch, max_delay=max_delay)
+        self._idle_readers: queue.LifoQueue = queue.LifoQueue()
+        self._reader_connections: List[sqlite3.Connection] = []
+        self._reader_lock = threading.Lock()
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            f"file:{self.database}?mode=ro", uri=True, timeout=self.timeout, check_same_thread=False
+        )
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrows a read-only connection from the pool, opening one if fewer than `readers` exist.
+        """
+        try:
+            connection = self._idle_readers.get_nowait()
+        except queue.Empty:
+            with self._reader_lock:
+                opened = len(self._reader_connections) < self.readers
+                if opened:
+                    connection = self._connect_reader()
+                    self._reader_connections.append(connection)
+            if not opened:
+                connection = self._idle_readers.get()
+        try:
+            yield connection
+        finally:
+            self._idle_readers.put(connection)
+
+    def _fetch_rows(self, sql: str, params: List[Any]) -> List[Any]:
+        with self.reader() as connection:
+            return connection.execute(sql, params).fetchall()
+
+    def execute(self, query: Any) -> Any:
+        """
+        Routes a query: reads return their rows, writes wait for their group commit.
+        Args:
+            query (RecordQuery): The query to execute.
+        Returns:
+            Any: The fetched rows for reads, a WriteResult for writes.
+        """
+        if isinstance(query, READ_QUERY_TYPES):
+            return self.fetchall(query)
+        if not isinstance(query, WRITE_QUERY_TYPES):
+            raise TypeError(f"Cannot route {type(query).__name__}.")
+        build_start = time.perf_counter_ns()
+        sql, params = self._render(query)
+        exec_start = time.perf_counter_ns()
+        result = self._submit(query, (sql, params)).result()
+        self._report_execute(query, sql, params, exec_start - build_start, time.perf_counter_ns() - exec_start)
+        return result
+
+    def submit(self, query: Any) -> Future:
+        """
+        Queues a write without waiting for it.
+        Returns:
+            Future: Resolves to a WriteResult once the write is committed; the cache is invalidated by then.
+        """
+        return self._submit(query)
+
+    def _submit(self, query: Any, rendered: Optional[Tuple[str, List[Any]]] = None) -> Future:
+        return self.writer.submit_query(query, on_commit=lambda: self.invalidate(query.table_name), rendered=rendered)
+
+    def transaction(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("Router commits writes in groups; use an Engine for explicit transactions.")
+
+    def close(self) -> None:
+        """Flushes pending writes and closes every connection."""
+        self.writer.close()
+        self.connection.close()
+        with self._reader_lock:
+            for connection in self._reader_connections:
+                connection.close()
+            self._reader_connections.clear()
+
+    def __enter__(self) -> "Router":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"Router(database={self.database!r}, readers={self.readers}, cache={self.cache!r})"
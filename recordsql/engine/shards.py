@@ -0,0 +1,250 @@
+from __future__ import annotations
+import sqlite3
+import threading
+import math
+import time
+import zlib
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+from ..query import InsertQuery
+from ..query.utils import get_col_value
+from ..raw_querybuilders import build_insert_template
+from .writer import Writer, WriteResult
+
+
+@dataclass(frozen=True)
+class ShardLoad:
+    """Rows written per shard by one `ShardedWriter.insert` call."""
+
+    rows: Tuple[int, ...]
+    elapsed_seconds: float
+
+    @property
+    def total(self) -> int:
+        return sum(self.rows)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def _canonical_key(value: Any) -> Any:
+    """
+    Returns the value a key is routed by: integral floats and numeric strings become numbers,
+    so 42, 42.0 and "42" (e.g. from a CSV file) land on the same shard.
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            value = int(text)
+        except ValueError:
+            try:
+                value = float(text)
+            except ValueError:
+                return value
+            if not math.isfinite(value):
+                return text
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _stable_hash(value: Any) -> int:
+    """A hash that is the same in every process, unlike `hash()` of str and bytes."""
+    if value is None:
+        raise ValueError("Rows need a non-NULL key to be routed to a shard.")
+    value = _canonical_key(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return zlib.crc32(value)
+    if isinstance(value, float):
+        return zlib.crc32(repr(value).encode("utf-8"))
+    return zlib.crc32(str(value).encode("utf-8"))
+
+
+class ShardedWriter:
+    """
+    Spreads inserts over several SQLite files by the value of a key column.
+
+    Each shard has its own connection and Writer thread, so shards commit in
+    parallel instead of queueing on one database lock; sqlite3 releases the
+    GIL while it executes. Rows are routed by a stable hash of the key
+    (`hash(key) % shards`), or by range when `bounds` is given: shard i takes
+    keys in [bounds[i - 1], bounds[i]).
+
+    Keys that look like numbers are routed as numbers, so 42, 42.0 and "42"
+    land on the same shard whether the rows come from VALUES, a frame or a
+    CSV file; with range bounds this applies when the bounds are numbers.
+    Other strings are routed as text.
+
+    Routed rows are sent to their shard
+    `batch_size` at a time as one `executemany`, and a Writer commits up to
+    `max_batch` of those per transaction. At most `max_pending` batches are
+    queued at once; routing waits for the oldest one beyond that, so memory
+    stays bounded however large the row source is.
+
+    Every batch is atomic within its shard; there is no transaction across
+    shards, so a failing batch leaves the batches of other shards committed.
+
+    Example:
+        >>> with ShardedWriter(["events_0.db", "events_1.db"], key="user_id") as shards:
+        ...     shards.execute_all("CREATE TABLE IF NOT EXISTS events (user_id INTEGER, kind TEXT)")
+        ...     load = shards.insert(INSERT.from_file("events.csv", "events"))
+        ...     print(load.rows, load.rows_per_second)
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        key: str,
+        bounds: Optional[Sequence[Any]] = None,
+        batch_size: int = 5000,
+        max_batch: int = 64,
+        max_pending: int = 32,
+        timeout: float = 5.0,
+    ) -> None:
+        if not paths:
+            raise ValueError("At least one shard path is required.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1.")
+        if bounds is not None:
+            bounds = list(bounds)
+            if len(bounds) != len(paths) - 1:
+                raise ValueError(f"{len(paths)} shards need {len(paths) - 1} range bounds, got {len(bounds)}.")
+            if any(low >= high for low, high in zip(bounds, bounds[1:])):
+                raise ValueError("Range bounds must be strictly increasing.")
+        self.paths = list(paths)
+        self.key = get_col_value(key)
+        self.bounds = bounds
+        self._numeric_bounds = bounds is not None and all(
+            isinstance(bound, (int, float)) and not isinstance(bound, bool) for bound in bounds
+        )
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.rows = [0] * len(self.paths)
+        self._lock = threading.Lock()
+        self.connections: List[sqlite3.Connection] = []
+        self.writers: List[Writer] = []
+        for path in self.paths:
+            connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self.connections.append(connection)
+            self.writers.append(Writer(connection, max_batch=max_batch))
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def shard_for(self, value: Any) -> int:
+        """Returns the index of the shard a key value belongs to."""
+        if self.bounds is None:
+            return _stable_hash(value) % len(self.paths)
+        if value is None:
+            raise ValueError("Rows need a non-NULL key to be routed to a shard.")
+        if self._numeric_bounds:
+            value = _canonical_key(value)
+        return bisect_right(self.bounds, value)
+
+    def execute_all(self, sql: str, params: Sequence[Any] = ()) -> List[WriteResult]:
+        """Runs one statement on every shard, e.g. the CREATE TABLE and CREATE INDEX of the sharded tables."""
+        futures = [writer.submit(sql, list(params)) for writer in self.writers]
+        return [future.result() for future in futures]
+
+    def submit(self, query: InsertQuery) -> List[Tuple[int, Future]]:
+        """
+        Routes the rows of an insert to their shards and queues them, waiting only while
+        `max_pending` batches are already queued.
+        Args:
+            query (InsertQuery): An insert with columns and rows (VALUES, `INSERT.from_frame` or
+                `INSERT.from_file`). OR actions and ON CONFLICT clauses apply on every shard.
+        Returns:
+            List[Tuple[int, Future]]: (shard index, future of its WriteResult), one per queued batch.
+        """
+        if not isinstance(query, InsertQuery):
+            raise TypeError("Only InsertQuery rows can be sharded.")
+        if query.returning:
+            raise ValueError("RETURNING cannot be used with sharded inserts.")
+        if not query.columns:
+            raise ValueError("Columns must be set before sharding an insert.")
+        names = [get_col_value(column) for column in query.columns]
+        if self.key not in names:
+            raise ValueError(f"The shard key {self.key!r} is not one of the inserted columns {names}.")
+        index = names.index(self.key)
+        sql = build_insert_template(
+            table_name=query.table_name,
+            columns=query.columns,
+            or_action=query.or_action,
+            on_conflict=query.on_conflict,
+            ignore_forbidden_chars=query.ignore_forbidden_characters,
+        )
+        route = self.shard_for
+        batch_size = self.batch_size
+        buckets: List[List[Any]] = [[] for _ in self.paths]
+        pending: List[Tuple[int, Future]] = []
+        in_flight: Deque[Future] = deque()
+
+        def queue(shard: int, bucket: List[Any]) -> None:
+            future = self.writers[shard].submit_many(sql, bucket)
+            pending.append((shard, future))
+            in_flight.append(future)
+            while in_flight and (in_flight[0].done() or len(in_flight) > self.max_pending):
+                # Waits without raising; failures are reported through the returned futures
+                in_flight.popleft().exception()
+
+        for row in query._default_rows("submit"):
+            shard = route(row[index])
+            bucket = buckets[shard]
+            bucket.append(row)
+            if len(bucket) >= batch_size:
+                queue(shard, bucket)
+                buckets[shard] = []
+        for shard, bucket in enumerate(buckets):
+            if bucket:
+                queue(shard, bucket)
+        return pending
+
+    def insert(self, query: InsertQuery) -> ShardLoad:
+        """
+        Routes, writes and commits the rows of an insert, waiting for every shard.
+        Returns:
+            ShardLoad: Rows written per shard, their total and rows_per_second.
+        Raises:
+            Exception: The first failure of any batch, once every batch has finished.
+        """
+        started = time.perf_counter()
+        pending = self.submit(query)
+        counts = [0] * len(self.paths)
+        error: Optional[BaseException] = None
+        for shard, future in pending:
+            try:
+                counts[shard] += future.result().rowcount
+            except Exception as failure:
+                error = error or failure
+        with self._lock:
+            for shard, count in enumerate(counts):
+                self.rows[shard] += count
+        if error is not None:
+            raise error
+        return ShardLoad(tuple(counts), time.perf_counter() - started)
+
+    def close(self) -> None:
+        """Finishes the queued batches, stops the writer threads and closes the shard connections."""
+        for writer in self.writers:
+            writer.close()
+        for connection in self.connections:
+            connection.close()
+
+    def __enter__(self) -> ShardedWriter:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        routing = "range" if self.bounds is not None else "hash"
+        return f"ShardedWriter(shards={len(self)}, key={self.key!r}, routing={routing!r}, rows={sum(self.rows)})"
@@ -0,0 +1,86 @@
+from __future__ import annotations
+import sqlite3
+import time
+from typing import Any, Callable, Optional, Set
+
+TRANSACTION_MODES = {"DEFERRED", "IMMEDIATE", "EXCLUSIVE"}
+_SQLITE_BUSY = 5
+_SQLITE_LOCKED = 6
+
+
+def _is_busy(error: BaseException) -> bool:
+    """True if `error` means another connection holds the lock (SQLITE_BUSY / SQLITE_LOCKED)."""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (_SQLITE_BUSY, _SQLITE_LOCKED)
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+def _retry_busy(action: Callable[[], Any], transaction: Transaction, retries: int, backoff: float) -> Any:
+    """Runs `action`, retrying with exponential backoff while the database is busy."""
+    delay = backoff
+    for attempt in range(retries + 1):
+        try:
+            return action()
+        except sqlite3.OperationalError as error:
+            if attempt == retries or not _is_busy(error):
+                raise
+            transaction.retries += 1
+            time.sleep(delay)
+            delay *= 2
+
+
+class Transaction:
+    """
+    A unit of work opened by `Engine.transaction()`.
+
+    The outermost transaction runs `BEGIN <mode>` ... `COMMIT`; nested ones are
+    savepoints that can roll back on their own. Timings and counters are kept
+    up to date while the block runs and are final once it exits.
+
+    Attributes:
+        mode (str): DEFERRED, IMMEDIATE or EXCLUSIVE.
+        depth (int): 0 for the outermost transaction, 1+ for savepoints.
+        statements (int): Queries executed through the engine inside the block, nested blocks included.
+        retries (int): Times BEGIN or COMMIT was retried because the database was busy.
+        committed (Optional[bool]): True once committed / released, False once rolled back.
+        wait_seconds (float): Time spent waiting for the lock, retries included.
+        elapsed_seconds (float): Time from BEGIN to COMMIT or ROLLBACK.
+    """
+
+    def __init__(self, mode: str, depth: int, parent: Optional[Transaction] = None) -> None:
+        self.mode = mode
+        self.depth = depth
+        self.parent = parent
+        self.statements = 0
+        self.retries = 0
+        self.committed: Optional[bool] = None
+        self.wait_seconds = 0.0
+        self.elapsed_seconds = 0.0
+        self.written_tables: Set[str] = set()
+        self._started = time.perf_counter()
+
+    @property
+    def savepoint(self) -> str:
+        return f"recordsql_sp_{self.depth}"
+
+    def _record_statement(self, table_name: Optional[str] = None) -> None:
+        transaction = self
+        while transaction is not None:
+            transaction.statements += 1
+            if table_name is not None:
+                transaction.written_tables.add(table_name)
+            transaction = transaction.parent
+
+    def _finish(self, committed: bool) -> None:
+        self.committed = committed
+        self.elapsed_seconds = time.perf_counter() - self._started
+
+    def __repr__(self) -> str:
+        return (
+            f"Transaction(mode={self.mode!r}, depth={self.depth}, statements={self.statements}, "
+            f"retries={self.retries}, committed={self.committed}, elapsed_seconds={self.elapsed_seconds:.6f})"
+        )
@@ -0,0 +1,355 @@
+from __future__ import annotations
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from ..query import InsertQuery, UpdateQuery, DeleteQuery
+from ..query.utils import get_col_value
+from ..raw_querybuilders.formatters import _format_table_name, _plain_row_template, _row_placeholder
+from ..raw_querybuilders.insert import _format_insert_prefix
+from ..raw_querybuilders.utils import DEFAULT_MAX_PARAMS
+
+_STOP = object()
+_ROWID_NAMES = frozenset({"rowid", "oid", "_rowid_"})
+_SCHEMA_PREFIXES = ("CREATE", "ALTER", "DROP")
+
+
+@dataclass(frozen=True)
+class WriteResult:
+    """The outcome of one write statement executed by a Writer."""
+
+    rowcount: int
+    lastrowid: Optional[int]
+    rows: List[Any] = field(default_factory=list)
+
+    def fetchall(self) -> List[Any]:
+        """Returns the RETURNING rows, mirroring the cursor API."""
+        return list(self.rows)
+
+
+class _PendingWrite:
+    """A queued statement. Single-row inserts also carry the parts needed to merge them."""
+
+    __slots__ = ("sql", "params", "many", "future", "on_commit", "prefix", "row", "row_params", "table", "columns")
+
+    def __init__(
+        self, sql: str, params: Any, on_commit: Optional[Callable[[], None]], many: bool = False
+    ) -> None:
+        self.sql = sql
+        self.params = params
+        self.many = many
+        self.future: Future = Future()
+        self.on_commit = on_commit
+        self.prefix: Optional[str] = None
+        self.row: Optional[str] = None
+        self.row_params: List[Any] = []
+        self.table: Optional[str] = None
+        self.columns: FrozenSet[str] = frozenset()
+
+
+def _is_schema_change(sql: str) -> bool:
+    return sql.lstrip().upper().startswith(_SCHEMA_PREFIXES)
+
+
+def _is_mergeable_insert(query: Any) -> bool:
+    """
+    True for plain single-row inserts. OR actions, ON CONFLICT and RETURNING are excluded:
+    they may skip or reorder rows, which would break the per-row lastrowid.
+    """
+    return (
+        isinstance(query, InsertQuery)
+        and bool(query.columns)
+        and bool(query.values)
+        and not query.bulk
+        and not query.or_action
+        and not query.on_conflict
+        and not query.returning
+    )
+
+
+class Writer:
+    """
+    Serializes every write on one connection and commits them in groups.
+
+    A background thread takes statements from a queue. Whatever is pending when
+    it wakes up, plus anything arriving within `max_delay` seconds, up to
+    `max_batch` statements, runs in a single transaction with one COMMIT, so
+    concurrent writers share the cost of the fsync. Each statement runs in its
+    own savepoint: a failing statement only fails its own future.
+
+    Consecutive single-row inserts queued with `submit_query` into the same
+    table and columns are merged into one multi-row INSERT. Each caller still
+    gets its own WriteResult with its own lastrowid; if the merged statement
+    fails, its rows are retried one by one.
+
+    Whether a table's rowid is auto-assigned is looked up once per table and
+    cached. CREATE, ALTER and DROP statements run through the writer clear
+    that cache; call `reset_schema_cache()` after changing the schema on
+    another connection.
+
+    The connection must be in autocommit mode (`isolation_level=None`) and may
+    only be used by this writer once it is started.
+    """
+
+    def __init__(
+        self,
+        connection: Any,
+        max_batch: int = 256,
+        max_delay: float = 0.0,
+        max_params: int = DEFAULT_MAX_PARAMS,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1.")
+        if max_delay < 0:
+            raise ValueError("max_delay cannot be negative.")
+        self.connection = connection
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_params = max_params
+        self.commits = 0
+        self.statements = 0
+        self.merged = 0
+        self._rowid_aliases: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="recordsql-writer", daemon=True)
+        self._thread.start()
+
+    def _enqueue(self, write: _PendingWrite) -> Future:
+        if self._closed:
+            raise RuntimeError("Writer is closed.")
+        self._queue.put(write)
+        return write.future
+
+    def submit(self, sql: str, params: List[Any], on_commit: Optional[Callable[[], None]] = None) -> Future:
+        """
+        Queues a write statement.
+        Args:
+            sql (str): The statement.
+            params (List[Any]): Its parameters.
+            on_commit (Optional[Callable[[], None]]): Called after the commit, before the future resolves.
+                If it raises, the future fails with its error although the write stays committed.
+        Returns:
+            Future: Resolves to a WriteResult once the statement is committed.
+        """
+        return self._enqueue(_PendingWrite(sql, params, on_commit))
+
+    def submit_many(
+        self, sql: str, rows: Iterable[Iterable[Any]], on_commit: Optional[Callable[[], None]] = None
+    ) -> Future:
+        """
+        Queues a statement run once per row with `executemany`, e.g. a single-row INSERT template.
+        Args:
+            sql (str): The statement.
+            rows (Iterable[Iterable[Any]]): One parameter row per execution; consumed by the writer thread.
+            on_commit (Optional[Callable[[], None]]): Called after the commit, before the future resolves.
+                If it raises, the future fails with its error although the write stays committed.
+        Returns:
+            Future: Resolves to a WriteResult (total rowcount, no lastrowid) once the rows are committed.
+        """
+        return self._enqueue(_PendingWrite(sql, rows, on_commit, many=True))
+
+    def submit_query(
+        self,
+        query: Any,
+        on_commit: Optional[Callable[[], None]] = None,
+        rendered: Optional[Tuple[str, List[Any]]] = None,
+    ) -> Future:
+        """
+        Queues an INSERT, UPDATE or DELETE query, rendered in the calling thread.
+        Plain single-row inserts may be merged with their neighbours in the queue.
+        Args:
+            query (Union[InsertQuery, UpdateQuery, DeleteQuery]): The write.
+            on_commit (Optional[Callable[[], None]]): Called after the commit, before the future resolves.
+                If it raises, the future fails with its error although the write stays committed.
+            rendered (Optional[Tuple[str, List[Any]]]): The query's placeholder_pair(), if already rendered.
+        Returns:
+            Future: Resolves to a WriteResult once the statement is committed.
+        """
+        if not isinstance(query, (InsertQuery, UpdateQuery, DeleteQuery)):
+            raise TypeError("Only InsertQuery, UpdateQuery and DeleteQuery can be written.")
+        sql, params = rendered if rendered is not None else query.placeholder_pair()
+        write = _PendingWrite(sql, params, on_commit)
+        if _is_mergeable_insert(query):
+            width = len(query.columns)
+            write.prefix = _format_insert_prefix(
+                query.table_name, query.columns, ignore_forbidden_chars=query.ignore_forbidden_characters
+            )
+            write.row, write.row_params = _row_placeholder(query.values, width, _plain_row_template(width))
+            write.table = query.table_name
+            write.columns = frozenset(str(get_col_value(column)).lower() for column in query.columns)
+        return self._enqueue(write)
+
+    def pause(self) -> None:
+        """Holds queued statements until `resume()`, so they are committed as one group."""
+        self._running.clear()
+
+    def resume(self) -> None:
+        self._running.set()
+
+    def _next_batch(self) -> Tuple[List[_PendingWrite], bool]:
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        self._running.wait()
+        batch = [item]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if batch:
+                self._commit_batch(batch)
+
+    def reset_schema_cache(self) -> None:
+        """Forgets the cached rowid columns of every table, e.g. after DDL run on another connection."""
+        self._rowid_aliases.clear()
+
+    def _rowid_columns(self, table_name: str) -> Optional[FrozenSet[str]]:
+        """
+        Returns the column names aliasing the rowid of a table, or None for WITHOUT ROWID tables.
+        """
+        if table_name not in self._rowid_aliases:
+            table = _format_table_name(table_name, validate=False)
+            info = self.connection.execute(f"PRAGMA table_info({table})").fetchall()
+            if not info:
+                # The table does not exist (yet); the insert will fail on its own
+                return None
+            keys = [row for row in info if row[5]]
+            aliases = set(_ROWID_NAMES)
+            if len(keys) == 1 and str(keys[0][2]).upper() == "INTEGER":
+                aliases.add(keys[0][1].lower())
+            try:
+                self.connection.execute(f"SELECT rowid FROM {table} LIMIT 0")
+            except Exception:
+                aliases = None
+            self._rowid_aliases[table_name] = frozenset(aliases) if aliases is not None else None
+        return self._rowid_aliases[table_name]
+
+    def _can_merge(self, write: _PendingWrite) -> bool:
+        # Rows inserted by one statement get consecutive rowids only when the rowid is auto-assigned
+        if write.prefix is None:
+            return False
+        aliases = self._rowid_columns(write.table)
+        return aliases is not None and not write.columns & aliases
+
+    def _groups(self, batch: List[_PendingWrite]) -> List[List[_PendingWrite]]:
+        """Splits a batch into runs of consecutive mergeable inserts sharing a prefix, and single writes."""
+        if any(_is_schema_change(write.sql) for write in batch):
+            # Inserts after the schema change cannot be checked against the schema they will meet
+            self.reset_schema_cache()
+            return [[write] for write in batch]
+        groups: List[List[_PendingWrite]] = []
+        params = 0
+        for write in batch:
+            mergeable = self._can_merge(write)
+            last = groups[-1] if groups else None
+            if (
+                mergeable
+                and last is not None
+                and last[0].prefix == write.prefix
+                and self._can_merge(last[0])
+                and params + len(write.row_params) <= self.max_params
+            ):
+                last.append(write)
+                params += len(write.row_params)
+            else:
+                groups.append([write])
+                params = len(write.row_params)
+        return groups
+
+    def _execute(self, sql: str, params: List[Any]) -> WriteResult:
+        cursor = self.connection.execute(sql, params)
+        rows = cursor.fetchall() if cursor.description else []
+        return WriteResult(cursor.rowcount, cursor.lastrowid, rows)
+
+    def _execute_single(self, write: _PendingWrite, outcomes: List[Tuple[Any, ...]]) -> None:
+        connection = self.connection
+        connection.execute("SAVEPOINT recordsql_write")
+        try:
+            if write.many:
+                result = WriteResult(connection.executemany(write.sql, write.params).rowcount, None)
+            else:
+                result = self._execute(write.sql, write.params)
+            outcomes.append((write, result, None))
+        except Exception as error:
+            connection.execute("ROLLBACK TO recordsql_write")
+            outcomes.append((write, None, error))
+        connection.execute("RELEASE recordsql_write")
+
+    def _execute_merged(self, group: List[_PendingWrite], outcomes: List[Tuple[Any, ...]]) -> None:
+        connection = self.connection
+        sql = group[0].prefix + ", ".join(write.row for write in group)
+        params = [param for write in group for param in write.row_params]
+        connection.execute("SAVEPOINT recordsql_write")
+        try:
+            cursor = connection.execute(sql, params)
+        except Exception:
+            connection.execute("ROLLBACK TO recordsql_write")
+            connection.execute("RELEASE recordsql_write")
+            for write in group:
+                self._execute_single(write, outcomes)
+            return
+        connection.execute("RELEASE recordsql_write")
+        first_rowid = cursor.lastrowid - len(group) + 1
+        for offset, write in enumerate(group):
+            outcomes.append((write, WriteResult(1, first_rowid + offset), None))
+        self.merged += len(group) - 1
+
+    def _commit_batch(self, batch: List[_PendingWrite]) -> None:
+        connection = self.connection
+        outcomes: List[Tuple[Any, ...]] = []
+        merged = self.merged
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            for group in self._groups(batch):
+                if len(group) > 1:
+                    self._execute_merged(group, outcomes)
+                else:
+                    self._execute_single(group[0], outcomes)
+            connection.execute("COMMIT")
+        except Exception as error:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            self.merged = merged
+            for write in batch:
+                write.future.set_exception(error)
+            return
+        self.commits += 1
+        self.statements += len(batch)
+        for write, result, error in outcomes:
+            if error is not None:
+                write.future.set_exception(error)
+                continue
+            if write.on_commit is not None:
+                # The write is committed either way; a failing callback must not stop the writer thread
+                try:
+                    write.on_commit()
+                except Exception as callback_error:
+                    write.future.set_exception(callback_error)
+                    continue
+            write.future.set_result(result)
+
+    def close(self) -> None:
+        """Finishes the queued writes and stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._running.set()
+        self._queue.put(_STOP)
+        self._thread.join()
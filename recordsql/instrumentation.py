@@ -0,0 +1,317 @@
+"""
+Instrumentation hooks for query building and execution.
+
+Every `placeholder_pair()` of a RecordQuery subclass, and every Engine call,
+reports to the active Instrumentation, if any. With none installed (the
+default) the only cost is one global lookup per call.
+
+Key Classes:
+    - Instrumentation: No-op base class; override the hooks you need
+    - QueryEvent: What a hook receives (query type, table, fingerprint, timings)
+    - LatencyAggregator: Collects p50 / p99 build and execution times per query shape
+    - CompositeInstrumentation: Forwards events to several instrumentations
+
+Example:
+    >>> aggregator = LatencyAggregator()
+    >>> with instrumented(aggregator):
+    ...     engine.fetchall(SELECT("name").FROM("users"))
+    >>> aggregator.report()
+"""
+from __future__ import annotations
+import functools
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+_active: Optional["Instrumentation"] = None
+_local = threading.local()
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.\"])\d+(?:\.\d+)?(?![\w\"])")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE)
+_PLACEHOLDER_ROW = r"\(\?(?:, \?)*\)"
+_VALUES_ROWS = re.compile(rf"\bVALUES {_PLACEHOLDER_ROW}(?:, {_PLACEHOLDER_ROW})*", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_sql(sql: str) -> str:
+    """
+    Reduces a statement to its shape: whitespace collapsed, string and number literals
+    replaced by `?`, IN lists collapsed to `IN (?+)` and multi-row VALUES to `VALUES (?+)`.
+    Example:
+        >>> normalize_sql('SELECT * FROM "t" WHERE id IN (?, ?, ?) LIMIT 10')
+        'SELECT * FROM "t" WHERE id IN (?+) LIMIT ?'
+    """
+    normalized = " ".join(sql.split())
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?+)", normalized)
+    return _VALUES_ROWS.sub("VALUES (?+)", normalized)
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    """
+    Returns a short stable identifier of the shape of a statement (see `normalize_sql`),
+    e.g. '3f1c9a0b2d4e5f60'. Queries differing only in values or IN-list lengths share it.
+    """
+    return hashlib.blake2b(normalize_sql(sql).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def query_type(query: Any) -> str:
+    """Returns the statement kind of a query, e.g. 'SELECT', 'INSERT' or 'COMPOUND'."""
+    name = getattr(type(query), "name", None)
+    if isinstance(name, str):
+        return name
+    name = type(query).__name__
+    return (name[: -len("Query")] if name.endswith("Query") else name).upper()
+
+
+class QueryEvent:
+    """
+    One build or execution of a query, as passed to the hooks.
+
+    Attributes:
+        query_type (str): e.g. 'SELECT', 'INSERT'.
+        table (Optional[str]): The main table of the query.
+        sql (str): The rendered SQL, with placeholders.
+        fingerprint (str): `fingerprint(sql)`, shared by every query of the same shape.
+        param_count (int): Number of bound parameters.
+        build_ns (int): Nanoseconds spent in `placeholder_pair()`.
+        exec_ns (int): Nanoseconds spent executing; 0 for build-only events.
+        cached (bool): True if an engine read was served from its cache.
+    """
+
+    __slots__ = ("query_type", "table", "sql", "fingerprint", "param_count", "build_ns", "exec_ns", "cached")
+
+    def __init__(
+        self,
+        query: Any,
+        sql: str,
+        params: List[Any],
+        build_ns: int,
+        exec_ns: int = 0,
+        cached: bool = False,
+    ) -> None:
+        self.query_type = query_type(query)
+        self.table = getattr(query, "table_name", None)
+        self.sql = sql
+        self.fingerprint = fingerprint(sql)
+        self.param_count = len(params)
+        self.build_ns = build_ns
+        self.exec_ns = exec_ns
+        self.cached = cached
+
+    @property
+    def shape(self) -> Tuple[str, Optional[str], str]:
+        """The (query type, table, fingerprint) triple queries are aggregated by."""
+        return self.query_type, self.table, self.fingerprint
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryEvent({self.query_type} {self.table!r}, fingerprint={self.fingerprint!r}, "
+            f"params={self.param_count}, build_ns={self.build_ns}, exec_ns={self.exec_ns})"
+        )
+
+
+class Instrumentation:
+    """
+    Receives build and execution events. Every hook is a no-op; subclasses override what they need.
+
+    Hooks run synchronously in the thread that builds or executes the query and
+    should be cheap. Nested builds (subqueries, CTEs) are part of the outer build
+    and are not reported on their own.
+    """
+
+    def on_build_start(self, query: Any) -> None:
+        """Called before a query is rendered."""
+
+    def on_build_end(self, event: QueryEvent) -> None:
+        """Called after a query is rendered, with `build_ns` set."""
+
+    def on_execute(self, event: QueryEvent) -> None:
+        """Called after an Engine executed a query, with `build_ns` and `exec_ns` set."""
+
+
+class CompositeInstrumentation(Instrumentation):
+    """Forwards every event to several instrumentations, in order."""
+
+    def __init__(self, *instrumentations: Instrumentation) -> None:
+        for item in instrumentations:
+            if not isinstance(item, Instrumentation):
+                raise TypeError("CompositeInstrumentation accepts Instrumentation instances only.")
+        self.instrumentations = instrumentations
+
+    def on_build_start(self, query: Any) -> None:
+        for item in self.instrumentations:
+            item.on_build_start(query)
+
+    def on_build_end(self, event: QueryEvent) -> None:
+        for item in self.instrumentations:
+            item.on_build_end(event)
+
+    def on_execute(self, event: QueryEvent) -> None:
+        for item in self.instrumentations:
+            item.on_execute(event)
+
+    def __repr__(self) -> str:
+        return f"CompositeInstrumentation{self.instrumentations!r}"
+
+
+def get_instrumentation() -> Optional[Instrumentation]:
+    """Returns the active Instrumentation, or None."""
+    return _active
+
+
+def set_instrumentation(instrumentation: Optional[Instrumentation]) -> Optional[Instrumentation]:
+    """
+    Installs `instrumentation` process-wide; None turns instrumentation off.
+    Returns:
+        Optional[Instrumentation]: The previously active instrumentation.
+    """
+    global _active
+    if instrumentation is not None and not isinstance(instrumentation, Instrumentation):
+        raise TypeError("instrumentation must be an Instrumentation instance or None.")
+    previous, _active = _active, instrumentation
+    return previous
+
+
+@contextmanager
+def instrumented(instrumentation: Instrumentation) -> Iterator[Instrumentation]:
+    """Installs `instrumentation` for the duration of the block."""
+    previous = set_instrumentation(instrumentation)
+    try:
+        yield instrumentation
+    finally:
+        set_instrumentation(previous)
+
+
+def instrument_build(method: Callable[..., Tuple[str, List[Any]]]) -> Callable[..., Tuple[str, List[Any]]]:
+    """Wraps a `placeholder_pair` method so the outermost call reports to the active instrumentation."""
+
+    @functools.wraps(method)
+    def placeholder_pair(self, *args, **kwargs):
+        hooks = _active
+        if hooks is None or getattr(_local, "building", False):
+            return method(self, *args, **kwargs)
+        _local.building = True
+        try:
+            hooks.on_build_start(self)
+            start = time.perf_counter_ns()
+            result = method(self, *args, **kwargs)
+            build_ns = time.perf_counter_ns() - start
+        finally:
+            _local.building = False
+        sql, params = result
+        hooks.on_build_end(QueryEvent(self, sql, params, build_ns))
+        return result
+
+    return placeholder_pair
+
+
+def _percentile(samples: List[int], fraction: float) -> int:
+    """Nearest-rank percentile of already sorted samples."""
+    if not samples:
+        return 0
+    rank = max(1, math.ceil(fraction * len(samples)))
+    return samples[rank - 1]
+
+
+class _ShapeStats:
+    __slots__ = ("sql", "builds", "executions", "build_samples", "exec_samples")
+
+    def __init__(self, sql: str, maxlen: int) -> None:
+        self.sql = sql
+        self.builds = 0
+        self.executions = 0
+        self.build_samples: Deque[int] = deque(maxlen=maxlen)
+        self.exec_samples: Deque[int] = deque(maxlen=maxlen)
+
+
+class LatencyAggregator(Instrumentation):
+    """
+    Aggregates build and execution times per query shape (query type, table, fingerprint).
+
+    Keeps the last `samples` timings of each shape for the percentiles and at
+    most `max_shapes` shapes; events of further shapes are counted in `dropped`.
+    Safe to share between threads.
+    """
+
+    def __init__(self, samples: int = 1024, max_shapes: int = 1024) -> None:
+        if samples < 1:
+            raise ValueError("samples must be at least 1.")
+        if max_shapes < 1:
+            raise ValueError("max_shapes must be at least 1.")
+        self.samples = samples
+        self.max_shapes = max_shapes
+        self.dropped = 0
+        self._shapes: Dict[Tuple[str, Optional[str], str], _ShapeStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, event: QueryEvent) -> Optional[_ShapeStats]:
+        stats = self._shapes.get(event.shape)
+        if stats is None:
+            if len(self._shapes) >= self.max_shapes:
+                self.dropped += 1
+                return None
+            stats = self._shapes[event.shape] = _ShapeStats(event.sql, self.samples)
+        return stats
+
+    def on_build_end(self, event: QueryEvent) -> None:
+        with self._lock:
+            stats = self._stats(event)
+            if stats is not None:
+                stats.builds += 1
+                stats.build_samples.append(event.build_ns)
+
+    def on_execute(self, event: QueryEvent) -> None:
+        with self._lock:
+            stats = self._stats(event)
+            if stats is not None:
+                stats.executions += 1
+                stats.exec_samples.append(event.exec_ns)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Returns one row per query shape, slowest p99 execution first.
+        Returns:
+            List[Dict[str, Any]]: Keys query_type, table, fingerprint, sql, builds, executions,
+                build_p50_ns, build_p99_ns, exec_p50_ns and exec_p99_ns.
+        """
+        with self._lock:
+            shapes = [(shape, stats, sorted(stats.build_samples), sorted(stats.exec_samples))
+                      for shape, stats in self._shapes.items()]
+        rows = []
+        for (kind, table, shape_fingerprint), stats, builds, executions in shapes:
+            rows.append({
+                "query_type": kind,
+                "table": table,
+                "fingerprint": shape_fingerprint,
+                "sql": stats.sql,
+                "builds": stats.builds,
+                "executions": stats.executions,
+                "build_p50_ns": _percentile(builds, 0.50),
+                "build_p99_ns": _percentile(builds, 0.99),
+                "exec_p50_ns": _percentile(executions, 0.50),
+                "exec_p99_ns": _percentile(executions, 0.99),
+            })
+        rows.sort(key=lambda row: (row["exec_p99_ns"], row["build_p99_ns"]), reverse=True)
+        return rows
+
+    def reset(self) -> None:
+        """Forgets every shape."""
+        with self._lock:
+            self._shapes.clear()
+            self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def __repr__(self) -> str:
+        return f"LatencyAggregator(shapes={len(self)}, samples={self.samples})"
@@ -0,0 +1,171 @@
+"""
+Opt-in profiling of query building.
+
+Set the environment variable RECORDSQL_PROFILE before importing recordsql to
+count the calls and the cumulative time of every fluent builder method (e.g.
+`SelectQuery.WHERE`), every formatter in raw_querybuilders/formatters.py and
+the argument helpers of query/utils.py and validators.py, the latter under
+their full module name (e.g. `recordsql.query.utils.enlist`). Functions
+decorated with `normalize_args` get one row each for the time spent
+normalizing their arguments, e.g.
+`recordsql.query.utils.normalize_args(SelectQuery.SELECT)`. A table sorted by
+total time is printed to stderr at exit; if the variable holds a path other
+than "1", "true" or "yes", the table is written to that file instead.
+
+When the variable is unset, nothing is wrapped and profiling costs nothing.
+
+Key Classes:
+    - Profiler: Thread-safe call counters and timers, one per profiled name
+
+Example:
+    $ RECORDSQL_PROFILE=1 python nightly_job.py
+"""
+from __future__ import annotations
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+from types import FunctionType
+from typing import Any, Callable, Dict, Iterable, List
+
+PROFILE_ENV_VAR = "RECORDSQL_PROFILE"
+_FALSE_VALUES = {"", "0", "false", "no", "off"}
+_STDERR_VALUES = {"1", "true", "yes", "on"}
+
+
+class Profiler:
+    """
+    Counts calls and cumulative nanoseconds per name.
+
+    Times are inclusive: a builder method's time includes the formatters it calls.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                self._stats[name] = [1, elapsed_ns]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed_ns
+
+    def wrap(self, func: Callable, name: str) -> Callable:
+        """Returns `func` wrapped so every call is recorded under `name`."""
+        record = self.record
+        perf_counter_ns = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def profiled(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, perf_counter_ns() - start)
+
+        return profiled
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Returns one row per profiled name, most total time first.
+        Returns:
+            List[Dict[str, Any]]: Keys name, calls, total_ms and mean_us.
+        """
+        with self._lock:
+            items = [(name, calls, total) for name, (calls, total) in self._stats.items()]
+        rows = [
+            {"name": name, "calls": calls, "total_ms": total / 1e6, "mean_us": total / calls / 1e3}
+            for name, calls, total in items
+        ]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def format_report(self, limit: int = 50) -> str:
+        """Renders `report()` as a fixed-width text table."""
+        rows = self.report()[:limit]
+        width = max([len("name")] + [len(row["name"]) for row in rows])
+        lines = [f"{'name':<{width}}  {'calls':>10}  {'total ms':>12}  {'mean us':>10}"]
+        lines.append("-" * len(lines[0]))
+        for row in rows:
+            lines.append(
+                f"{row['name']:<{width}}  {row['calls']:>10}  {row['total_ms']:>12.3f}  {row['mean_us']:>10.3f}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+
+PROFILER = Profiler()
+_setting = os.environ.get(PROFILE_ENV_VAR, "").strip()
+ENABLED = _setting.lower() not in _FALSE_VALUES
+
+
+def profile_namespace(
+    namespace: Dict[str, Any], profiler: Profiler = PROFILER, force: bool = False, exclude: Iterable[str] = ()
+) -> int:
+    """
+    Wraps, in place, every function defined in the module owning `namespace`, recorded as `<module>.<name>`.
+    Called as `profile_namespace(globals())` at the end of a module, so later
+    `from module import name` imports and the module's own calls get the
+    wrapped functions. Does nothing unless profiling is enabled or `force` is set.
+    Args:
+        exclude (Iterable[str]): Names left unwrapped, e.g. decorator factories that only run at import.
+    Returns:
+        int: The number of wrapped functions.
+    """
+    if not (ENABLED or force):
+        return 0
+    module_name = namespace["__name__"]
+    exclude = set(exclude)
+    wrapped = 0
+    for name, value in list(namespace.items()):
+        if isinstance(value, FunctionType) and value.__module__ == module_name and name not in exclude:
+            namespace[name] = profiler.wrap(value, f"{module_name}.{name}")
+            wrapped += 1
+    return wrapped
+
+
+def _is_builder_method(name: str) -> bool:
+    return name == "placeholder_pair" or (name.isupper() and not name.startswith("_"))
+
+
+def profile_class(cls: type, profiler: Profiler = PROFILER, force: bool = False) -> int:
+    """
+    Wraps, in place, the fluent builder methods (UPPERCASE names) and `placeholder_pair` of `cls`.
+    Does nothing unless profiling is enabled or `force` is set.
+    Returns:
+        int: The number of wrapped methods.
+    """
+    if not (ENABLED or force):
+        return 0
+    wrapped = 0
+    for name, value in list(vars(cls).items()):
+        if isinstance(value, FunctionType) and _is_builder_method(name):
+            setattr(cls, name, profiler.wrap(value, f"{cls.__name__}.{name}"))
+            wrapped += 1
+    return wrapped
+
+
+def _report_at_exit() -> None:
+    if not len(PROFILER):
+        return
+    table = PROFILER.format_report()
+    if _setting.lower() in _STDERR_VALUES:
+        print(f"recordsql profile\n{table}", file=sys.stderr)
+    else:
+        with open(_setting, "w", encoding="utf-8") as file:
+            file.write(table + "\n")
+
+
+if ENABLED:
+    atexit.register(_report_at_exit)
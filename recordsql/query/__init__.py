@@ -6,11 +6,14 @@ SQL queries in a fluent, composable way.
 
 Key Classes:
     - SELECT, SelectQuery, WITH, WithQuery, JoinQuery: For SELECT queries
+    - CompoundQuery: For UNION / UNION ALL / INTERSECT / EXCEPT queries
     - INSERT, InsertQuery, OnConflictQuery: For INSERT queries
     - UPDATE, UpdateQuery: For UPDATE queries
     - DELETE, DeleteQuery: For DELETE queries
     - COUNT, CountQuery: For COUNT queries
     - EXISTS, ExistsQuery: For EXISTS queries
+    - batch, BatchQuery: For running several read queries in one round trip
+    - Window, WindowFunction, over: For window functions (OVER / WINDOW clauses)
 
 Example:
     >>> from recordsql import SELECT, cols
@@ -19,12 +22,33 @@ Example:
     >>> print(query.placeholder_pair())
 """
 # QueryBuilds/query/record_queries/__init__.py
-from .select import SELECT, SelectQuery, WITH, WithQuery, JoinQuery
+from .select import SELECT, SelectQuery, WITH, WithQuery, JoinQuery, CompoundQuery
+from .columnar import ColumnarReader
+from .export import ExportStats
 from .insert import INSERT, InsertQuery, OnConflictQuery
+from ..raw_querybuilders import excluded
 from .update import UPDATE, UpdateQuery
-from .delete import DELETE, DeleteQuery
+from .delete import DELETE, DeleteQuery, PurgeProgress
 from .count import COUNT, CountQuery
+from .count_strategies import CountStrategy, ExactCount, StatEstimateCount, CachedCount, CounterTableCount
 from .exists import EXISTS, ExistsQuery
+from .batch import batch, BatchQuery
+from .window import (
+    Window,
+    WindowFunction,
+    over,
+    ROW_NUMBER,
+    RANK,
+    DENSE_RANK,
+    PERCENT_RANK,
+    CUME_DIST,
+    NTILE,
+    LAG,
+    LEAD,
+    FIRST_VALUE,
+    LAST_VALUE,
+    NTH_VALUE,
+)
 
 __all__ = [
     "SELECT",
@@ -32,15 +56,41 @@ __all__ = [
     "SelectQuery",
     "WithQuery",
     "JoinQuery",
+    "CompoundQuery",
+    "ColumnarReader",
+    "ExportStats",
     "InsertQuery",
     "INSERT",
     "OnConflictQuery",
+    "excluded",
     "UpdateQuery",
     "UPDATE",
     "DeleteQuery",
     "DELETE",
+    "PurgeProgress",
     "CountQuery",
     "COUNT",
+    "CountStrategy",
+    "ExactCount",
+    "StatEstimateCount",
+    "CachedCount",
+    "CounterTableCount",
     "ExistsQuery",
     "EXISTS",
+    "BatchQuery",
+    "batch",
+    "Window",
+    "WindowFunction",
+    "over",
+    "ROW_NUMBER",
+    "RANK",
+    "DENSE_RANK",
+    "PERCENT_RANK",
+    "CUME_DIST",
+    "NTILE",
+    "LAG",
+    "LEAD",
+    "FIRST_VALUE",
+    "LAST_VALUE",
+    "NTH_VALUE",
 ]
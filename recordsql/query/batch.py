@@ -0,0 +1,150 @@
+from __future__ import annotations
+from typing import List, Tuple, Any, Iterable
+from ..raw_querybuilders.formatters import _is_all_columns
+from .select import SelectQuery
+from .count import CountQuery
+from .exists import ExistsQuery
+
+BATCH_INDEX_COLUMN = "batch_index"
+
+
+_OPENING = {"(": ")", "'": "'", '"': '"', "`": "`", "[": "]"}
+
+
+def _column_count(column: Any) -> int:
+    """
+    Returns how many result columns one entry of a column list stands for.
+
+    Expressions are one column. A raw string may hold a whole select list
+    (`"name, COALESCE(a, b)"`), so its top-level commas are counted, skipping
+    those inside parentheses, string literals and quoted identifiers.
+    """
+    if not isinstance(column, str):
+        return 1
+    count = 1
+    closers: List[str] = []
+    for char in column:
+        if closers:
+            if char == closers[-1]:
+                closers.pop()
+            elif closers[-1] == ")" and char in _OPENING:
+                closers.append(_OPENING[char])
+        elif char in _OPENING:
+            closers.append(_OPENING[char])
+        elif char == ",":
+            count += 1
+    return count
+
+
+def _result_width(query: Any) -> int:
+    """
+    Returns the number of columns a batched query produces.
+    Raises:
+        ValueError: If the width cannot be known without running the query (SELECT *).
+    """
+    if isinstance(query, CountQuery):
+        return query.result_width
+    if isinstance(query, ExistsQuery):
+        return 1
+    if _is_all_columns(query.columns):
+        raise ValueError("SELECT * cannot be batched; list the columns explicitly.")
+    if isinstance(query.columns, (list, tuple)):
+        return sum(_column_count(column) for column in query.columns)
+    return _column_count(query.columns)
+
+
+class BatchQuery:
+    """
+    Combines independent SELECT, COUNT and EXISTS queries into one statement.
+
+    Each query becomes a `UNION ALL` member prefixed with a discriminator column
+    (`batch_index`) and padded with NULLs to the widest member, so all of them
+    run in a single round trip. Use `split` to route the result rows back.
+
+    Example:
+        >>> batch_query = batch(COUNT().FROM("users"), EXISTS().FROM("bans"))
+        >>> sql, params = batch_query.placeholder_pair()
+        >>> counts, exists = batch_query.split(conn.execute(sql, params))
+    """
+
+    valid_types = (SelectQuery, CountQuery, ExistsQuery)
+
+    def __init__(self, *queries: Any) -> None:
+        if not queries:
+            raise ValueError("At least one query must be provided.")
+        for query in queries:
+            if not isinstance(query, self.valid_types):
+                raise TypeError("Only SelectQuery, CountQuery and ExistsQuery can be batched.")
+        self.queries = list(queries)
+
+    @property
+    def widths(self) -> List[int]:
+        """
+        Returns the number of result columns of each batched query.
+        Returns:
+            List[int]: One width per query, in batch order.
+        """
+        return [_result_width(query) for query in self.queries]
+
+    def placeholder_pair(self) -> Tuple[str, List[Any]]:
+        """
+        Builds the combined `UNION ALL` statement.
+        Returns:
+            Tuple[str, List[Any]]: The SQL query and its parameters, in member order.
+        """
+        widths = self.widths
+        width = max(widths)
+        members = []
+        all_params = []
+        for index, (query, query_width) in enumerate(zip(self.queries, widths)):
+            if isinstance(query, SelectQuery):
+                string, params = query.placeholder_pair(include_alias=False)
+            else:
+                string, params = query.placeholder_pair()
+            label = f" AS {BATCH_INDEX_COLUMN}" if index == 0 else ""
+            padding = ", NULL" * (width - query_width)
+            members.append(f"SELECT {index}{label}, *{padding} FROM ({string})")
+            all_params.extend(params)
+        return " UNION ALL ".join(members), all_params
+
+    def split(self, rows: Iterable[Any]) -> List[List[Tuple[Any, ...]]]:
+        """
+        Demultiplexes the rows of the combined statement back per query.
+        Args:
+            rows (Iterable[Any]): The fetched rows or the cursor itself.
+        Returns:
+            List[List[Tuple[Any, ...]]]: The rows of each query, without the discriminator or padding.
+        Raises:
+            ValueError: If a cursor reports a different number of columns than the batch was rendered with.
+        """
+        widths = self.widths
+        description = getattr(rows, "description", None)
+        if description is not None and len(description) != 1 + max(widths):
+            raise ValueError(
+                f"The result has {len(description) - 1} columns per row but the batch expects {max(widths)}; "
+                "pass multi-column expressions as separate columns."
+            )
+        results = [[] for _ in self.queries]
+        for row in rows:
+            index = row[0]
+            if not isinstance(index, int) or not 0 <= index < len(results):
+                raise ValueError(f"Row does not belong to this batch: {tuple(row)!r}")
+            results[index].append(tuple(row[1 : 1 + widths[index]]))
+        return results
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def __repr__(self) -> str:
+        return f"BatchQuery({', '.join(type(query).__name__ for query in self.queries)})"
+
+
+def batch(*queries: Any) -> BatchQuery:
+    """
+    Constructs a BatchQuery that renders several queries into one round trip.
+    Args:
+        *queries (Union[SelectQuery, CountQuery, ExistsQuery]): The queries to combine.
+    Returns:
+        BatchQuery: The combined query with a row splitter.
+    """
+    return BatchQuery(*queries)
@@ -0,0 +1,265 @@
+"""
+Columnar materialization of query results: NumPy arrays, Arrow record batches
+or plain lists, one list / array per column instead of one tuple per row.
+
+Rows are fetched with `cursor.fetchmany(batch_size)` and each batch is
+transposed once into its columns. Column kinds are inferred from the first
+batch that holds a non-NULL value for the column; NumPy arrays are created
+at the exact batch length and `fetch_columns` copies batches into buffers
+preallocated in whole batches, doubling when full, so the result never
+exists as Python row tuples.
+
+NumPy and pyarrow are optional; they are only needed for their own formats.
+
+Type mapping:
+    - NumPy: INTEGER columns become int64 (float64 with NaN once a NULL shows up),
+      REAL columns float64 with NaN for NULL, everything else an object array.
+      Batches of `column_batches` all keep the dtype of the column's first batch:
+      later batches are cast to it, and a batch that does not fit (a NULL or a
+      REAL in an int64 column) raises TypeError. Pass `dtypes`, e.g.
+      {"id": "float64"}, to choose the dtype up front. `fetch_columns` without
+      `dtypes` promotes the whole column instead (int64 to float64 on NULL).
+    - Arrow: the type pyarrow infers from the first batch is kept for the later ones.
+    - lists: values are kept as returned by sqlite3.
+"""
+from __future__ import annotations
+import importlib
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+COLUMNAR_FORMATS = ("numpy", "arrow", "lists")
+DEFAULT_BATCH_SIZE = 65536
+
+_INTEGER = "int"
+_REAL = "float"
+_OBJECT = "object"
+
+
+def _require(module_name: str, format: str) -> Any:
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        raise ImportError(
+            f"{module_name} is required for format={format!r}. Install it with: pip install {module_name}"
+        ) from None
+
+
+def _infer_kind(values: Sequence[Any]) -> Optional[str]:
+    """Returns the NumPy kind of a column from its values, or None if every value is NULL."""
+    types = set(map(type, values))
+    types.discard(type(None))
+    if not types:
+        return None
+    if types <= {int, bool}:
+        return _INTEGER
+    if types <= {int, bool, float}:
+        return _REAL
+    return _OBJECT
+
+
+def _numpy_column(numpy: Any, name: str, values: Sequence[Any], kind: Optional[str]) -> Any:
+    """Converts the values of one column of one batch into a one-dimensional array."""
+    count = len(values)
+    if kind in (_INTEGER, _REAL):
+        array = numpy.array(values)
+        if array.dtype.kind in "biu":
+            return array.astype(numpy.int64 if kind == _INTEGER else numpy.float64, copy=False)
+        if array.dtype.kind == "f":
+            return array
+        if array.dtype.kind == "O":
+            # NULLs (or integers beyond int64) in a numeric column: NaN for NULL, float64 for the batch
+            try:
+                return numpy.fromiter(
+                    (numpy.nan if value is None else value for value in values), dtype=numpy.float64, count=count
+                )
+            except (TypeError, ValueError):
+                pass
+        raise TypeError(
+            f"Column {name!r} was numeric in the first batch but holds other values later; CAST it in the query."
+        )
+    array = numpy.empty(count, dtype=object)
+    array[:] = values
+    return array
+
+
+def _cast_column(numpy: Any, name: str, array: Any, dtype: Any) -> Any:
+    """Casts the array of one batch to the fixed dtype of its column, NULL becoming NaN for floats."""
+    if array.dtype == dtype:
+        return array
+    if dtype.kind == "O":
+        return array.astype(object)
+    if array.dtype.kind == "O" and dtype.kind == "f":
+        try:
+            return numpy.fromiter((numpy.nan if value is None else value for value in array), dtype=dtype)
+        except (TypeError, ValueError):
+            pass
+    elif numpy.can_cast(array.dtype, dtype, casting="same_kind"):
+        return array.astype(dtype)
+    raise TypeError(
+        f"Column {name!r} needs {array.dtype} in this batch but is {dtype}; "
+        f"pass dtypes={{{name!r}: ...}} or CAST it in the query."
+    )
+
+
+class ColumnarReader:
+    """
+    Turns the rows of a cursor into columnar batches, keeping the column kinds of the first batch.
+
+    Attributes:
+        names (List[str]): The column names, from `cursor.description`.
+        format (str): 'numpy', 'arrow' or 'lists'.
+        batch_size (int): Rows per `fetchmany` call.
+        rows (int): Rows read so far.
+        dtypes (Dict[str, Any]): NumPy dtypes chosen per column; the others are fixed by their first batch.
+    """
+
+    def __init__(
+        self,
+        cursor: Any,
+        format: str = "numpy",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dtypes: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        if format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format: {format!r}. Expected one of {COLUMNAR_FORMATS}.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if cursor.description is None:
+            raise ValueError("The statement returns no columns.")
+        self.cursor = cursor
+        self.names = [description[0] for description in cursor.description]
+        self.format = format
+        self.batch_size = batch_size
+        self.rows = 0
+        self._module = _require("pyarrow" if format == "arrow" else "numpy", format) if format != "lists" else None
+        self._kinds: List[Any] = [None] * len(self.names)
+        self.dtypes = dict(dtypes or {})
+        if self.dtypes and format != "numpy":
+            raise ValueError("dtypes only apply to format='numpy'.")
+        unknown = [name for name in self.dtypes if name not in self.names]
+        if unknown:
+            raise ValueError(f"dtypes given for columns that are not selected: {unknown}")
+        self._dtypes: List[Any] = [
+            self._module.dtype(self.dtypes[name]) if name in self.dtypes else None for name in self.names
+        ]
+
+    def _columns(self, rows: List[Tuple[Any, ...]]) -> List[Sequence[Any]]:
+        return list(zip(*rows)) if rows else [() for _ in self.names]
+
+    def _numpy_batch(self, columns: List[Sequence[Any]]) -> Dict[str, Any]:
+        batch = {}
+        for index, (name, values) in enumerate(zip(self.names, columns)):
+            if self._kinds[index] is None:
+                self._kinds[index] = _infer_kind(values)
+            array = _numpy_column(self._module, name, values, self._kinds[index])
+            if self._dtypes[index] is None:
+                self._dtypes[index] = array.dtype
+            batch[name] = _cast_column(self._module, name, array, self._dtypes[index])
+        return batch
+
+    def _arrow_batch(self, columns: List[Sequence[Any]]) -> Any:
+        pyarrow = self._module
+        arrays = []
+        for index, (name, values) in enumerate(zip(self.names, columns)):
+            arrow_type = self._kinds[index]
+            if arrow_type is None:
+                array = pyarrow.array(values)
+                if not pyarrow.types.is_null(array.type):
+                    self._kinds[index] = array.type
+            else:
+                try:
+                    array = pyarrow.array(values, type=arrow_type)
+                except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as error:
+                    raise TypeError(
+                        f"Column {name!r} no longer fits {arrow_type} inferred from the first batch; "
+                        "CAST it in the query."
+                    ) from error
+            arrays.append(array)
+        return pyarrow.RecordBatch.from_arrays(arrays, names=self.names)
+
+    def convert(self, rows: List[Tuple[Any, ...]]) -> Any:
+        """Converts one batch of row tuples into the configured columnar format."""
+        columns = self._columns(rows)
+        if self.format == "numpy":
+            return self._numpy_batch(columns)
+        if self.format == "arrow":
+            return self._arrow_batch(columns)
+        return {name: list(values) for name, values in zip(self.names, columns)}
+
+    def __iter__(self) -> Iterator[Any]:
+        fetchmany = self.cursor.fetchmany
+        while True:
+            rows = fetchmany(self.batch_size)
+            if not rows:
+                return
+            self.rows += len(rows)
+            yield self.convert(rows)
+
+    def _read_numpy(self) -> Dict[str, Any]:
+        numpy = self._module
+        buffers: List[Any] = [None] * len(self.names)
+        filled = 0
+        for rows in iter(lambda: self.cursor.fetchmany(self.batch_size), []):
+            self.rows += len(rows)
+            count = len(rows)
+            for index, values in enumerate(self._columns(rows)):
+                if self._kinds[index] is None:
+                    self._kinds[index] = _infer_kind(values)
+                array = _numpy_column(numpy, self.names[index], values, self._kinds[index])
+                if self._dtypes[index] is not None:
+                    array = _cast_column(numpy, self.names[index], array, self._dtypes[index])
+                buffer = buffers[index]
+                if buffer is None:
+                    buffer = numpy.empty(max(self.batch_size, count), dtype=array.dtype)
+                else:
+                    dtype = numpy.result_type(buffer.dtype, array.dtype)
+                    if dtype != buffer.dtype:
+                        buffer = buffer.astype(dtype)
+                if filled + count > len(buffer):
+                    grown = numpy.empty(max(2 * len(buffer), filled + count), dtype=buffer.dtype)
+                    grown[:filled] = buffer[:filled]
+                    buffer = grown
+                buffer[filled:filled + count] = array
+                buffers[index] = buffer
+            filled += count
+        if filled == 0:
+            return {name: numpy.empty(0, dtype=dtype or object) for name, dtype in zip(self.names, self._dtypes)}
+        return {
+            name: buffer[:filled].copy() if len(buffer) > filled else buffer
+            for name, buffer in zip(self.names, buffers)
+        }
+
+    def _read_arrow(self) -> Any:
+        pyarrow = self._module
+        batches = list(self)
+        if not batches:
+            schema = pyarrow.schema([(name, pyarrow.null()) for name in self.names])
+            return pyarrow.Table.from_batches([], schema=schema)
+        # Columns that were all NULL in the early batches got the null type there
+        types = [arrow_type or pyarrow.null() for arrow_type in self._kinds]
+        unified = []
+        for batch in batches:
+            arrays = [
+                column if column.type == arrow_type else pyarrow.nulls(len(column), type=arrow_type)
+                for column, arrow_type in zip(batch.columns, types)
+            ]
+            unified.append(pyarrow.RecordBatch.from_arrays(arrays, names=self.names))
+        return pyarrow.Table.from_batches(unified)
+
+    def read_all(self) -> Any:
+        """
+        Reads every remaining row.
+        Returns:
+            Any: A dict of column name to array (numpy) or list (lists), or a pyarrow.Table (arrow).
+        """
+        if self.format == "numpy":
+            return self._read_numpy()
+        if self.format == "arrow":
+            return self._read_arrow()
+        result: Dict[str, List[Any]] = {name: [] for name in self.names}
+        for batch in self:
+            for name, values in batch.items():
+                result[name].extend(values)
+        return result
+
+    def __repr__(self) -> str:
+        return f"ColumnarReader(format={self.format!r}, columns={len(self.names)}, rows={self.rows})"
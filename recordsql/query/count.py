@@ -2,7 +2,10 @@ from ..base import RecordQuery
 from ..types import SQLCol
 from ..dependencies import SQLCondition, no_condition
 from ..raw_querybuilders import build_count_query
-from typing import Union, List, Tuple, Any, Optional
+from typing import Union, List, Tuple, Any, Optional, Dict, Iterable
+from .count_strategies import CountStrategy, EXACT
+from .utils import normalize_args
+from ..references import References
 
 
 class CountQuery(RecordQuery):
@@ -15,12 +18,18 @@ class CountQuery(RecordQuery):
         group_by: Union[SQLCol, List[SQLCol], None] = None,
         having: Optional[SQLCondition] = None,
         ignore_forbidden_characters: bool = False,
+        strategy: Optional[CountStrategy] = None,
+        counters: Optional[Dict[str, SQLCondition]] = None,
+        select_group_keys: bool = False,
     ):
         super().__init__(table_name=table_name, validate_table_name=not ignore_forbidden_characters)
         self.condition = condition
         self.group_by = group_by
         self.having = having
         self.ignore_forbidden_characters = ignore_forbidden_characters
+        self.strategy = strategy
+        self.counters = dict(counters) if counters else None
+        self.select_group_keys = select_group_keys
 
     def FROM(self, table_name: str) -> "CountQuery":
         self.table_name = table_name
@@ -38,6 +47,119 @@ class CountQuery(RecordQuery):
         self.having = having
         return self
 
+    def _collect_references(self, refs: References) -> None:
+        super()._collect_references(refs)
+        if self.counters:
+            refs.add(list(self.counters.values()))
+
+    @normalize_args(skip=1)
+    def BY(self, *columns: SQLCol) -> "CountQuery":
+        """
+        Counts per group, selecting the group keys alongside the counts.
+        Args:
+            *columns (SQLCol): The columns to group by.
+        Returns:
+            CountQuery: The updated query, rendering `SELECT k, COUNT(*) ... GROUP BY k`.
+        """
+        if not columns:
+            raise ValueError("At least one column must be provided.")
+        self.group_by = list(columns)
+        self.select_group_keys = True
+        return self
+
+    def COUNTERS(self, counters: Optional[Dict[str, SQLCondition]] = None, **named: SQLCondition) -> "CountQuery":
+        """
+        Counts several conditions in a single scan, one named column each.
+        Args:
+            counters (Optional[Dict[str, SQLCondition]]): Column names mapped to the condition they count.
+            **named (SQLCondition): The same, as keyword arguments.
+        Returns:
+            CountQuery: The updated query, rendering `COUNT(CASE WHEN cond THEN 1 END) AS name` columns.
+        """
+        counters = {**(counters or {}), **named}
+        if not counters:
+            raise ValueError("At least one counter must be provided.")
+        self.counters = counters
+        return self
+
+    @property
+    def group_keys(self) -> List[SQLCol]:
+        """The GROUP BY columns selected in front of the counts."""
+        if not self.select_group_keys or not self.group_by:
+            return []
+        return self.group_by if isinstance(self.group_by, list) else [self.group_by]
+
+    @property
+    def result_width(self) -> int:
+        """The number of columns each result row has."""
+        return len(self.group_keys) + (len(self.counters) if self.counters else 1)
+
+    def map_rows(self, rows: Iterable[Any]) -> Any:
+        """
+        Maps fetched rows back to their meaning.
+        Args:
+            rows (Iterable[Any]): The rows of this query, or the cursor itself.
+        Returns:
+            Any: A count, or `{name: count}` with counters. With BY, a dict from group key
+                (a tuple for several columns) to that value; with a plain GROUP_BY, a list of them.
+        """
+        key_width = len(self.group_keys)
+        names = list(self.counters) if self.counters else None
+
+        def value(row):
+            return dict(zip(names, row[key_width:])) if names else row[key_width]
+
+        rows = list(rows)
+        if key_width:
+            return {(row[0] if key_width == 1 else tuple(row[:key_width])): value(row) for row in rows}
+        if self.group_by:
+            return [value(row) for row in rows]
+        if not rows:
+            return dict.fromkeys(names, 0) if names else 0
+        return value(rows[0])
+
+    def counts(self, connection: Any) -> Any:
+        """
+        Executes the query and maps the result with `map_rows`.
+        Args:
+            connection (Any): A DB-API connection, e.g. sqlite3.Connection.
+        Returns:
+            Any: See `map_rows`.
+        Example:
+            >>> COUNT.multi({"active": col("active") == 1, "banned": col("banned") == 1}, "users").counts(conn)
+            {'active': 812, 'banned': 9}
+        """
+        sql, params = self.placeholder_pair()
+        return self.map_rows(connection.execute(sql, params))
+
+    def STRATEGY(self, strategy: Optional[CountStrategy]) -> "CountQuery":
+        """
+        Selects how `count` obtains the number.
+        Args:
+            strategy (Optional[CountStrategy]): ExactCount (default), StatEstimateCount, CachedCount,
+                CounterTableCount or a custom CountStrategy. None restores the exact count.
+        Returns:
+            CountQuery: The updated query.
+        """
+        if strategy is not None and not isinstance(strategy, CountStrategy):
+            raise TypeError("strategy must be a CountStrategy.")
+        self.strategy = strategy
+        return self
+
+    def count(self, connection: Any) -> int:
+        """
+        Returns the number of rows using the selected strategy.
+        Args:
+            connection (Any): A DB-API connection, e.g. sqlite3.Connection.
+        Returns:
+            int: The exact, estimated or cached count.
+        Example:
+            >>> totals = CachedCount(ttl=60)
+            >>> COUNT("orders").WHERE(col("status") == "open").STRATEGY(totals).count(conn)
+        """
+        strategy = self.strategy if self.strategy is not None else EXACT
+        return strategy.count(self, connection)
+
     def placeholder_pair(self) -> Tuple[str, List[Any]]:
         return build_count_query(
             table_name=self.table_name,
@@ -45,6 +167,8 @@ class CountQuery(RecordQuery):
             group_by=self.group_by,
             having=self.having,
             ignore_forbidden_chars=self.ignore_forbidden_characters,
+            counters=self.counters,
+            select_group_keys=self.select_group_keys,
         )
 
     def SET(self, *args, **kwargs) -> None:
@@ -68,3 +192,21 @@ class CountQuery(RecordQuery):
 
 def COUNT(table_name: str = None, ignore_forbidden_characters: bool = False) -> CountQuery:
     return CountQuery(table_name=table_name, ignore_forbidden_characters=ignore_forbidden_characters)
+
+
+def _count_multi(
+    counters: Dict[str, SQLCondition], table_name: str = None, ignore_forbidden_characters: bool = False
+) -> CountQuery:
+    """
+    Constructs a CountQuery counting several conditions in one table scan.
+    Args:
+        counters (Dict[str, SQLCondition]): Column names mapped to the condition they count.
+        table_name (str, optional): The table to count from; can also be set with FROM.
+        ignore_forbidden_characters (bool, optional): If True, skip name validation.
+    Returns:
+        CountQuery: `SELECT COUNT(CASE WHEN cond THEN 1 END) AS name, ... FROM table`.
+    """
+    return COUNT(table_name, ignore_forbidden_characters=ignore_forbidden_characters).COUNTERS(counters)
+
+
+COUNT.multi = _count_multi
@@ -0,0 +1,216 @@
+from __future__ import annotations
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional, Tuple, TYPE_CHECKING
+from ..dependencies import FalseCondition
+from ..raw_querybuilders.formatters import _format_table_name
+from ..validators import validate_name
+
+if TYPE_CHECKING:
+    from .count import CountQuery
+
+DEFAULT_COUNTER_TABLE = "recordsql_row_counts"
+
+
+def _is_plain_count(query: CountQuery) -> bool:
+    """Returns True if the query counts every row of its table (no WHERE, GROUP BY or HAVING)."""
+    condition = query.condition
+    filtered = bool(condition) and not isinstance(condition, FalseCondition)
+    return not filtered and not query.group_by and not query.having and not query.counters
+
+
+class CountStrategy:
+    """
+    Decides how a CountQuery obtains its number.
+
+    Subclasses implement `count(query, connection)`. Strategies are plain objects
+    so one instance (and its state, e.g. a cache) can be shared by many queries.
+    """
+
+    def count(self, query: CountQuery, connection: Any) -> int:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class ExactCount(CountStrategy):
+    """Runs the rendered `SELECT COUNT(*)` as is."""
+
+    def count(self, query: CountQuery, connection: Any) -> int:
+        if query.group_by or query.counters:
+            raise ValueError("Grouped and multi counts return several values; use counts() instead.")
+        sql, params = query.placeholder_pair()
+        row = connection.execute(sql, params).fetchone()
+        return row[0] if row else 0
+
+
+class StatEstimateCount(CountStrategy):
+    """
+    Estimates the row count of a table from `sqlite_stat1`, filled in by `ANALYZE`.
+
+    The estimate is as fresh as the last ANALYZE and only applies to unfiltered
+    counts. Filtered counts, and tables without statistics, use `fallback`.
+    """
+
+    def __init__(self, fallback: Optional[CountStrategy] = None) -> None:
+        self.fallback = fallback if fallback is not None else ExactCount()
+
+    def estimate(self, table_name: str, connection: Any) -> Optional[int]:
+        """
+        Returns the estimated number of rows of `table_name`, or None without statistics.
+        """
+        try:
+            rows = connection.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ?", [table_name]).fetchall()
+        except sqlite3.OperationalError:
+            # sqlite_stat1 only exists once ANALYZE has run
+            return None
+        # The first number of each stat is the row count of the index (or of the table itself)
+        estimates = [int(stat.split()[0]) for (stat,) in rows if stat]
+        return max(estimates) if estimates else None
+
+    def count(self, query: CountQuery, connection: Any) -> int:
+        if _is_plain_count(query):
+            estimate = self.estimate(query.table_name, connection)
+            if estimate is not None:
+                return estimate
+        return self.fallback.count(query, connection)
+
+    def __repr__(self) -> str:
+        return f"StatEstimateCount(fallback={self.fallback!r})"
+
+
+class CachedCount(CountStrategy):
+    """
+    Caches counts for `ttl` seconds, keyed by the rendered SQL and its parameters.
+
+    Keeps at most `maxsize` entries, evicting the least recently used. Counts
+    are obtained through `base` on a miss. Safe to share between threads.
+    """
+
+    def __init__(self, ttl: float = 30.0, maxsize: int = 1024, base: Optional[CountStrategy] = None) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be positive.")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.base = base if base is not None else ExactCount()
+        self._entries: OrderedDict[Tuple[str, Tuple[Any, ...]], Tuple[float, int]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, query: CountQuery, connection: Any) -> int:
+        sql, params = query.placeholder_pair()
+        key = (sql, tuple(params))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = self.base.count(query, connection)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self) -> None:
+        """Drops every cached count."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"CachedCount(ttl={self.ttl}, maxsize={self.maxsize}, base={self.base!r})"
+
+
+class CounterTableCount(CountStrategy):
+    """
+    Reads unfiltered counts from a counter table kept current by triggers.
+
+    Call `install(connection, table_name)` once per table to create the counter
+    table, seed it and add the AFTER INSERT / AFTER DELETE triggers. Filtered
+    counts, and tables without a counter, use `fallback`.
+
+    Rows removed by REPLACE conflict resolution (`INSERT OR REPLACE`,
+    `or_action="REPLACE"`) only fire the DELETE trigger while
+    `PRAGMA recursive_triggers` is on, and the pragma is per connection:
+    `install` turns it on for its own connection, and every other connection
+    writing the table must call `prepare(connection)` first, or REPLACE
+    leaves the counter one too high per replaced row.
+    """
+
+    def __init__(self, counter_table: str = DEFAULT_COUNTER_TABLE, fallback: Optional[CountStrategy] = None) -> None:
+        validate_name(counter_table)
+        self.counter_table = counter_table
+        self.fallback = fallback if fallback is not None else ExactCount()
+
+    def _trigger_name(self, table_name: str, event: str) -> str:
+        return f'"{self.counter_table}_{table_name}_{event}"'
+
+    def install_statements(self, table_name: str) -> list:
+        """
+        Returns the statements that create the counter table, seed it and add the triggers for `table_name`.
+        """
+        validate_name(table_name)
+        table = _format_table_name(table_name)
+        counter = _format_table_name(self.counter_table)
+        return [
+            f"CREATE TABLE IF NOT EXISTS {counter} (tbl TEXT PRIMARY KEY, n INTEGER NOT NULL)",
+            f"INSERT OR REPLACE INTO {counter} (tbl, n) SELECT '{table_name}', COUNT(*) FROM {table}",
+            f"CREATE TRIGGER IF NOT EXISTS {self._trigger_name(table_name, 'insert')} AFTER INSERT ON {table} "
+            f"BEGIN UPDATE {counter} SET n = n + 1 WHERE tbl = '{table_name}'; END",
+            f"CREATE TRIGGER IF NOT EXISTS {self._trigger_name(table_name, 'delete')} AFTER DELETE ON {table} "
+            f"BEGIN UPDATE {counter} SET n = n - 1 WHERE tbl = '{table_name}'; END",
+        ]
+
+    @staticmethod
+    def prepare(connection: Any) -> None:
+        """Turns on `PRAGMA recursive_triggers` so rows replaced on `connection` fire the DELETE trigger."""
+        connection.execute("PRAGMA recursive_triggers = ON")
+
+    def install(self, connection: Any, table_name: str) -> None:
+        """Creates the counter and its triggers for `table_name` in one transaction, and prepares `connection`."""
+        self.prepare(connection)
+        with connection:
+            for statement in self.install_statements(table_name):
+                connection.execute(statement)
+
+    def uninstall(self, connection: Any, table_name: str) -> None:
+        """Drops the triggers and the counter row of `table_name`."""
+        validate_name(table_name)
+        with connection:
+            for event in ("insert", "delete"):
+                connection.execute(f"DROP TRIGGER IF EXISTS {self._trigger_name(table_name, event)}")
+            connection.execute(
+                f"DELETE FROM {_format_table_name(self.counter_table)} WHERE tbl = ?", [table_name]
+            )
+
+    def count(self, query: CountQuery, connection: Any) -> int:
+        if _is_plain_count(query):
+            try:
+                row = connection.execute(
+                    f"SELECT n FROM {_format_table_name(self.counter_table)} WHERE tbl = ?", [query.table_name]
+                ).fetchone()
+            except sqlite3.OperationalError:
+                # The counter table has not been installed yet
+                row = None
+            if row is not None:
+                return row[0]
+        return self.fallback.count(query, connection)
+
+    def __repr__(self) -> str:
+        return f"CounterTableCount(counter_table={self.counter_table!r}, fallback={self.fallback!r})"
+
+
+EXACT = ExactCount()
@@ -1,9 +1,28 @@
+import time
+from dataclasses import dataclass
 from ..base import RecordQuery
-from ..dependencies import SQLCondition, no_condition
+from ..dependencies import SQLCondition, FalseCondition, no_condition
 from ..types import SQLCol
-from ..raw_querybuilders import build_delete_query
-from typing import Optional, List, Tuple, Any
-from .utils import normalize_args
+from ..raw_querybuilders import build_delete_query, build_delete_keys_chunks, build_purge_batch_query
+from ..raw_querybuilders.utils import DEFAULT_MAX_PARAMS
+from ..references import References
+from typing import Optional, List, Tuple, Any, Union, Iterable, Iterator
+from .utils import normalize_args, enlist
+
+
+@dataclass(frozen=True)
+class PurgeProgress:
+    """Progress of a `DeleteQuery.purge` run, reported after every batch."""
+
+    batches: int
+    deleted: int
+    total_deleted: int
+    batch_seconds: float
+    elapsed_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total_deleted / self.elapsed_seconds if self.elapsed_seconds else 0.0
 
 
 class DeleteQuery(RecordQuery):
@@ -20,6 +39,7 @@ class DeleteQuery(RecordQuery):
         self.condition = condition if isinstance(condition, SQLCondition) else no_condition
         self.returning = returning if isinstance(returning, list) else [returning] if returning else None
         self.ignore_forbidden_characters = ignore_forbidden_characters
+        self.key_source = None
 
     def WHERE(self, condition: SQLCondition) -> "DeleteQuery":
         if not isinstance(condition, SQLCondition):
@@ -48,7 +68,159 @@ class DeleteQuery(RecordQuery):
     def OFFSET(self, *args, **kwargs) -> "DeleteQuery":
         raise NotImplementedError("OFFSET clause is not supported in DELETE queries.")
 
-    def placeholder_pair(self, *args, **kwarfs) -> Tuple[str, List[Any]]:
+    def _collect_references(self, refs: References) -> None:
+        super()._collect_references(refs)
+        if self.key_source is not None:
+            refs.add_columns(self.key_source[0])
+
+    def WHERE_KEYS(
+        self, columns: Union[SQLCol, List[SQLCol]], keys: Iterable[Any], chunk_size: Optional[int] = None
+    ) -> "DeleteQuery":
+        """
+        Deletes the rows whose key is in `keys`, split into `chunk_size` keys per statement.
+        Args:
+            columns (Union[SQLCol, List[SQLCol]]): The key column, or several for a composite key.
+            keys (Iterable[Any]): Scalars for a single column, tuples for composite keys.
+                Any iterable works; it is copied once, so the query can be rendered more than once.
+            chunk_size (Optional[int]): Keys per statement. Defaults to as many as fit in
+                the SQLite parameter limit next to the WHERE condition's parameters.
+        Returns:
+            DeleteQuery: The updated query. A WHERE condition further restricts the deleted rows.
+        Example:
+            >>> query = DELETE("sessions").WHERE_KEYS("id", expired_ids, chunk_size=500)
+            >>> for sql, params in query.placeholder_chunks():
+            ...     conn.execute(sql, params)
+        """
+        self.key_source = (enlist(columns), list(keys), chunk_size)
+        return self
+
+    def _default_chunk_size(self) -> int:
+        """The keys per statement that fit in the parameter limit, leaving room for the WHERE condition."""
+        condition_params = 0
+        if self.condition and not isinstance(self.condition, FalseCondition):
+            condition_params = len(self.condition.placeholder_pair()[1])
+        width = max(len(self.key_source[0]), 1)
+        available = DEFAULT_MAX_PARAMS - condition_params
+        if available < width:
+            raise ValueError(f"The WHERE condition uses {condition_params} of the {DEFAULT_MAX_PARAMS} parameters.")
+        return available // width
+
+    def _chunk_size(self) -> int:
+        chunk_size = self.key_source[2]
+        return chunk_size if chunk_size is not None else self._default_chunk_size()
+
+    def placeholder_chunks(self) -> Iterator[Tuple[str, List[Any]]]:
+        """
+        Renders the query as one statement per chunk of WHERE_KEYS keys.
+        Returns:
+            Iterator[Tuple[str, List[Any]]]: The (query, params) pairs, or the single
+                statement when WHERE_KEYS is not used.
+        """
+        if self.key_source is None:
+            return iter([self.placeholder_pair()])
+        return self._key_chunks(self.key_source[1], self._chunk_size())
+
+    def _key_chunks(self, keys: Iterable[Any], chunk_size: Optional[int]) -> Iterator[Tuple[str, List[Any]]]:
+        columns = self.key_source[0]
+        return build_delete_keys_chunks(
+            table_name=self.table_name,
+            key_columns=columns,
+            keys=keys,
+            condition=self.condition,
+            returning=self.returning,
+            chunk_size=chunk_size,
+            ignore_forbidden_chars=self.ignore_forbidden_characters,
+        )
+
+    def stream_returning(self, connection: Any) -> Iterator[Tuple[Any, ...]]:
+        """
+        Executes every chunk on `connection` and yields the RETURNING rows as they come back.
+        Chunks run one at a time as the rows are consumed; stopping early leaves the remaining
+        keys untouched.
+        Args:
+            connection (Any): A DB-API connection or cursor, e.g. sqlite3.Connection.
+        Returns:
+            Iterator[Tuple[Any, ...]]: The returned rows of all chunks, in order.
+        """
+        if not self.returning:
+            raise ValueError("RETURNING must be set to stream returned rows.")
+        for sql, params in self.placeholder_chunks():
+            yield from connection.execute(sql, params)
+
+    def batch_placeholder_pair(self, batch_size: int) -> Tuple[str, List[Any]]:
+        """
+        Builds a DELETE that removes at most `batch_size` of the matching rows.
+        Args:
+            batch_size (int): Maximum number of rows deleted per execution.
+        Returns:
+            Tuple[str, List[Any]]: `DELETE FROM t WHERE rowid IN (SELECT rowid FROM t WHERE ... LIMIT ?)`
+                and its parameters.
+        """
+        if self.key_source is not None:
+            raise ValueError("WHERE_KEYS deletes are already chunked; use placeholder_chunks instead.")
+        if self.returning:
+            raise ValueError("RETURNING is not supported for batched purges.")
+        return build_purge_batch_query(
+            table_name=self.table_name,
+            condition=self.condition,
+            batch_size=batch_size,
+            ignore_forbidden_chars=self.ignore_forbidden_characters,
+        )
+
+    def purge(
+        self, connection: Any, batch_size: int = 1000, sleep: float = 0.0, commit: bool = True
+    ) -> Iterator[PurgeProgress]:
+        """
+        Deletes the matching rows in bounded batches so the write lock is released in between.
+
+        Runs one batch per iteration and stops once a batch deletes fewer than `batch_size` rows.
+        Args:
+            connection (Any): A DB-API connection, e.g. sqlite3.Connection.
+            batch_size (int): Maximum number of rows deleted per batch.
+            sleep (float): Seconds to wait between batches, letting readers and other writers in.
+            commit (bool): Commit after every batch. Disable when managing the transaction yourself.
+        Returns:
+            Iterator[PurgeProgress]: One progress report per batch.
+        Example:
+            >>> for progress in DELETE("events").WHERE(col("ts") < cutoff).purge(conn, 5000, sleep=0.05):
+            ...     log.info("purged %d rows", progress.total_deleted)
+        """
+        sql, params = self.batch_placeholder_pair(batch_size)
+        started = time.perf_counter()
+        total_deleted = 0
+        batches = 0
+        while True:
+            batch_started = time.perf_counter()
+            deleted = connection.execute(sql, params).rowcount
+            if commit:
+                connection.commit()
+            now = time.perf_counter()
+            batches += 1
+            total_deleted += deleted
+            yield PurgeProgress(batches, deleted, total_deleted, now - batch_started, now - started)
+            if deleted < batch_size:
+                return
+            if sleep:
+                time.sleep(sleep)
+
+    def placeholder_pair(self, *args, **kwargs) -> Tuple[str, List[Any]]:
+        """
+        Renders the query as a single statement.
+        With WHERE_KEYS, only keys that fit in one chunk (`chunk_size`, or the SQLite parameter
+        limit) can be rendered this way; iterate `placeholder_chunks()` for more.
+        Returns:
+            Tuple[str, List[Any]]: The query and its parameters.
+        """
+        if self.key_source is not None:
+            chunks = list(self._key_chunks(self.key_source[1], self._chunk_size()))
+            if not chunks:
+                raise ValueError("WHERE_KEYS needs at least one key.")
+            if len(chunks) > 1:
+                raise ValueError(
+                    f"WHERE_KEYS keys need {len(chunks)} statements of at most {self._chunk_size()} keys; "
+                    "use placeholder_chunks()."
+                )
+            return chunks[0]
         return build_delete_query(
             table_name=self.table_name,
             condition=self.condition,
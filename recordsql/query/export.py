@@ -0,0 +1,130 @@
+"""
+Streaming export of query results to CSV or JSON Lines files.
+
+Rows are read from a single cursor with `fetchmany` and written batch by
+batch through a buffered text writer, so memory stays bounded by one batch
+whatever the size of the result. Paths ending in ".gz" are gzip-compressed.
+
+BLOB values are written as hexadecimal text in both formats; NULL is an
+empty field in CSV and null in JSON Lines.
+"""
+from __future__ import annotations
+import csv
+import gzip
+import json
+import os
+import time
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+EXPORT_FORMATS = ("csv", "jsonl")
+_BUFFER_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class ExportStats:
+    """Progress of a `SelectQuery.export` run, reported after every batch and returned at the end."""
+
+    path: str
+    format: str
+    rows: int
+    batches: int
+    elapsed_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def _open_text(path: str, encoding: str) -> Any:
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding=encoding, newline="", compresslevel=6)
+    return open(path, "w", encoding=encoding, newline="", buffering=_BUFFER_SIZE)
+
+
+def _blob_to_text(value: Any) -> Any:
+    return value.hex() if isinstance(value, (bytes, bytearray, memoryview)) else value
+
+
+def _has_blobs(rows: Sequence[Tuple[Any, ...]]) -> bool:
+    types = set(map(type, chain.from_iterable(rows)))
+    return bytes in types or bytearray in types or memoryview in types
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_writer(file: Any, names: List[str], header: bool) -> Callable[[Sequence[Tuple[Any, ...]]], None]:
+    writer = csv.writer(file, lineterminator="\n")
+    if header:
+        writer.writerow(names)
+
+    def write(rows: Sequence[Tuple[Any, ...]]) -> None:
+        if _has_blobs(rows):
+            rows = [[_blob_to_text(value) for value in row] for row in rows]
+        writer.writerows(rows)
+
+    return write
+
+
+def _jsonl_writer(file: Any, names: List[str], header: bool) -> Callable[[Sequence[Tuple[Any, ...]]], None]:
+    encode = json.JSONEncoder(ensure_ascii=False, default=_json_default).encode
+
+    def write(rows: Sequence[Tuple[Any, ...]]) -> None:
+        file.write("".join([encode(dict(zip(names, row))) + "\n" for row in rows]))
+
+    return write
+
+
+def export_cursor(
+    cursor: Any,
+    path: Union[str, "os.PathLike[str]"],
+    format: str = "csv",
+    batch: int = 10000,
+    header: bool = True,
+    encoding: str = "utf-8",
+    on_batch: Optional[Callable[[ExportStats], None]] = None,
+) -> ExportStats:
+    """
+    Writes every remaining row of `cursor` to `path`, `batch` rows at a time.
+    Args:
+        cursor (Any): An executed DB-API cursor.
+        path (Union[str, os.PathLike]): The output file; a ".gz" suffix compresses it.
+        format (str): 'csv' or 'jsonl'.
+        batch (int): Rows fetched and written per batch.
+        header (bool): Write the column names as the first CSV line. Ignored for JSON Lines.
+        encoding (str): The text encoding of the file.
+        on_batch (Optional[Callable[[ExportStats], None]]): Called after every batch with the running totals.
+    Returns:
+        ExportStats: The final totals.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format!r}. Expected one of {EXPORT_FORMATS}.")
+    if batch < 1:
+        raise ValueError("batch must be at least 1.")
+    if cursor.description is None:
+        raise ValueError("The statement returns no columns.")
+    path = os.fspath(path)
+    names = [description[0] for description in cursor.description]
+    if format == "jsonl":
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            # Each row becomes one JSON object; repeated keys would keep only the last value
+            raise ValueError(f"Duplicate column names {duplicates} cannot be exported as JSON Lines; alias them.")
+    make_writer = _csv_writer if format == "csv" else _jsonl_writer
+    started = time.perf_counter()
+    rows_written = 0
+    batches = 0
+    with _open_text(path, encoding) as file:
+        write = make_writer(file, names, header)
+        for rows in iter(lambda: cursor.fetchmany(batch), []):
+            write(rows)
+            rows_written += len(rows)
+            batches += 1
+            if on_batch is not None:
+                on_batch(ExportStats(path, format, rows_written, batches, time.perf_counter() - started))
+    return ExportStats(path, format, rows_written, batches, time.perf_counter() - started)
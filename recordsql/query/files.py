@@ -0,0 +1,202 @@
+"""
+Row sources for bulk inserts from CSV and JSON Lines files.
+
+Files are parsed incrementally and converted a chunk at a time, column by
+column: each chunk of parsed records is transposed once, every column goes
+through its converter in a single pass, and the columns are zipped back
+into rows. Converters and column positions are resolved once per file, not
+per cell. Paths ending in ".gz" are read through gzip.
+
+Type coercion is optional: SQLite's column affinity already stores '42' as
+42 in an INTEGER column. Pass `types` for columns without affinity, or to
+parse values SQLite cannot (e.g. `bytes.fromhex` for hex BLOBs).
+"""
+from __future__ import annotations
+import csv
+import gzip
+import json
+import os
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+FILE_FORMATS = ("csv", "jsonl")
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+DEFAULT_CHUNK_ROWS = 10000
+
+ColumnSpec = Union[Sequence[str], Mapping[str, str], None]
+
+
+def _open_text(path: str, encoding: str) -> Any:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding=encoding, newline="")
+    return open(path, "r", encoding=encoding, newline="")
+
+
+def infer_format(path: str) -> str:
+    """Returns 'csv' or 'jsonl' from the extension of `path`, ignoring a trailing '.gz'."""
+    stem = path[: -len(".gz")] if path.endswith(".gz") else path
+    file_format = _EXTENSIONS.get(os.path.splitext(stem)[1].lower())
+    if file_format is None:
+        raise ValueError(f"Cannot infer the file format of {path!r}; pass format='csv' or format='jsonl'.")
+    return file_format
+
+
+def _column_mapping(columns: ColumnSpec, available: Optional[List[str]]) -> Tuple[List[str], List[str]]:
+    """Returns the (file column, table column) names to load, in order."""
+    if columns is None:
+        if available is None:
+            raise ValueError("Columns must be given for files without a header.")
+        return list(available), list(available)
+    if isinstance(columns, Mapping):
+        return list(columns.keys()), list(columns.values())
+    if isinstance(columns, str):
+        raise TypeError("columns must be a sequence of names or a mapping of file column to table column.")
+    return list(columns), list(columns)
+
+
+def _json_text(value: Any) -> Any:
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+def _column_converter(
+    converter: Optional[Callable[[Any], Any]], null: Optional[str]
+) -> Optional[Callable[[Sequence[Any]], List[Any]]]:
+    """Builds the function applied to a whole column of a chunk, or None to keep the column as is."""
+    if converter is None and null is None:
+        return None
+    if converter is None:
+        return lambda values: [None if value == null else value for value in values]
+    if null is None:
+        return lambda values: [None if value is None else converter(value) for value in values]
+    return lambda values: [None if value is None or value == null else converter(value) for value in values]
+
+
+class FileRows:
+    """
+    A re-iterable row source over a CSV or JSON Lines file.
+
+    Every iteration reopens and re-parses the file, yielding tuples in the
+    order of `names`. Nothing but the current chunk is held in memory.
+
+    Attributes:
+        path (str): The source file.
+        format (str): 'csv' or 'jsonl'.
+        names (List[str]): The table columns the rows are produced for.
+        source_names (List[str]): The matching file columns (CSV header names or JSON keys).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        columns: ColumnSpec = None,
+        format: Optional[str] = None,
+        types: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+        header: bool = True,
+        null: Optional[str] = "",
+        encoding: str = "utf-8",
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.format = format or infer_format(self.path)
+        if self.format not in FILE_FORMATS:
+            raise ValueError(f"Unknown file format: {self.format!r}. Expected one of {FILE_FORMATS}.")
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1.")
+        self.header = header
+        self.encoding = encoding
+        self.chunk_rows = chunk_rows
+        available = self._available_columns()
+        self.source_names, self.names = _column_mapping(columns, available)
+        if not self.names:
+            raise ValueError("No columns to load.")
+        # Later JSON objects may carry keys the first one lacks; absent keys load as NULL
+        if available is not None and self.format == "csv":
+            missing = [name for name in self.source_names if name not in available]
+            if missing:
+                raise ValueError(f"Columns not found in {self.path!r}: {missing}")
+        types = dict(types or {})
+        unknown = [name for name in types if name not in self.source_names and name not in self.names]
+        if unknown:
+            raise ValueError(f"types given for columns that are not loaded: {unknown}")
+        # JSON has its own null; the null marker only applies to CSV text
+        csv_null = null if self.format == "csv" else None
+        self._converters = [
+            _column_converter(types.get(source, types.get(name)), csv_null)
+            for source, name in zip(self.source_names, self.names)
+        ]
+        if self.format == "csv":
+            if available is None:
+                self._positions = list(range(len(self.names)))
+            else:
+                self._positions = [available.index(name) for name in self.source_names]
+
+    def _available_columns(self) -> Optional[List[str]]:
+        """The CSV header, or the keys of the first JSON object; None for a CSV file without a header."""
+        with _open_text(self.path, self.encoding) as file:
+            if self.format == "csv":
+                if not self.header:
+                    return None
+                first = next(csv.reader(file), None)
+                if first is None:
+                    raise ValueError(f"{self.path!r} is empty.")
+                return first
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError(f"Expected one JSON object per line in {self.path!r}.")
+                    return list(record)
+            raise ValueError(f"{self.path!r} is empty.")
+
+    def _csv_chunks(self, file: Any) -> Iterator[List[Sequence[Any]]]:
+        reader = csv.reader(file)
+        if self.header:
+            next(reader, None)
+        width = len(self._positions)
+        getter = itemgetter(*self._positions)
+        while True:
+            records = list(islice(reader, self.chunk_rows))
+            if not records:
+                return
+            try:
+                picked = [getter(record) for record in records if record]
+            except IndexError:
+                raise ValueError(f"A row of {self.path!r} has fewer fields than its header.") from None
+            if not picked:
+                continue
+            # itemgetter of a single position returns the value itself, not a 1-tuple
+            yield list(zip(*picked)) if width > 1 else [picked]
+
+    def _jsonl_chunks(self, file: Any) -> Iterator[List[Sequence[Any]]]:
+        lines = (line for line in file if line.strip())
+        while True:
+            records = [json.loads(line) for line in islice(lines, self.chunk_rows)]
+            if not records:
+                return
+            columns = []
+            for name in self.source_names:
+                values = [record.get(name) for record in records]
+                kinds = set(map(type, values))
+                if dict in kinds or list in kinds:
+                    values = [_json_text(value) for value in values]
+                columns.append(values)
+            yield columns
+
+    def chunks(self) -> Iterator[List[Tuple[Any, ...]]]:
+        """Yields the converted rows of the file, `chunk_rows` at a time."""
+        with _open_text(self.path, self.encoding) as file:
+            parse = self._csv_chunks if self.format == "csv" else self._jsonl_chunks
+            for columns in parse(file):
+                converted = [
+                    values if convert is None else convert(values)
+                    for values, convert in zip(columns, self._converters)
+                ]
+                yield list(zip(*converted))
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        for chunk in self.chunks():
+            yield from chunk
+
+    def __repr__(self) -> str:
+        return f"FileRows(path={self.path!r}, format={self.format!r}, columns={self.names})"
@@ -0,0 +1,157 @@
+"""
+Columnar sources for bulk inserts: pandas DataFrames, NumPy structured arrays
+and plain column mappings.
+
+Columns are converted to bindable Python values one whole column at a time
+(`ndarray.tolist()` and masks), never cell by cell through SQLExpressions:
+NaN / NaT / NA become NULL, datetime64 becomes ISO-8601 text and timedelta64
+becomes seconds. Rows are then zipped lazily from the converted columns.
+
+NumPy and pandas are optional; they are only needed for their own inputs.
+"""
+from __future__ import annotations
+import datetime
+import sys
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+_TEMPORAL_TYPES = (datetime.date, datetime.time)
+
+
+def _convert_value(value: Any) -> Any:
+    """Converts one object-typed cell; only used for columns without a native dtype."""
+    if value is None or isinstance(value, (str, int, bytes)):
+        return value
+    if isinstance(value, float):
+        return None if value != value else value  # NaN is the only value not equal to itself
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and (value is pandas.NA or value is pandas.NaT):
+        return None
+    if isinstance(value, _TEMPORAL_TYPES):
+        return value.isoformat()
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(value, numpy.generic):
+        if isinstance(value, (numpy.datetime64, numpy.timedelta64)):
+            return _convert_array(numpy.array([value]))[0]
+        return _convert_value(value.item())
+    return value
+
+
+def _convert_objects(values: List[Any]) -> List[Any]:
+    """Maps missing values to None, dates / times to ISO text and NumPy scalars to Python ones."""
+    return [_convert_value(value) for value in values]
+
+
+def _convert_array(array: Any) -> List[Any]:
+    """Converts a one-dimensional NumPy array to a list of values sqlite3 can bind."""
+    import numpy
+
+    kind = array.dtype.kind
+    if kind in "biuUS":
+        return array.tolist()
+    if kind == "f":
+        mask = numpy.isnan(array)
+        if not mask.any():
+            return array.tolist()
+        converted = array.astype(object)
+        converted[mask] = None
+        return converted.tolist()
+    if kind == "M":
+        mask = numpy.isnat(array)
+        converted = numpy.datetime_as_string(array).astype(object)
+    elif kind == "m":
+        mask = numpy.isnat(array)
+        converted = (array / numpy.timedelta64(1, "s")).astype(object)
+    elif kind == "O":
+        return _convert_objects(array.tolist())
+    else:
+        raise TypeError(f"Unsupported column dtype: {array.dtype}")
+    if mask.any():
+        converted[mask] = None
+    return converted.tolist()
+
+
+def _convert_series(series: Any) -> List[Any]:
+    """Converts a pandas Series, including nullable extension dtypes."""
+    import numpy
+
+    if isinstance(series.dtype, numpy.dtype):
+        return _convert_array(series.to_numpy())
+    # Extension dtypes (Int64, string, tz-aware datetimes, ...) have no NumPy equivalent
+    return _convert_objects(series.to_numpy(dtype=object, na_value=None).tolist())
+
+
+def _convert_column(values: Any) -> List[Any]:
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        if values.ndim != 1:
+            raise ValueError("Columns must be one-dimensional.")
+        return _convert_array(values)
+    if type(values).__module__.startswith("pandas"):
+        return _convert_series(values)
+    return _convert_objects(list(values))
+
+
+def frame_columns(frame: Any, columns: Optional[Sequence[str]] = None) -> Tuple[List[str], List[List[Any]]]:
+    """
+    Extracts and converts the columns of a DataFrame, structured array or column mapping.
+    Args:
+        frame (Any): A pandas DataFrame, a NumPy structured array, or a mapping of column name to sequence.
+        columns (Optional[Sequence[str]]): The columns to take, in order. Defaults to every column.
+    Returns:
+        Tuple[List[str], List[List[Any]]]: The column names and the converted column values.
+    """
+    dtype = getattr(frame, "dtype", None)
+    if dtype is not None and getattr(dtype, "names", None):
+        available = list(dtype.names)
+        getter = frame.__getitem__
+    elif type(frame).__module__.startswith("pandas") and hasattr(frame, "columns"):
+        labels = {str(name): name for name in frame.columns}
+        available = list(labels)
+
+        def getter(name: str) -> Any:
+            return frame[labels[name]]
+    elif isinstance(frame, dict):
+        available = list(frame)
+        getter = frame.__getitem__
+    else:
+        raise TypeError("Expected a pandas DataFrame, a NumPy structured array or a mapping of columns.")
+    names = list(columns) if columns is not None else available
+    if not names:
+        raise ValueError("The frame has no columns.")
+    missing = [name for name in names if name not in available]
+    if missing:
+        raise ValueError(f"Columns not found in the frame: {missing}")
+    converted = [_convert_column(getter(name)) for name in names]
+    lengths = {len(values) for values in converted}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length.")
+    return names, converted
+
+
+class ColumnarRows:
+    """
+    A re-iterable row view over converted columns.
+
+    Iterating zips the columns lazily, so rows are produced as the consumer
+    (e.g. `executemany`) asks for them, without an intermediate list of rows.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: List[List[Any]]) -> None:
+        self.columns = columns
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return zip(*self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def __repr__(self) -> str:
+        return f"ColumnarRows(columns={len(self.columns)}, rows={len(self)})"
+
+
+def columnar_rows(frame: Any, columns: Optional[Sequence[str]] = None) -> Tuple[List[str], ColumnarRows]:
+    """Returns the column names of `frame` and a row view over its converted columns."""
+    names, converted = frame_columns(frame, columns)
+    return names, ColumnarRows(converted)
@@ -4,11 +4,15 @@ from ..dependencies import SQLCondition, SQLExpression
 from ..types import SQLInput
 
 # from expressql import SQLCondition, SQLExpression, no_condition
-from ..raw_querybuilders import build_insert_query, OnConflictQuery
-from typing import List, Union, Iterable
+from ..raw_querybuilders import build_insert_query, build_insert_chunks, build_insert_template, OnConflictQuery
+from ..raw_querybuilders.utils import DEFAULT_MAX_PARAMS
+from typing import Callable, List, Mapping, Union, Iterable, Iterator, Tuple, Any, Optional
 from ..types import SQLCol
-from .utils import validate_monolist, normalize_args, is_pair, get_col_value
+from .utils import validate_monolist, normalize_args, is_pair, get_col_value, enlist
 from ..validators import validate_name
+from ..references import References
+from .frames import columnar_rows
+from .files import FileRows, ColumnSpec, DEFAULT_CHUNK_ROWS
 
 
 class InsertQuery(RecordQuery):
@@ -31,6 +35,7 @@ class InsertQuery(RecordQuery):
         self.or_action = or_action
         self.on_conflict = on_conflict
         self.returning = returning
+        self.row_source = None
         super().__init__(table_name=table_name, validate_table_name=not ignore_forbidden_chars)
         self.ignore_forbidden_characters = ignore_forbidden_chars
 
@@ -79,6 +84,12 @@ class InsertQuery(RecordQuery):
                 raise ValueError(f"Expected {len(self.columns)} values, got {len(self.values)}.")
             return dict(zip(column_names, self.values))
 
+    def _collect_references(self, refs: References) -> None:
+        super()._collect_references(refs)
+        refs.add_columns(self.columns)
+        refs.add(self.values)
+        refs.add(self.on_conflict)
+
     def INTO(self, table_name) -> InsertQuery:
         self.into = table_name
         self.table_name = table_name
@@ -121,6 +132,8 @@ class InsertQuery(RecordQuery):
         return self
 
     def placeholder_pair(self):
+        if not self.values and self.row_source is not None:
+            return self._row_source_pair()
         placeholder_query, injections = build_insert_query(
             table_name=self.table_name,
             values=self.col_value_dict(),
@@ -131,6 +144,106 @@ class InsertQuery(RecordQuery):
 
         return placeholder_query, injections
 
+    def _row_source_pair(self) -> Tuple[str, List[Any]]:
+        """Renders the rows of `INSERT.from_frame` / `INSERT.from_file` as one statement, if they fit in one."""
+        chunks = self.placeholder_chunks()
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError("The row source of this insert is empty.")
+        if next(chunks, None) is not None:
+            raise ValueError(
+                f"The row source needs more than {DEFAULT_MAX_PARAMS} parameters; "
+                "use executemany() or placeholder_chunks()."
+            )
+        return first
+
+    def placeholder_chunks(
+        self, rows: Optional[Iterable[Iterable[SQLInput]]] = None, max_params: int = DEFAULT_MAX_PARAMS
+    ) -> Iterator[Tuple[str, List[Any]]]:
+        """
+        Renders the insert as several multi-row statements, each under `max_params` parameters.
+        Args:
+            rows (Optional[Iterable[Iterable[SQLInput]]]): Rows to insert, consumed lazily.
+                Defaults to the rows given to VALUES.
+            max_params (int): Maximum number of bound parameters per statement.
+        Returns:
+            Iterator[Tuple[str, List[Any]]]: One (query, params) pair per chunk. OR actions,
+                ON CONFLICT/UPSERT and RETURNING clauses are repeated on every chunk.
+        Example:
+            >>> query = INSERT("id", "name").INTO("users").UPSERT(keys=["id"])
+            >>> for sql, params in query.placeholder_chunks(rows=read_rows()):
+            ...     conn.execute(sql, params)
+        """
+        if rows is None:
+            rows = self._default_rows("placeholder_chunks")
+        return build_insert_chunks(
+            table_name=self.table_name,
+            columns=self.columns,
+            rows=rows,
+            or_action=self.or_action,
+            on_conflict=self.on_conflict,
+            returning=self.returning,
+            max_params=max_params,
+            ignore_forbidden_chars=self.ignore_forbidden_characters,
+        )
+
+    def _default_rows(self, caller: str) -> Iterable[Iterable[SQLInput]]:
+        if self.row_source is not None:
+            return self.row_source
+        if not self.values:
+            raise ValueError(f"Values must be set before calling {caller}.")
+        return self.values if self.bulk else [self.values]
+
+    def executemany(
+        self, connection: Any, rows: Optional[Iterable[Iterable[Any]]] = None, commit: bool = True
+    ) -> int:
+        """
+        Inserts many rows with one prepared single-row statement through `connection.executemany`.
+
+        The rows are inserted all or nothing: the statement runs inside an explicit BEGIN, or a
+        savepoint when a transaction is already open, and a failing row rolls back the rows before it,
+        also on autocommit connections.
+        Args:
+            connection (sqlite3.Connection): The connection.
+            rows (Optional[Iterable[Iterable[Any]]]): Rows of plain values, in column order.
+                Defaults to the source given to `INSERT.from_frame` / `INSERT.from_file` or the rows given to VALUES.
+            commit (bool): Commit once all rows are inserted. Disable to leave the transaction open
+                and commit it yourself.
+        Returns:
+            int: The number of inserted rows reported by the cursor.
+        Example:
+            >>> INSERT.from_frame(df, "measurements").executemany(conn)
+        """
+        if self.returning:
+            raise ValueError("RETURNING cannot be used with executemany; use placeholder_chunks instead.")
+        if not self.columns:
+            raise ValueError("Columns must be set before calling executemany.")
+        sql = build_insert_template(
+            table_name=self.table_name,
+            columns=self.columns,
+            or_action=self.or_action,
+            on_conflict=self.on_conflict,
+            ignore_forbidden_chars=self.ignore_forbidden_characters,
+        )
+        if rows is None:
+            rows = self._default_rows("executemany")
+        outer = connection.in_transaction
+        connection.execute("SAVEPOINT recordsql_executemany" if outer else "BEGIN")
+        try:
+            cursor = connection.executemany(sql, rows)
+        except BaseException:
+            if outer:
+                connection.execute("ROLLBACK TO recordsql_executemany")
+                connection.execute("RELEASE recordsql_executemany")
+            elif connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        if outer:
+            connection.execute("RELEASE recordsql_executemany")
+        if commit:
+            connection.commit()
+        return cursor.rowcount
+
     @normalize_args(skip=1)
     def COLS(self, *args: SQLCol) -> InsertQuery:
         validate_monolist(*args, monotype=SQLCol)
@@ -160,6 +273,39 @@ class InsertQuery(RecordQuery):
         self.on_conflict = OnConflictQuery(do_what=do, conflict_cols=conflict_cols, set_clauses=set, condition=where)
         return self
 
+    def UPSERT(
+        self,
+        keys: Union[SQLCol, List[SQLCol]],
+        update: Union[str, List[SQLCol]] = "all_non_key",
+        where: SQLCondition = None,
+    ) -> InsertQuery:
+        """
+        Turns the insert into an upsert: `ON CONFLICT (keys) DO UPDATE SET c = excluded.c`.
+        Args:
+            keys (Union[SQLCol, List[SQLCol]]): The conflict target, usually the primary or a unique key.
+            update (Union[str, List[SQLCol]]): The columns overwritten on conflict. "all_non_key"
+                (default) updates every inserted column that is not a key. An empty list means DO NOTHING.
+            where (SQLCondition, optional): Only update rows matching this condition.
+        Returns:
+            InsertQuery: The updated query.
+        Example:
+            >>> INSERT("id", "name", "age").INTO("users").VALUES(1, "John", 25).UPSERT(keys=["id"])
+        """
+        key_names = [get_col_value(key) for key in enlist(keys)]
+        if not key_names:
+            raise ValueError("Conflict keys must be provided.")
+        if isinstance(update, str) and update == "all_non_key":
+            if not self.columns:
+                raise ValueError("Columns must be set before UPSERT with update='all_non_key'.")
+            update_names = [name for name in map(get_col_value, self.columns) if name not in key_names]
+        else:
+            update_names = [get_col_value(column) for column in enlist(update)]
+        if not self.ignore_forbidden_characters:
+            for name in key_names + update_names:
+                validate_name(name, validate_chars=True)
+        self.on_conflict = OnConflictQuery.upsert(key_names, update_names, condition=where)
+        return self
+
 
 @normalize_args()
 def INSERT(*column_names: SQLCol, or_action: str = None) -> InsertQuery:
@@ -177,3 +323,110 @@ def INSERT(*column_names: SQLCol, or_action: str = None) -> InsertQuery:
         column_names = []
 
     return InsertQuery(or_action=or_action, columns=column_names)
+
+
+def _insert_from_frame(
+    frame: Any,
+    table_name: str,
+    columns: Optional[List[str]] = None,
+    or_action: str = None,
+    ignore_forbidden_chars: bool = False,
+) -> InsertQuery:
+    """
+    Constructs an InsertQuery fed by the columns of a DataFrame, NumPy structured array or column mapping.
+
+    Each column is converted to plain Python values in one pass (NaN / NaT / NA to NULL, datetime64 to
+    ISO-8601 text); rows are zipped lazily from those columns when the query runs. NumPy and pandas are
+    only needed for their own inputs.
+    Args:
+        frame (Any): A pandas DataFrame, a NumPy structured array, or a mapping of column name to sequence.
+        table_name (str): The target table.
+        columns (Optional[List[str]]): The columns to insert, in order. Defaults to every column of the frame.
+        or_action (str, optional): Conflict resolution action, e.g. "REPLACE" or "IGNORE".
+        ignore_forbidden_chars (bool, optional): If True, skip name validation.
+    Returns:
+        InsertQuery: Run it with `executemany(conn)` or render it with `placeholder_chunks()`;
+            chain UPSERT / ON_CONFLICT as usual.
+    Example:
+        >>> INSERT.from_frame(df, "measurements").UPSERT(keys=["sensor", "ts"]).executemany(conn)
+    """
+    names, rows = columnar_rows(frame, columns)
+    if not ignore_forbidden_chars:
+        for name in names:
+            validate_name(name, validate_chars=True)
+    query = InsertQuery(
+        into=table_name, columns=names, or_action=or_action, ignore_forbidden_chars=ignore_forbidden_chars
+    )
+    query.row_source = rows
+    return query
+
+
+INSERT.from_frame = _insert_from_frame
+
+
+def _insert_from_file(
+    path: str,
+    table_name: str,
+    columns: ColumnSpec = None,
+    or_action: str = None,
+    on_conflict: Optional[OnConflictQuery] = None,
+    format: Optional[str] = None,
+    types: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+    header: bool = True,
+    null: Optional[str] = "",
+    encoding: str = "utf-8",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ignore_forbidden_chars: bool = False,
+) -> InsertQuery:
+    """
+    Constructs an InsertQuery fed by a CSV or JSON Lines file, parsed incrementally.
+
+    The file is read `chunk_rows` records at a time and converted column by column, so
+    `executemany(conn)` streams it in one statement and one transaction without loading it.
+    Args:
+        path (str): The source file; ".csv", ".jsonl" / ".ndjson", optionally followed by ".gz".
+        table_name (str): The target table.
+        columns (ColumnSpec): File columns to load, in order, or a mapping of file column to table column.
+            Defaults to the CSV header or the keys of the first JSON object.
+        or_action (str, optional): Conflict resolution action, e.g. "REPLACE" or "IGNORE".
+        on_conflict (Optional[OnConflictQuery]): An ON CONFLICT clause, e.g. `OnConflictQuery.upsert(...)`.
+            UPSERT / ON_CONFLICT can also be chained on the returned query.
+        format (Optional[str]): 'csv' or 'jsonl'. Inferred from the extension by default.
+        types (Optional[Mapping[str, Callable]]): Converters per file or table column, e.g. {"id": int}.
+        header (bool): Whether the CSV file starts with a header line. Without one, `columns` is required.
+        null (Optional[str]): CSV text loaded as NULL; None keeps every field as text.
+        encoding (str): The text encoding of the file.
+        chunk_rows (int): Records parsed and converted at a time.
+        ignore_forbidden_chars (bool, optional): If True, skip name validation.
+    Returns:
+        InsertQuery: Run it with `executemany(conn)` or render it with `placeholder_chunks()`.
+    Example:
+        >>> INSERT.from_file("events.jsonl.gz", "events").UPSERT(keys=["id"]).executemany(conn)
+    """
+    if on_conflict is not None and not isinstance(on_conflict, OnConflictQuery):
+        raise TypeError("on_conflict must be an OnConflictQuery.")
+    rows = FileRows(
+        path,
+        columns,
+        format=format,
+        types=types,
+        header=header,
+        null=null,
+        encoding=encoding,
+        chunk_rows=chunk_rows,
+    )
+    if not ignore_forbidden_chars:
+        for name in rows.names:
+            validate_name(name, validate_chars=True)
+    query = InsertQuery(
+        into=table_name,
+        columns=list(rows.names),
+        or_action=or_action,
+        on_conflict=on_conflict,
+        ignore_forbidden_chars=ignore_forbidden_chars,
+    )
+    query.row_source = rows
+    return query
+
+
+INSERT.from_file = _insert_from_file
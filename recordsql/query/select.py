@@ -1,14 +1,18 @@
 from __future__ import annotations
-from ..raw_querybuilders import build_select_query
+from ..raw_querybuilders import build_select_query, build_compound_query
 from ..raw_querybuilders import JoinQuery
-from ..raw_querybuilders.formatters import SQLOrderBy, column_string
-from typing import List, Optional, Union, Any, Iterable, Tuple
+from ..raw_querybuilders.window import Window
+from ..raw_querybuilders.formatters import SQLOrderBy, column_string, _collect_order_by
+from typing import Callable, List, Optional, Union, Any, Iterable, Tuple, Dict
 from ..base import RecordQuery
 from ..types import SQLCol
 from ..dependencies import SQLCondition, no_condition, SQLExpression
 from ..validators import validate_name
-from .utils import normalize_args, enlist
+from .utils import normalize_args, enlist, get_col_value
 from ..utils import ensure_bracketed
+from ..references import References, ReferencesMixin
+from .columnar import ColumnarReader, DEFAULT_BATCH_SIZE
+from .export import ExportStats, export_cursor
 
 
 class SelectQuery(RecordQuery):
@@ -28,6 +32,8 @@ class SelectQuery(RecordQuery):
         alias: Optional[str] = None,
         joins: List[Any] = None,
         withs: Optional[List[Any]] = None,
+        bind_limit_offset: bool = False,
+        windows: Optional[Dict[str, Window]] = None,
     ) -> None:
         self._initialized = False  # Block __setattr__ during init
 
@@ -46,12 +52,14 @@ class SelectQuery(RecordQuery):
 
         self.limit = limit
         self.offset = offset
+        self.bind_limit_offset = bind_limit_offset
         self.group_by = group_by
         self.having = having
         self.ignore_forbidden_chars = ignore_forbidden_chars
         self.alias = alias
         self._joins = joins or []
         self._withs = withs or []
+        self.windows = dict(windows) if windows else {}
 
         # Internal state
         self._cached_placeholder_str = None
@@ -75,23 +83,25 @@ class SelectQuery(RecordQuery):
             self._on_attribute_change(name, value)
         super().__setattr__(name, value)
 
-    def _on_attribute_change(self, attribute: str, value: Any) -> None:
-        tracked = {
-            "columns",
-            "table_name",
-            "condition",
-            "order_by",
-            "criteria",
-            "limit",
-            "offset",
-            "group_by",
-            "having",
-            "joins",
-            "withs",
-            "alias",
-        }
+    _TRACKED_ATTRIBUTES = frozenset({
+        "columns",
+        "table_name",
+        "condition",
+        "order_by",
+        "criteria",
+        "limit",
+        "offset",
+        "bind_limit_offset",
+        "group_by",
+        "having",
+        "joins",
+        "withs",
+        "windows",
+        "alias",
+    })
 
-        if attribute in tracked:
+    def _on_attribute_change(self, attribute: str, value: Any) -> None:
+        if attribute in self._TRACKED_ATTRIBUTES:
             self._up_to_date = False
 
     @property
@@ -214,35 +224,23 @@ class SelectQuery(RecordQuery):
             self.order_by = None
             self.criteria = None
             return self
-        collected_order_by = []
-        collected_criteria = []
-        for item in items:
-            if isinstance(item, (list, tuple)) and len(item) == 2:
-                collected_order_by.append(item[0])
-                collected_criteria.append(item[1])
-            elif isinstance(item, str):
-                if item.upper() in ["ASC", "DESC"]:
-                    collected_criteria.append(item.upper())
-                else:
-                    collected_order_by.append(item)
-            elif isinstance(item, (str, SQLExpression)):
-                collected_order_by.append(item)
-        ob_len = len(collected_order_by)
-        if ob_len == 0:
+        collected_order_by, collected_criteria = _collect_order_by(items)
+        if not collected_order_by:
             return self
-        for _ in range(len(collected_criteria), ob_len):
-            collected_criteria.append("DESC")
-        collected_criteria = collected_criteria[:ob_len]
         self.order_by = collected_order_by
         self.criteria = collected_criteria
         return self
 
-    def LIMIT(self, limit: Optional[Union[int, str]] = None):
+    def LIMIT(self, limit: Optional[Union[int, str]] = None, *, bind: Optional[bool] = None):
         self.limit = limit
+        if bind is not None:
+            self.bind_limit_offset = bind
         return self
 
-    def OFFSET(self, offset: Optional[Union[int, str]] = None):
+    def OFFSET(self, offset: Optional[Union[int, str]] = None, *, bind: Optional[bool] = None):
         self.offset = offset
+        if bind is not None:
+            self.bind_limit_offset = bind
         return self
 
     def GROUP_BY(self, group_by: Union[SQLCol, List[SQLCol], None] = None):
@@ -255,6 +253,25 @@ class SelectQuery(RecordQuery):
         self.having = having
         return self
 
+    def WINDOW(self, name: Optional[str] = None, window: Optional[Window] = None, **named_windows: Window):
+        """
+        Defines named windows, referenced by window functions as `over(func, "name")`.
+        Args:
+            name (Optional[str]): The name of a single window to define.
+            window (Optional[Window]): The window definition for `name`.
+            **named_windows (Window): Additional windows keyed by name.
+        Returns:
+            SelectQuery: The current instance of SelectQuery.
+        """
+        if name is not None:
+            named_windows = {name: window, **named_windows}
+        for window_name, definition in named_windows.items():
+            validate_name(window_name, validate_chars=not self.ignore_forbidden_chars)
+            if not isinstance(definition, Window):
+                raise TypeError("Named windows must be instances of Window")
+        self.windows = {**self.windows, **named_windows}
+        return self
+
     def SET(self, *args, **kwargs) -> None:
         raise NotImplementedError("SET clause is not applicable for SELECT queries.")
 
@@ -279,19 +296,20 @@ class SelectQuery(RecordQuery):
             having=self.having,
             joins=self.joins,
             ignore_forbidden_chars=self.ignore_forbidden_chars,
+            bind_limit_offset=self.bind_limit_offset,
+            windows=self.windows,
         )
 
         if self.withs:
-            first, first_params = self.withs[0].placeholder_pair(include_with=True)
-            withs = [first]
-            with_params = first_params
-            for with_ in self.withs[1:]:
+            withs = []
+            with_params = []
+            for with_ in self.withs:
                 with_string, with_param = with_.placeholder_pair(include_with=False)
                 withs.append(with_string)
                 with_params.extend(with_param)
-            withs = ", ".join(withs)
-            withs += " "
-            string = f"{withs}{string}"
+            # RECURSIVE applies to the whole WITH clause, so any recursive CTE enables it
+            keyword = "WITH RECURSIVE" if any(with_.recursive for with_ in self.withs) else "WITH"
+            string = f"{keyword} {', '.join(withs)} {string}"
             params = with_params + params
         return string, params
 
@@ -383,6 +401,9 @@ class SelectQuery(RecordQuery):
         joins: Optional[List[JoinQuery]] = None,
         alias: Optional[str] = None,
         ignore_forbidden_chars: bool = False,
+        bind_limit_offset: Optional[bool] = None,
+        withs: Optional[List[WithQuery]] = None,
+        windows: Optional[Dict[str, Window]] = None,
     ) -> SelectQuery:
         """
         Creates a copy of the current query with the specified modifications.
@@ -400,6 +421,10 @@ class SelectQuery(RecordQuery):
             group_by (Union[SQLCol, List[SQLCol], None], optional): Columns to group results by.
                 Defaults to None.
             having (SQLCondition, optional): The condition to apply to the grouped results. Defaults to None.
+            bind_limit_offset (Optional[bool], optional): Whether LIMIT/OFFSET are emitted as placeholders.
+                Defaults to None, which keeps the current setting.
+            withs (Optional[List[WithQuery]], optional): The CTEs of the query. Defaults to None.
+            windows (Optional[Dict[str, Window]], optional): The named windows of the query. Defaults to None.
         Returns:
             SelectQuery: A new instance of SelectQuery with the specified modifications.
         """
@@ -418,8 +443,20 @@ class SelectQuery(RecordQuery):
             if ignore_forbidden_chars is not None
             else self.ignore_forbidden_chars,
             joins=joins if joins is not None else self.joins,
+            bind_limit_offset=bind_limit_offset if bind_limit_offset is not None else self.bind_limit_offset,
+            withs=withs if withs is not None else list(self.withs),
+            windows=windows if windows is not None else self.windows,
         )
 
+    def _collect_references(self, refs: References) -> None:
+        super()._collect_references(refs)
+        refs.add_columns(self.columns)
+        refs.add_columns(self.order_by)
+        for node in [*self.joins, *self.withs, *self.windows.values()]:
+            refs.add(node)
+        # CTE names shadow tables inside this query
+        refs.tables.difference_update(with_query.alias for with_query in self.withs)
+
     def copy(self) -> SelectQuery:
         """
         Creates a copy of the current query.
@@ -428,6 +465,91 @@ class SelectQuery(RecordQuery):
         """
         return self.copy_with()
 
+    def column_batches(
+        self,
+        connection: Any,
+        format: str = "numpy",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ) -> ColumnarReader:
+        """
+        Executes the query and returns an iterator of columnar batches, one per `fetchmany` chunk.
+        Args:
+            connection (Any): A DB-API connection.
+            format (str): 'numpy' (dict of column name to ndarray), 'arrow' (pyarrow.RecordBatch)
+                or 'lists' (dict of column name to list).
+            batch_size (int): Rows fetched and converted per batch.
+            dtypes (Optional[Dict[str, Any]]): NumPy dtypes per column, e.g. {"id": "float64"} for an
+                integer column with NULLs. Other columns keep the dtype of their first batch in every batch.
+        Returns:
+            ColumnarReader: An iterator of batches; its `names` hold the column names.
+        Example:
+            >>> for batch in SELECT("ts", "value").FROM("readings").column_batches(conn, "arrow"):
+            ...     writer.write_batch(batch)
+        """
+        sql, params = self.placeholder_pair(include_alias=False)
+        return ColumnarReader(connection.execute(sql, params), format=format, batch_size=batch_size, dtypes=dtypes)
+
+    def fetch_columns(
+        self,
+        connection: Any,
+        format: str = "numpy",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Executes the query and returns the whole result column by column.
+        Args:
+            connection (Any): A DB-API connection.
+            format (str): 'numpy', 'arrow' or 'lists', as in `column_batches`.
+            batch_size (int): Rows fetched and converted per batch.
+            dtypes (Optional[Dict[str, Any]]): NumPy dtypes per column. Without one, a column is promoted
+                as needed across batches, e.g. int64 to float64 once a NULL shows up.
+        Returns:
+            Any: A dict of column name to ndarray (numpy) or list (lists), or a pyarrow.Table (arrow).
+        Example:
+            >>> columns = SELECT("value").FROM("readings").fetch_columns(conn)
+            >>> columns["value"].mean()
+        """
+        return self.column_batches(connection, format=format, batch_size=batch_size, dtypes=dtypes).read_all()
+
+    def export(
+        self,
+        connection: Any,
+        path: str,
+        format: str = "csv",
+        batch: int = 10000,
+        header: bool = True,
+        encoding: str = "utf-8",
+        on_batch: Optional[Callable[[ExportStats], None]] = None,
+    ) -> ExportStats:
+        """
+        Streams the result to a CSV or JSON Lines file from a single cursor, `batch` rows at a time.
+        Args:
+            connection (Any): A DB-API connection.
+            path (str): The output file; a ".gz" suffix compresses it.
+            format (str): 'csv' or 'jsonl'.
+            batch (int): Rows fetched and written per batch; bounds the memory used.
+            header (bool): Write the column names as the first CSV line.
+            encoding (str): The text encoding of the file.
+            on_batch (Optional[Callable[[ExportStats], None]]): Called after every batch with the running totals.
+        Returns:
+            ExportStats: Rows and batches written, elapsed seconds and rows_per_second.
+        Example:
+            >>> stats = SELECT().FROM("events").export(conn, "events.jsonl.gz", format="jsonl", batch=50000)
+            >>> log.info("exported %d rows at %.0f rows/s", stats.rows, stats.rows_per_second)
+        """
+        sql, params = self.placeholder_pair(include_alias=False)
+        return export_cursor(
+            connection.execute(sql, params),
+            path,
+            format=format,
+            batch=batch,
+            header=header,
+            encoding=encoding,
+            on_batch=on_batch,
+        )
+
     @classmethod
     def _SELECT(cls, column_list: Union[SQLCol, List[SQLCol]] = "*", *args: SQLCol, **kwargs) -> SelectQuery:
         """
@@ -655,6 +777,59 @@ class SelectQuery(RecordQuery):
         my_copy.withs = withs
         return my_copy
 
+    def _compound(self, operator: str, other: SelectQuery) -> CompoundQuery:
+        return CompoundQuery(self, ignore_forbidden_chars=self.ignore_forbidden_chars)._add_member(operator, other)
+
+    def UNION(self, other: SelectQuery) -> CompoundQuery:
+        """
+        Combines this query with another using UNION.
+        Args:
+            other (SelectQuery): The query to combine with.
+        Returns:
+            CompoundQuery: A new compound query with this query as its first member.
+        """
+        return self._compound("UNION", other)
+
+    def UNION_ALL(self, other: SelectQuery) -> CompoundQuery:
+        """
+        Combines this query with another using UNION ALL.
+        Args:
+            other (SelectQuery): The query to combine with.
+        Returns:
+            CompoundQuery: A new compound query with this query as its first member.
+        """
+        return self._compound("UNION ALL", other)
+
+    def INTERSECT(self, other: SelectQuery) -> CompoundQuery:
+        """
+        Combines this query with another using INTERSECT.
+        Args:
+            other (SelectQuery): The query to combine with.
+        Returns:
+            CompoundQuery: A new compound query with this query as its first member.
+        """
+        return self._compound("INTERSECT", other)
+
+    def EXCEPT(self, other: SelectQuery) -> CompoundQuery:
+        """
+        Combines this query with another using EXCEPT.
+        Args:
+            other (SelectQuery): The query to combine with.
+        Returns:
+            CompoundQuery: A new compound query with this query as its first member.
+        """
+        return self._compound("EXCEPT", other)
+
+    def _compound_member_pair(self) -> Tuple[str, Any]:
+        """
+        Returns the placeholder pair of the query as a compound member.
+        SQLite rejects ORDER BY, LIMIT and WITH on compound members, so those are wrapped in a subquery.
+        """
+        string, params = self.placeholder_pair(include_alias=False)
+        if self.withs or self.order_by or self.limit is not None or self.offset is not None:
+            string = f"SELECT * FROM {ensure_bracketed(string)}"
+        return string, params
+
 
 select_alias = [
     "set_select",
@@ -669,6 +844,290 @@ for alias in select_alias:
     setattr(SelectQuery, alias, SelectQuery.SELECT)
 
 
+class CompoundQuery(RecordQuery):
+    """
+    A compound SELECT joining several SelectQuery members with UNION, UNION ALL, INTERSECT or EXCEPT.
+
+    ORDER BY, LIMIT and OFFSET apply to the whole compound. Parameters are
+    concatenated in member order, followed by any bound LIMIT/OFFSET values.
+
+    Example:
+        >>> query = SELECT("id").FROM("users").UNION_ALL(SELECT("id").FROM("admins")).ORDER_BY("id", "ASC")
+        >>> print(query.placeholder_pair())
+        ('SELECT id FROM "users" UNION ALL SELECT id FROM "admins" ORDER BY id ASC', [])
+    """
+
+    def __init__(
+        self,
+        first: SelectQuery,
+        *,
+        order_by: Optional[List[Any]] = None,
+        criteria: Optional[List[str]] = None,
+        limit: Optional[Union[int, str]] = None,
+        offset: Optional[Union[int, str]] = None,
+        bind_limit_offset: bool = False,
+        alias: Optional[str] = None,
+        ignore_forbidden_chars: bool = False,
+    ) -> None:
+        self._initialized = False  # Block __setattr__ during init
+        self.validate_member(first)
+        self.members = [first]
+        self.operators = []
+        self.order_by = order_by
+        self.criteria = criteria
+        self.limit = limit
+        self.offset = offset
+        self.bind_limit_offset = bind_limit_offset
+        self.ignore_forbidden_chars = ignore_forbidden_chars
+
+        self._cached_placeholder_str = None
+        self._cached_placeholder_params = None
+        self._up_to_date = False
+        super().__init__(table_name=None, validate_table_name=False)
+        self.alias = alias  # Set after the base init, which resets the alias
+        self._initialized = True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_initialized", False):
+            self._on_attribute_change(name, value)
+        super().__setattr__(name, value)
+
+    def _on_attribute_change(self, attribute: str, value: Any) -> None:
+        tracked = {
+            "members",
+            "operators",
+            "order_by",
+            "criteria",
+            "limit",
+            "offset",
+            "bind_limit_offset",
+            "alias",
+        }
+
+        if attribute in tracked:
+            self._up_to_date = False
+
+    @property
+    def alias(self) -> Optional[str]:
+        """
+        Returns the alias of the compound query.
+        Returns:
+            Optional[str]: The alias of the compound query.
+        """
+        return self._alias
+
+    @alias.setter
+    def alias(self, value: Optional[str]) -> None:
+        """
+        Sets the alias of the compound query.
+        Args:
+            value (Optional[str]): The alias of the compound query.
+        """
+        if value is not None:
+            if isinstance(value, SQLExpression):
+                value = value.expression_value
+            validate_name(value, validate_chars=not self.ignore_forbidden_chars)
+        self._alias = value
+
+    @staticmethod
+    def validate_member(member: SelectQuery) -> None:
+        """
+        Validates a compound member.
+        Args:
+            member (SelectQuery): The member to validate.
+        Raises:
+            TypeError: If the member is not an instance of SelectQuery.
+        """
+        if not isinstance(member, SelectQuery):
+            raise TypeError("Compound members must be instances of SelectQuery")
+
+    def _add_member(self, operator: str, other: Union[SelectQuery, CompoundQuery]) -> CompoundQuery:
+        if isinstance(other, CompoundQuery):
+            if other.order_by or other.limit is not None or other.offset is not None:
+                raise ValueError("A nested compound cannot carry its own ORDER BY, LIMIT or OFFSET.")
+            self.members = self.members + other.members
+            self.operators = self.operators + [operator] + other.operators
+            return self
+        self.validate_member(other)
+        self.members = self.members + [other]
+        self.operators = self.operators + [operator]
+        return self
+
+    def UNION(self, other: Union[SelectQuery, CompoundQuery]) -> CompoundQuery:
+        """
+        Appends a member with UNION.
+        Args:
+            other (Union[SelectQuery, CompoundQuery]): The query to append.
+        Returns:
+            CompoundQuery: The current instance of CompoundQuery.
+        """
+        return self._add_member("UNION", other)
+
+    def UNION_ALL(self, other: Union[SelectQuery, CompoundQuery]) -> CompoundQuery:
+        """
+        Appends a member with UNION ALL.
+        Args:
+            other (Union[SelectQuery, CompoundQuery]): The query to append.
+        Returns:
+            CompoundQuery: The current instance of CompoundQuery.
+        """
+        return self._add_member("UNION ALL", other)
+
+    def INTERSECT(self, other: Union[SelectQuery, CompoundQuery]) -> CompoundQuery:
+        """
+        Appends a member with INTERSECT.
+        Args:
+            other (Union[SelectQuery, CompoundQuery]): The query to append.
+        Returns:
+            CompoundQuery: The current instance of CompoundQuery.
+        """
+        return self._add_member("INTERSECT", other)
+
+    def EXCEPT(self, other: Union[SelectQuery, CompoundQuery]) -> CompoundQuery:
+        """
+        Appends a member with EXCEPT.
+        Args:
+            other (Union[SelectQuery, CompoundQuery]): The query to append.
+        Returns:
+            CompoundQuery: The current instance of CompoundQuery.
+        """
+        return self._add_member("EXCEPT", other)
+
+    def ORDER_BY(self, *items: Union[SQLOrderBy, List[SQLOrderBy]]) -> CompoundQuery:
+        if not items:
+            self.order_by = None
+            self.criteria = None
+            return self
+        collected_order_by, collected_criteria = _collect_order_by(items)
+        if not collected_order_by:
+            return self
+        self.order_by = collected_order_by
+        self.criteria = collected_criteria
+        return self
+
+    def LIMIT(self, limit: Optional[Union[int, str]] = None, *, bind: Optional[bool] = None) -> CompoundQuery:
+        self.limit = limit
+        if bind is not None:
+            self.bind_limit_offset = bind
+        return self
+
+    def OFFSET(self, offset: Optional[Union[int, str]] = None, *, bind: Optional[bool] = None) -> CompoundQuery:
+        self.offset = offset
+        if bind is not None:
+            self.bind_limit_offset = bind
+        return self
+
+    def AS(self, alias=None) -> CompoundQuery:
+        """
+        Sets the alias for the compound query.
+        Args:
+            alias (str): The alias to set.
+        Returns:
+            CompoundQuery: The current instance of CompoundQuery.
+        """
+        self.alias = alias
+        return self
+
+    def _placeholder_pair(self) -> Tuple[str, Any]:
+        """
+        Returns a placeholder pair for the compound query.
+        Returns:
+            Tuple[str, Any]: A tuple containing the query string and parameters.
+        """
+        return build_compound_query(
+            members=[member._compound_member_pair() for member in self.members],
+            operators=self.operators,
+            order_by=self.order_by,
+            criteria=self.criteria or "DESC",
+            limit=self.limit,
+            offset=self.offset,
+            bind_limit_offset=self.bind_limit_offset,
+        )
+
+    def placeholder_pair(self, include_alias: bool = True) -> Tuple[str, Any]:
+        """
+        Returns a placeholder pair for the compound query.
+        Args:
+            include_alias (bool): Whether to include the alias in the placeholder pair.
+        Returns:
+            Tuple[str, Any]: A tuple containing the query string and parameters.
+        """
+        if not self._up_to_date:
+            (
+                self._cached_placeholder_str,
+                self._cached_placeholder_params,
+            ) = self._placeholder_pair()
+            self._up_to_date = True
+        string = self._cached_placeholder_str
+        params = self._cached_placeholder_params
+        if include_alias and self.alias:
+            string = ensure_bracketed(string)
+            string = f"{string} AS {self.alias}"
+        return string, params
+
+    def placeholder_str(self, *args, include_alias: bool = True, **kwargs) -> str:
+        string, _ = self.placeholder_pair(include_alias=include_alias)
+        return string
+
+    def copy_with(
+        self,
+        members: Optional[List[SelectQuery]] = None,
+        operators: Optional[List[str]] = None,
+        order_by: Optional[List[SQLOrderBy]] = None,
+        criteria: Optional[List[str]] = None,
+        limit: Optional[Union[int, str]] = None,
+        offset: Optional[Union[int, str]] = None,
+        bind_limit_offset: Optional[bool] = None,
+        alias: Optional[str] = None,
+    ) -> CompoundQuery:
+        """
+        Creates a copy of the current compound query with the specified modifications.
+        Members are copied, so later changes to the originals do not leak into the copy.
+        Returns:
+            CompoundQuery: A new instance of CompoundQuery with the specified modifications.
+        """
+        members = members if members is not None else [member.copy() for member in self.members]
+        operators = operators if operators is not None else self.operators
+        if len(operators) != len(members) - 1:
+            raise ValueError("Number of operators must be one less than the number of members.")
+        new = CompoundQuery(
+            members[0],
+            order_by=order_by if order_by is not None else self.order_by,
+            criteria=criteria if criteria is not None else self.criteria,
+            limit=limit if limit is not None else self.limit,
+            offset=offset if offset is not None else self.offset,
+            bind_limit_offset=bind_limit_offset if bind_limit_offset is not None else self.bind_limit_offset,
+            alias=alias if alias is not None else self.alias,
+            ignore_forbidden_chars=self.ignore_forbidden_chars,
+        )
+        for operator, member in zip(operators, members[1:]):
+            new._add_member(operator, member)
+        return new
+
+    def _collect_references(self, refs: References) -> None:
+        for member in self.members:
+            refs.add(member)
+        refs.add_columns(self.order_by)
+
+    def copy(self) -> CompoundQuery:
+        return self.copy_with()
+
+    def __eq__(self, other):
+        return False
+
+    def __ne__(self, other):
+        return True
+
+    def __str__(self) -> str:
+        mid, args = self.placeholder_pair()
+        args = ", ".join(str(arg) for arg in args)
+        return f"CompoundQuery({mid}, <{args}> )"
+
+    def __repr__(self) -> str:
+        members = ", ".join(repr(member) for member in self.members)
+        return f"CompoundQuery(members=[{members}], operators={self.operators})"
+
+
 def SELECT(
     column_list: Union[SQLCol, List[SQLCol]] = "*",
     *args: SQLCol,
@@ -681,31 +1140,43 @@ def SELECT(
 SELECT.__doc__ = SelectQuery.SELECT.__doc__
 
 
-class WithQuery:
+class WithQuery(ReferencesMixin):
     def __new__(
         cls,
-        query: SelectQuery,
+        query: Union[SelectQuery, CompoundQuery],
         alias: SQLCol = None,
         ignore_forbidden_chars: bool = False,
+        *,
+        columns: Optional[List[SQLCol]] = None,
+        materialized: Optional[bool] = None,
+        recursive: bool = False,
     ):
         if isinstance(query, WithQuery):
             return query
-        if not isinstance(query, SelectQuery):
-            raise TypeError("query must be an instance of SelectQuery")
+        if not isinstance(query, (SelectQuery, CompoundQuery)):
+            raise TypeError("query must be an instance of SelectQuery or CompoundQuery")
         if not isinstance(alias, (str, SQLExpression, type(None))):
             raise TypeError("alias must be an instance of SQLCol or None")
-        query = query.copy()
         return super().__new__(cls)
 
     def __init__(
         self,
-        query: SelectQuery,
+        query: Union[SelectQuery, CompoundQuery],
         alias: SQLCol = None,
         ignore_forbidden_chars: bool = False,
+        *,
+        columns: Optional[List[SQLCol]] = None,
+        materialized: Optional[bool] = None,
+        recursive: bool = False,
     ):
+        if isinstance(query, WithQuery):
+            return  # __new__ returned the existing instance
         self.ignore_forbidden_chars = ignore_forbidden_chars
         self.query = query
         self.alias = alias
+        self.columns = columns
+        self.materialized = materialized
+        self.recursive = recursive
 
     @property
     def alias(self) -> SQLCol:
@@ -721,16 +1192,56 @@ class WithQuery:
             validate_name(value, validate_chars=not self.ignore_forbidden_chars)
         self._alias = value
 
+    @property
+    def columns(self) -> Optional[List[str]]:
+        """
+        Returns the column list of the CTE, rendered as `alias(a, b)`.
+        Returns:
+            Optional[List[str]]: The column names, or None.
+        """
+        return self._columns
+
+    @columns.setter
+    def columns(self, value: Optional[List[SQLCol]]) -> None:
+        if value is None:
+            self._columns = None
+            return
+        names = [get_col_value(column) for column in enlist(value)]
+        for name in names:
+            validate_name(name, validate_chars=not self.ignore_forbidden_chars)
+        self._columns = names or None
+
+    @property
+    def materialized(self) -> Optional[bool]:
+        """
+        Returns the materialization hint: True for MATERIALIZED, False for NOT MATERIALIZED, None for no hint.
+        """
+        return self._materialized
+
+    @materialized.setter
+    def materialized(self, value: Optional[bool]) -> None:
+        if value is not None and not isinstance(value, bool):
+            raise TypeError("materialized must be True, False or None")
+        self._materialized = value
+
     def placeholder_pair(self, include_with=True) -> Tuple[str, Any]:
         alias = self.alias
         if alias is None:
             raise ValueError("Alias must be set for the WithQuery")
         string, params = self.query.placeholder_pair(include_alias=False)
-        string = f"{alias} AS {ensure_bracketed(string)}"
+        name = f"{alias}({', '.join(self.columns)})" if self.columns else alias
+        if self.materialized is None:
+            hint = ""
+        else:
+            hint = "MATERIALIZED " if self.materialized else "NOT MATERIALIZED "
+        string = f"{name} AS {hint}{ensure_bracketed(string)}"
         if include_with:
-            string = f"WITH {string}"
+            string = f"WITH RECURSIVE {string}" if self.recursive else f"WITH {string}"
         return string, params
 
+    def _collect_references(self, refs: References) -> None:
+        refs.add(self.query)
+
     def AS(self, alias: SQLCol) -> WithQuery:
         """
         Sets the alias for the WithQuery.
@@ -742,6 +1253,48 @@ class WithQuery:
         self.alias = alias
         return self
 
+    @normalize_args(skip=1)
+    def COLUMNS(self, *columns: SQLCol) -> WithQuery:
+        """
+        Sets the column list of the CTE, rendered as `alias(a, b)`.
+        Args:
+            *columns (SQLCol): The column names.
+        Returns:
+            WithQuery: The current instance of WithQuery.
+        """
+        self.columns = list(columns) or None
+        return self
+
+    def MATERIALIZED(self, materialized: Optional[bool] = True) -> WithQuery:
+        """
+        Sets the materialization hint of the CTE.
+        Args:
+            materialized (Optional[bool]): True for MATERIALIZED, False for NOT MATERIALIZED, None to clear.
+        Returns:
+            WithQuery: The current instance of WithQuery.
+        """
+        self.materialized = materialized
+        return self
+
+    def NOT_MATERIALIZED(self) -> WithQuery:
+        """
+        Marks the CTE as NOT MATERIALIZED.
+        Returns:
+            WithQuery: The current instance of WithQuery.
+        """
+        return self.MATERIALIZED(False)
+
+    def RECURSIVE(self, recursive: bool = True) -> WithQuery:
+        """
+        Marks the CTE as recursive, so the statement is rendered as WITH RECURSIVE.
+        Args:
+            recursive (bool): Whether the CTE is recursive.
+        Returns:
+            WithQuery: The current instance of WithQuery.
+        """
+        self.recursive = recursive
+        return self
+
     def copy(self) -> WithQuery:
         """
         Creates a copy of the current WithQuery.
@@ -752,15 +1305,21 @@ class WithQuery:
             self.query.copy(),
             alias=self.alias,
             ignore_forbidden_chars=self.ignore_forbidden_chars,
+            columns=self.columns,
+            materialized=self.materialized,
+            recursive=self.recursive,
         )
 
 
 @normalize_args()
-def WITH(*with_queries: WithQuery, base: Optional[SelectQuery] = None, **as_with_dict) -> SelectQuery:
+def WITH(
+    *with_queries: WithQuery, base: Optional[SelectQuery] = None, recursive: bool = False, **as_with_dict
+) -> SelectQuery:
     """
     Constructs a WITH SQL query.
     Args:
         *with_queries (WithQuery): The WITH queries to include.
+        recursive (bool): If True, marks every CTE as recursive and renders WITH RECURSIVE.
         **as_with_dict (dict): Additional WITH queries as keyword arguments.
     Returns:
         SelectQuery: A SelectQuery containing the WITH queries.
@@ -768,6 +1327,12 @@ def WITH(*with_queries: WithQuery, base: Optional[SelectQuery] = None, **as_with
         >>> query = WITH(WithQuery(SELECT("id").FROM("users")), WithQuery(SELECT("name").FROM("products")))
         >>> print(query.placeholder_pair())
         WITH id AS (SELECT id FROM users), name AS (SELECT name FROM products)
+        >>> anchor = SELECT(num(1)).FROM("seed")
+        >>> step = SELECT(col("n") + 1).FROM("counter").WHERE(col("n") < 10)
+        >>> query = WITH(WithQuery(anchor.UNION_ALL(step), "counter", columns=["n"]), recursive=True)
+        >>> print(query.SELECT("n").FROM("counter").placeholder_pair())
+        ('WITH RECURSIVE counter(n) AS (SELECT ? FROM "seed" UNION ALL SELECT (?+n) FROM "counter" WHERE n < ?)
+        SELECT n FROM "counter"', [1, 1, 10])
     """
     with_queries = list(with_queries)
     if not with_queries and not as_with_dict:
@@ -775,13 +1340,18 @@ def WITH(*with_queries: WithQuery, base: Optional[SelectQuery] = None, **as_with
     for key, value in as_with_dict.items():
         if not isinstance(key, SQLCol):
             raise TypeError("Key must be an instance of SQLCol")
-        if not isinstance(value, SelectQuery):
-            raise TypeError("Value must be an instance of SelectQuery")
+        if not isinstance(value, (SelectQuery, CompoundQuery)):
+            raise TypeError("Value must be an instance of SelectQuery or CompoundQuery")
         new_with = WithQuery(value, alias=key)
         with_queries.append(new_with)
     for i, with_query in enumerate(with_queries):
-        if isinstance(with_query, SelectQuery):
+        if isinstance(with_query, (SelectQuery, CompoundQuery)):
             with_queries[i] = WithQuery(with_query)
+    if recursive:
+        # Mark copies, so a CTE reused in another WITH is not rendered RECURSIVE there
+        with_queries = [
+            with_query if with_query.recursive else with_query.copy().RECURSIVE() for with_query in with_queries
+        ]
     base: SelectQuery = base or SelectQuery()
 
     base.withs = with_queries
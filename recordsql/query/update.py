@@ -1,10 +1,38 @@
+from itertools import chain
 from ..base import RecordQuery
 from ..types import SQLCol, SQLInput
 from ..dependencies import SQLCondition, no_condition, SQLExpression
-from typing import List, Tuple, Any, Union, Dict
+from typing import List, Tuple, Any, Union, Dict, Iterable, Iterator, Optional
 from ..validators import validate_name, validate_column_names
-from .utils import is_pair, get_col_value, normalize_args
-from ..raw_querybuilders import build_update_query
+from .utils import is_pair, get_col_value, normalize_args, enlist
+from ..raw_querybuilders import build_update_query, build_update_from_values_chunks
+from ..raw_querybuilders.utils import DEFAULT_MAX_PARAMS
+from ..references import References
+
+
+def _source_rows(
+    rows: Iterable[Union[Dict[str, SQLInput], Iterable[SQLInput]]], columns: Optional[List[SQLCol]]
+) -> Optional[Tuple[List[SQLCol], Iterator[Iterable[SQLInput]]]]:
+    """
+    Resolves the columns of a FROM_VALUES source and lazily turns dict rows into value rows.
+    Returns None when there are no rows.
+    """
+    iterator = iter(rows)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return None
+    if columns is None:
+        if not isinstance(first, dict):
+            raise ValueError("columns must be provided when FROM_VALUES rows are not dicts.")
+        columns = list(first.keys())
+    names = [get_col_value(column) for column in columns]
+
+    def generate():
+        for row in chain([first], iterator):
+            yield [row[name] for name in names] if isinstance(row, dict) else row
+
+    return columns, generate()
 
 
 class UpdateQuery(RecordQuery):
@@ -27,6 +55,7 @@ class UpdateQuery(RecordQuery):
         if isinstance(returning, (str, SQLExpression)):
             returning = [returning]
         self.returning = returning
+        self.values_source = None
 
     @property
     def set_clauses(self):
@@ -87,6 +116,16 @@ class UpdateQuery(RecordQuery):
 
         return set_clauses
 
+    def _collect_references(self, refs: References) -> None:
+        super()._collect_references(refs)
+        if self.set_clauses:
+            refs.add_columns(list(self.set_clauses))
+            refs.add(list(self.set_clauses.values()))
+        if self.values_source is not None:
+            _, key_columns, columns = self.values_source
+            refs.add_columns(key_columns)
+            refs.add_columns(columns)
+
     def SET(self, *args, **kwargs) -> "UpdateQuery":
         new_clauses = {}
 
@@ -151,10 +190,76 @@ class UpdateQuery(RecordQuery):
     UPDATE_TABLE = UPDATE  # Alias for UPDATE_TABLE method
     TABLE = UPDATE  # Alias for TABLE method
 
+    def FROM_VALUES(
+        self,
+        rows: Iterable[Union[Dict[str, SQLInput], Iterable[SQLInput]]],
+        key: Union[SQLCol, List[SQLCol]],
+        columns: Optional[List[SQLCol]] = None,
+    ) -> "UpdateQuery":
+        """
+        Updates many rows at once, each with its own values, matched on `key`.
+        Args:
+            rows (Iterable[Union[Dict[str, SQLInput], Iterable[SQLInput]]]): The new values, as dicts
+                or as sequences in `columns` order. Any iterable works; it is copied once, so the query
+                can be rendered more than once.
+            key (Union[SQLCol, List[SQLCol]]): The column(s) identifying the row to update.
+            columns (Optional[List[SQLCol]]): The column of each value, key included.
+                Defaults to the keys of the first dict row.
+        Returns:
+            UpdateQuery: The updated query. Columns set with SET are applied to every matched row
+                and WHERE further restricts them.
+        Example:
+            >>> query = UPDATE("users").FROM_VALUES([(1, "Ann"), (2, "Bob")], key="id", columns=["id", "name"])
+            >>> for sql, params in query.placeholder_chunks():
+            ...     conn.execute(sql, params)
+        """
+        if columns is not None:
+            columns = list(columns)
+        self.values_source = (list(rows), enlist(key), columns)
+        return self
+
+    def placeholder_chunks(self, max_params: Optional[int] = DEFAULT_MAX_PARAMS) -> Iterator[Tuple[str, List[Any]]]:
+        """
+        Renders the query as statements that each stay under `max_params` parameters.
+        Args:
+            max_params (Optional[int]): Maximum number of bound parameters per statement.
+        Returns:
+            Iterator[Tuple[str, List[Any]]]: One (query, params) pair per chunk of FROM_VALUES rows,
+                or the single statement when FROM_VALUES is not used.
+        """
+        if self.values_source is None:
+            return iter([self.placeholder_pair()])
+        rows, key_columns, columns = self.values_source
+        resolved = _source_rows(rows, columns)
+        if resolved is None:
+            return iter(())
+        columns, rows = resolved
+        return build_update_from_values_chunks(
+            table_name=self.table_name,
+            columns=columns,
+            key_columns=key_columns,
+            rows=rows,
+            values=self.set_clauses or None,
+            condition=self.condition,
+            returning=self.returning,
+            max_params=max_params,
+            ignore_forbidden_chars=self.ignore_forbidden_characters,
+        )
+
     def placeholder_pair(self) -> Tuple[str, List[Any]]:
         """
         Builds the UPDATE SQL query and placeholder values.
         """
+        if self.values_source is not None:
+            chunks = list(self.placeholder_chunks())
+            if not chunks:
+                raise ValueError("FROM_VALUES needs at least one row.")
+            if len(chunks) > 1:
+                raise ValueError(
+                    f"FROM_VALUES rows need {len(chunks)} statements to stay under {DEFAULT_MAX_PARAMS} "
+                    "parameters; use placeholder_chunks()."
+                )
+            return chunks[0]
         # So you know it's a pair of query and injections
         query, injections = build_update_query(
             table_name=self.table_name,
@@ -0,0 +1,177 @@
+from __future__ import annotations
+from typing import List, Tuple, Any, Optional, Union
+from ..dependencies import SQLExpression, SQLCondition, Func
+from ..raw_querybuilders.window import Window
+from ..types import SQLInput
+from ..validators import validate_name
+
+
+class WindowFunction(SQLExpression):
+    """
+    A function evaluated over a window: `func OVER (...)` or `func OVER name`.
+
+    Behaves like any other SQLExpression, so it can be aliased with `AS`, used
+    as a SELECT column, compared in an outer query or passed to ORDER_BY.
+    """
+
+    def __init__(
+        self,
+        func: SQLExpression,
+        window: Union[Window, str, None] = None,
+        *,
+        filter: Optional[SQLCondition] = None,
+        alias: Optional[Union[str, SQLExpression]] = None,
+    ) -> None:
+        if not isinstance(func, SQLExpression):
+            raise TypeError("func must be an SQLExpression, e.g. Func('SUM', col('amount')).")
+        if window is None:
+            window = Window()
+        elif isinstance(window, SQLExpression):
+            window = window.expression_value
+        if isinstance(window, str):
+            validate_name(window)
+        elif not isinstance(window, Window):
+            raise TypeError("window must be a Window or the name of a window defined with WINDOW.")
+        if filter is not None and not isinstance(filter, SQLCondition):
+            raise TypeError("filter must be an SQLCondition.")
+        self.func = func
+        self.window = window
+        self.filter = filter
+        super().__init__(None, expression_type="func", auto_parse_numbers=False, alias=alias)
+
+    def _over_pair(self) -> Tuple[str, List[Any]]:
+        if isinstance(self.window, str):
+            return f"OVER {self.window}", []
+        spec, params = self.window.placeholder_pair()
+        return f"OVER ({spec})", params
+
+    def placeholder_pair(
+        self, include_sign=True, include_sign_only_if_negative=True, invert=True, include_alias=True
+    ) -> Tuple[str, List[Any]]:
+        string, params = self.func.placeholder_pair(include_alias=False)
+        params = list(params)
+        if self.filter is not None:
+            filter_str, filter_params = self.filter.placeholder_pair()
+            string = f"{string} FILTER (WHERE {filter_str})"
+            params.extend(filter_params)
+        over_str, over_params = self._over_pair()
+        string = f"{string} {over_str}"
+        params.extend(over_params)
+        if include_alias:
+            string += self.alias_str()
+        return string, params
+
+    def placeholder_str(
+        self, include_sign=True, include_sign_only_if_negative=True, invert=True, include_alias=True
+    ) -> str:
+        string, _ = self.placeholder_pair(include_alias=include_alias)
+        return string
+
+    def sql_string(
+        self, include_sign=True, include_sign_only_if_negative=True, invert=True, include_alias=True
+    ) -> str:
+        string = self.func.sql_string(include_alias=False)
+        if self.filter is not None:
+            string = f"{string} FILTER (WHERE {self.filter.sql_string()})"
+        over_str, over_params = self._over_pair()
+        if over_params:
+            raise ValueError("A window with bound parameters cannot be rendered without placeholders.")
+        string = f"{string} {over_str}"
+        if include_alias:
+            string += self.alias_str()
+        return string
+
+    def _collect_references(self, refs: Any) -> None:
+        refs.add(self.func)
+        refs.add(self.filter)
+        if isinstance(self.window, Window):
+            refs.add(self.window)
+
+    def is_column_expression(self) -> bool:
+        return True
+
+    def copy(self) -> WindowFunction:
+        return self.copy_with()
+
+    def copy_with(self, func=None, window=None, filter=None, alias=None, **kwargs) -> WindowFunction:
+        return WindowFunction(
+            func if func is not None else self.func.copy(),
+            window if window is not None else (self.window if isinstance(self.window, str) else self.window.copy()),
+            filter=filter if filter is not None else self.filter,
+            alias=alias if alias is not None else self.alias,
+        )
+
+    def __str__(self) -> str:
+        return f"WindowFunction({self.placeholder_str()})"
+
+    def __repr__(self) -> str:
+        return f"WindowFunction({self.func!r}, {self.window!r})"
+
+
+def over(
+    func: SQLExpression,
+    window: Union[Window, str, None] = None,
+    *,
+    filter: Optional[SQLCondition] = None,
+) -> WindowFunction:
+    """
+    Evaluates a function over a window.
+    Args:
+        func (SQLExpression): The aggregate or window function, e.g. `Func("SUM", col("amount"))` or `RANK()`.
+        window (Union[Window, str, None]): An inline Window, the name of a WINDOW clause entry,
+            or None for `OVER ()`.
+        filter (Optional[SQLCondition]): Optional `FILTER (WHERE ...)` condition for aggregates.
+    Returns:
+        WindowFunction: The windowed expression.
+    Example:
+        >>> to_date = Window().ORDER_BY(("ts", "ASC")).ROWS_BETWEEN("UNBOUNDED PRECEDING")
+        >>> running = over(Func("SUM", col("amount")), to_date)
+        >>> SELECT(col("ts"), running.AS("running_total")).FROM("payments")
+    """
+    return WindowFunction(func, window, filter=filter)
+
+
+def ROW_NUMBER() -> Func:
+    return Func("ROW_NUMBER")
+
+
+def RANK() -> Func:
+    return Func("RANK")
+
+
+def DENSE_RANK() -> Func:
+    return Func("DENSE_RANK")
+
+
+def PERCENT_RANK() -> Func:
+    return Func("PERCENT_RANK")
+
+
+def CUME_DIST() -> Func:
+    return Func("CUME_DIST")
+
+
+def NTILE(buckets: int) -> Func:
+    return Func("NTILE", buckets)
+
+
+def LAG(expression: SQLInput, offset: int = 1, default: Optional[SQLInput] = None) -> Func:
+    args = [expression, offset] if default is None else [expression, offset, default]
+    return Func("LAG", *args)
+
+
+def LEAD(expression: SQLInput, offset: int = 1, default: Optional[SQLInput] = None) -> Func:
+    args = [expression, offset] if default is None else [expression, offset, default]
+    return Func("LEAD", *args)
+
+
+def FIRST_VALUE(expression: SQLInput) -> Func:
+    return Func("FIRST_VALUE", expression)
+
+
+def LAST_VALUE(expression: SQLInput) -> Func:
+    return Func("LAST_VALUE", expression)
+
+
+def NTH_VALUE(expression: SQLInput, n: int) -> Func:
+    return Func("NTH_VALUE", expression, n)
@@ -1,17 +1,28 @@
+from .compound import build_compound_query
 from .count import build_count_query
-from .delete import build_delete_query
+from .delete import build_delete_query, build_delete_keys_chunks, build_purge_batch_query
 from .exists import build_exists_query
-from .insert import build_insert_query, OnConflictQuery
+from .insert import build_insert_query, build_insert_chunks, build_insert_template, excluded, OnConflictQuery
 from .select import build_select_query, JoinQuery
-from .update import build_update_query
+from .update import build_update_query, build_update_from_values_chunks
+from .window import build_window_spec, Window
 
 __all__ = [
+    "build_compound_query",
     "build_count_query",
     "build_delete_query",
+    "build_delete_keys_chunks",
+    "build_purge_batch_query",
     "build_exists_query",
     "build_insert_query",
+    "build_insert_chunks",
+    "build_insert_template",
+    "excluded",
     "build_select_query",
     "build_update_query",
+    "build_update_from_values_chunks",
     "OnConflictQuery",
     "JoinQuery",
+    "build_window_spec",
+    "Window",
 ]
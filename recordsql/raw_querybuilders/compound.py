@@ -0,0 +1,64 @@
+# record_queries/compound.py
+
+from typing import List, Tuple, Any, Optional, Union
+from .formatters import (
+    SQLOrderBy,
+    _format_limit_offset,
+    _format_limit_offset_placeholders,
+    _format_order_by,
+)
+
+COMPOUND_OPERATORS = {"UNION", "UNION ALL", "INTERSECT", "EXCEPT"}
+
+
+def _normalize_compound_operator(operator: str) -> str:
+    operator = " ".join(operator.replace("_", " ").upper().split())
+    if operator not in COMPOUND_OPERATORS:
+        raise ValueError(f"Unsupported compound operator: {operator}")
+    return operator
+
+
+def build_compound_query(
+    members: List[Tuple[str, List[Any]]],
+    operators: List[str],
+    order_by: Optional[Union[SQLOrderBy, List[SQLOrderBy]]] = None,
+    criteria: Union[str, List[str]] = "DESC",
+    limit: Optional[Union[int, str]] = None,
+    offset: Optional[Union[int, str]] = None,
+    bind_limit_offset: bool = False,
+) -> Tuple[str, List[Any]]:
+    """
+    Builds a compound SELECT (UNION / UNION ALL / INTERSECT / EXCEPT).
+
+    Args:
+        members: Rendered (query string, parameters) pairs of each SELECT, in order.
+        operators: The operator joining each member to the previous one (len(members) - 1).
+        order_by: Optional compound-level ORDER BY columns.
+        criteria: Sorting criteria for the ORDER BY columns.
+        limit: Optional compound-level LIMIT.
+        offset: Optional compound-level OFFSET.
+        bind_limit_offset: Emit LIMIT/OFFSET as placeholders instead of literals.
+
+    Returns:
+        A tuple of (query string, parameters list), parameters in member order.
+    """
+    if len(members) < 2:
+        raise ValueError("A compound query needs at least two SELECT members.")
+    if len(operators) != len(members) - 1:
+        raise ValueError("Number of operators must be one less than the number of members.")
+
+    first_string, first_params = members[0]
+    parts = [first_string]
+    all_params = list(first_params)
+    for operator, (string, params) in zip(operators, members[1:]):
+        parts.append(f"{_normalize_compound_operator(operator)} {string}")
+        all_params.extend(params)
+
+    order_str = _format_order_by(order_by, criteria)
+    if bind_limit_offset:
+        limit_offset_str, limit_offset_params = _format_limit_offset_placeholders(limit, offset)
+    else:
+        limit_offset_str, limit_offset_params = _format_limit_offset(limit, offset), []
+
+    query = " ".join(parts) + order_str + limit_offset_str
+    return query, all_params + limit_offset_params
@@ -1,20 +1,47 @@
-from typing import List, Tuple, Any, Optional, Union
+from typing import List, Tuple, Any, Optional, Union, Dict
 from ..dependencies import SQLCondition
+from ..validators import validate_name
 from .formatters import (
     SQLCol,
     _format_conditions,
     _format_group_by,
     _format_having,
     _format_table_name,
+    _normalize_column,
+    ensure_list,
 )
 
 
+def _format_counters(
+    counters: Optional[Dict[str, SQLCondition]], ignore_forbidden_chars: bool = False
+) -> Tuple[str, List[Any]]:
+    """
+    Formats named conditional counts, `COUNT(CASE WHEN cond THEN 1 END) AS name`, one per counter.
+    Without counters the column is a plain COUNT(*).
+    """
+    if not counters:
+        return "COUNT(*)", []
+    parts = []
+    params = []
+    for name, condition in counters.items():
+        if not ignore_forbidden_chars:
+            validate_name(name)
+        if not isinstance(condition, SQLCondition):
+            raise TypeError(f"Counter {name!r} must be an SQLCondition.")
+        condition_str, condition_params = condition.placeholder_pair()
+        parts.append(f"COUNT(CASE WHEN {condition_str} THEN 1 END) AS {name}")
+        params.extend(condition_params)
+    return ", ".join(parts), params
+
+
 def build_count_query(
     table_name: str,
     condition: Optional[SQLCondition] = None,
     group_by: Union[SQLCol, List[SQLCol], None] = None,
     having: Optional[SQLCondition] = None,
     ignore_forbidden_chars: bool = False,
+    counters: Optional[Dict[str, SQLCondition]] = None,
+    select_group_keys: bool = False,
 ) -> Tuple[str, List[Any]]:
     """
     Builds a COUNT(*) SQL query with optional WHERE, GROUP BY and HAVING clauses.
@@ -25,6 +52,8 @@ def build_count_query(
         group_by: Optional GROUP BY columns.
         having: Optional HAVING condition.
         ignore_forbidden_chars: If True, skip name validation.
+        counters: Optional named conditions, each counted in its own column in the same scan.
+        select_group_keys: If True, select the GROUP BY columns before the counts.
 
     Returns:
         Tuple of (query string, parameters list).
@@ -35,8 +64,16 @@ def build_count_query(
     group_by_clause = _format_group_by(group_by, ignore_forbidden_chars)
     having_clause, having_params = _format_having(having)
 
-    query = f"SELECT COUNT(*) FROM {table_name}{where_clause}{group_by_clause}{having_clause}"
+    count_columns, count_params = _format_counters(counters, ignore_forbidden_chars)
+    if select_group_keys and group_by:
+        keys = ", ".join(
+            _normalize_column(column, ignore_forbidden_chars=ignore_forbidden_chars)
+            for column in ensure_list(group_by, unpack_iterable=True)
+        )
+        count_columns = f"{keys}, {count_columns}"
+
+    query = f"SELECT {count_columns} FROM {table_name}{where_clause}{group_by_clause}{having_clause}"
 
-    all_params = where_params + having_params
+    all_params = count_params + where_params + having_params
 
     return query, all_params
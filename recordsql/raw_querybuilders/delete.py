@@ -1,6 +1,13 @@
-from typing import List, Tuple, Any, Optional, Union
-from ..dependencies import SQLCondition
-from .formatters import _format_conditions, _format_table_name, _format_returning
+from typing import List, Tuple, Any, Optional, Union, Iterable, Iterator
+from ..dependencies import SQLCondition, FalseCondition
+from .formatters import (
+    SQLCol,
+    _format_conditions,
+    _format_table_name,
+    _format_returning,
+    _normalize_column,
+    _chunk_row_placeholders,
+)
 
 
 def build_delete_query(
@@ -27,3 +34,88 @@ def build_delete_query(
     query = f"DELETE FROM {table_name}{where_clause}{returning_clause}"
 
     return query, where_params
+
+
+def build_delete_keys_chunks(
+    table_name: str,
+    key_columns: List[SQLCol],
+    keys: Iterable[Any],
+    condition: Optional[SQLCondition] = None,
+    returning: Optional[Union[str, List[str]]] = None,
+    chunk_size: Optional[int] = None,
+    ignore_forbidden_chars: bool = False,
+) -> Iterator[Tuple[str, List[Any]]]:
+    """
+    Builds DELETE statements for a set of keys, `chunk_size` keys per statement.
+
+    A single key column renders `WHERE k IN (?, ?, ...)`; composite keys use
+    row values, `WHERE (a, b) IN (VALUES (?, ?), ...)` (SQLite 3.15+).
+
+    Args:
+        table_name: The name of the table.
+        key_columns: The key column(s).
+        keys: The keys to delete, scalars for one column or tuples for several. Consumed lazily.
+        condition: Optional condition further restricting the deleted rows.
+        returning: Optional RETURNING clause.
+        chunk_size: Maximum number of keys per statement, or None for a single statement.
+        ignore_forbidden_chars: If True, skip name validation.
+
+    Yields:
+        Tuples of (query string, parameters list), one per chunk.
+    """
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    table_name = _format_table_name(table_name, validate=not ignore_forbidden_chars)
+    key_list = [_normalize_column(column, ignore_forbidden_chars=ignore_forbidden_chars) for column in key_columns]
+    if not key_list:
+        raise ValueError("At least one key column must be provided.")
+    width = len(key_list)
+
+    condition_str, condition_params = "", []
+    if condition and not isinstance(condition, FalseCondition):
+        condition_str, condition_params = condition.placeholder_pair()
+        condition_str = f" AND ({condition_str})"
+    returning_clause = _format_returning(returning, ignore_forbidden_chars)
+
+    if width == 1:
+        rows = ([key] for key in keys)
+        prefix = f"DELETE FROM {table_name} WHERE {key_list[0]} IN ("
+    else:
+        rows = keys
+        prefix = f"DELETE FROM {table_name} WHERE ({', '.join(key_list)}) IN (VALUES "
+    suffix = f"){condition_str}{returning_clause}"
+
+    max_params = chunk_size * width if chunk_size is not None else None
+    for chunk_placeholders, chunk_params in _chunk_row_placeholders(rows, width, max_params):
+        if width == 1:
+            # Single keys are a plain list, not parenthesized rows
+            chunk_placeholders = [placeholder[1:-1] for placeholder in chunk_placeholders]
+        yield prefix + ", ".join(chunk_placeholders) + suffix, chunk_params + list(condition_params)
+
+
+def build_purge_batch_query(
+    table_name: str,
+    condition: Optional[SQLCondition] = None,
+    batch_size: int = 1000,
+    ignore_forbidden_chars: bool = False,
+) -> Tuple[str, List[Any]]:
+    """
+    Builds a DELETE that removes at most `batch_size` matching rows:
+    `DELETE FROM t WHERE rowid IN (SELECT rowid FROM t WHERE <cond> LIMIT ?)`.
+    Requires a rowid table (not WITHOUT ROWID).
+
+    Args:
+        table_name: The name of the table.
+        condition: Optional condition selecting the rows to purge.
+        batch_size: Maximum number of rows deleted per execution.
+        ignore_forbidden_chars: If True, skip name validation.
+
+    Returns:
+        A tuple of (query string, parameters list).
+    """
+    if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
+    table_name = _format_table_name(table_name, validate=not ignore_forbidden_chars)
+    where_clause, where_params = _format_conditions(condition)
+    query = f"DELETE FROM {table_name} WHERE rowid IN (SELECT rowid FROM {table_name}{where_clause} LIMIT ?)"
+    return query, list(where_params) + [batch_size]
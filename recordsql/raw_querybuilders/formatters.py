@@ -1,6 +1,6 @@
 # record_queries/formatters.py
 
-from typing import Dict, Any, List, Tuple, Union, Optional
+from typing import Dict, Any, List, Tuple, Union, Optional, Iterator
 from collections.abc import Iterable
 from ..dependencies import (
     SQLCondition,
@@ -9,6 +9,7 @@ from ..dependencies import (
     ensure_sql_expression,
 )
 from ..validators import validate_name
+from ..profiling import profile_namespace
 from ..utils import All
 from ..base import RecordQuery
 
@@ -114,7 +115,7 @@ def _normalize_order_by(order_by: Union[str, SQLExpression]) -> str:
     elif isinstance(order_by, SQLExpression):
         if not order_by.is_column_expression():
             raise TypeError("order_by must be a string or a column expression.")
-        return order_by.sql_string(include_sign_only_if_negative=True, invert=True)
+        return order_by.sql_string(include_sign_only_if_negative=True, invert=True, include_alias=False)
     else:
         raise TypeError("order_by must be a string or a column expression.")
 
@@ -148,21 +149,67 @@ def _format_order_by(
 format_order_by = _format_order_by  # Alias for backward compatibility
 
 
+def _collect_order_by(items: Iterable[Any]) -> Tuple[List[SQLOrderBy], List[str]]:
+    """
+    Splits ORDER_BY arguments into columns and their criteria, padding missing criteria with "DESC".
+    """
+    collected_order_by = []
+    collected_criteria = []
+    for item in items:
+        if isinstance(item, (list, tuple)) and len(item) == 2:
+            collected_order_by.append(item[0])
+            collected_criteria.append(item[1])
+        elif isinstance(item, str):
+            if item.upper() in ["ASC", "DESC"]:
+                collected_criteria.append(item.upper())
+            else:
+                collected_order_by.append(item)
+        elif isinstance(item, (str, SQLExpression)):
+            collected_order_by.append(item)
+    ob_len = len(collected_order_by)
+    for _ in range(len(collected_criteria), ob_len):
+        collected_criteria.append("DESC")
+    return collected_order_by, collected_criteria[:ob_len]
+
+
+def _coerce_limit_value(value: Union[int, str], label: str) -> int:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        raise ValueError(f"{label} must be an integer or a string representing an integer.")
+
+
 def _format_limit_offset(limit: Optional[Union[int, str]], offset: Optional[Union[int, str]]) -> str:
     clauses = []
     if limit is not None:
-        try:
-            clauses.append(f"LIMIT {int(limit)}")
-        except (ValueError, TypeError):
-            raise ValueError("Limit must be an integer or a string representing an integer.")
+        clauses.append(f"LIMIT {_coerce_limit_value(limit, 'Limit')}")
     if offset is not None:
-        try:
-            clauses.append(f"OFFSET {int(offset)}")
-        except (ValueError, TypeError):
-            raise ValueError("Offset must be an integer or a string representing an integer.")
+        clauses.append(f"OFFSET {_coerce_limit_value(offset, 'Offset')}")
     return " " + " ".join(clauses) if clauses else ""
 
 
+def _format_limit_offset_placeholders(
+    limit: Optional[Union[int, str]], offset: Optional[Union[int, str]]
+) -> Tuple[str, List[int]]:
+    """
+    Formats LIMIT/OFFSET as bound parameters instead of inlined literals.
+
+    Keeps the SQL text identical across pages, so statement caches can reuse it.
+
+    Returns:
+        Tuple[str, List[int]]: (" LIMIT ? OFFSET ?", [limit, offset]) or ("", []).
+    """
+    clauses = []
+    params = []
+    if limit is not None:
+        clauses.append("LIMIT ?")
+        params.append(_coerce_limit_value(limit, "Limit"))
+    if offset is not None:
+        clauses.append("OFFSET ?")
+        params.append(_coerce_limit_value(offset, "Offset"))
+    return (" " + " ".join(clauses) if clauses else ""), params
+
+
 def column_string(column_list: Union[SQLCol, List[SQLCol]], *args: SQLCol) -> str:
     if column_list == "*":
         all_cols = "*"
@@ -329,6 +376,68 @@ def format_set_clause(values: Dict[str, Any]) -> Tuple[str, List[Any]]:
     return set_clause, all_injections
 
 
+_PLAIN_VALUE_TYPES = (str, int, float, bytes, type(None))
+
+
+def _value_placeholder(value: Any) -> Tuple[str, List[Any]]:
+    """
+    Returns the placeholder and parameters of a single inserted value.
+    Plain Python values bind directly; anything else goes through expressql.
+    """
+    if isinstance(value, SQLExpression):
+        return value.placeholder_pair()
+    if isinstance(value, _PLAIN_VALUE_TYPES):
+        return "?", [value]
+    return ensure_sql_expression(value).placeholder_pair()
+
+
+def _plain_row_template(width: int) -> str:
+    return f"({', '.join('?' * width)})"
+
+
+def _row_placeholder(row: Iterable[Any], width: int, plain_template: str) -> Tuple[str, List[Any]]:
+    row = list(row)
+    if len(row) != width:
+        raise ValueError(f"Expected {width} values, got {len(row)}.")
+    if all(isinstance(value, _PLAIN_VALUE_TYPES) for value in row):
+        return plain_template, row
+    ph_strings = []
+    row_params = []
+    for value in row:
+        ph, params = _value_placeholder(value)
+        ph_strings.append(ph)
+        row_params.extend(params)
+    return f"({', '.join(ph_strings)})", row_params
+
+
+def _chunk_row_placeholders(
+    rows: Iterable[Iterable[Any]], width: int, max_params: Optional[int] = None
+) -> Iterator[Tuple[List[str], List[Any]]]:
+    """
+    Groups value rows into chunks whose bound parameters stay within `max_params`.
+
+    Rows are consumed lazily. Each chunk is a (row placeholders, parameters) pair,
+    e.g. (["(?, ?)", "(?, ?)"], [1, "a", 2, "b"]). A `max_params` of None yields
+    a single chunk.
+    """
+    plain_template = _plain_row_template(width)
+    chunk_placeholders = []
+    chunk_params = []
+    for row in rows:
+        row_ph, row_params = _row_placeholder(row, width, plain_template)
+        if max_params is not None:
+            if len(row_params) > max_params:
+                raise ValueError(f"A single row needs {len(row_params)} parameters, more than max_params allows.")
+            if chunk_placeholders and len(chunk_params) + len(row_params) > max_params:
+                yield chunk_placeholders, chunk_params
+                chunk_placeholders = []
+                chunk_params = []
+        chunk_placeholders.append(row_ph)
+        chunk_params.extend(row_params)
+    if chunk_placeholders:
+        yield chunk_placeholders, chunk_params
+
+
 def _format_group_by(
     group_by: Optional[Union[SQLCol, List[SQLCol]]],
     ignore_forbidden_chars: bool = False,
@@ -390,3 +499,6 @@ def _format_table_name(table_name: str, validate=True) -> str:
         return table_name.strip()
 
     return quote_sandwich(table_name, 0)  # Add double quotes around the table name
+
+
+profile_namespace(globals())
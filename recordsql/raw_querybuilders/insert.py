@@ -1,7 +1,7 @@
-from typing import List, Tuple, Any, Optional, Union, Dict
+from functools import lru_cache
+from typing import List, Tuple, Any, Optional, Union, Dict, Iterable, Iterator
 from ..dependencies import (
     SQLCondition,
-    ensure_sql_expression,
     no_condition,
     SQLExpression
 )
@@ -13,13 +13,37 @@ from .formatters import (
     _format_or_clause,
     _format_returning,
     _validate_col_names,
+    _plain_row_template,
+    _row_placeholder,
+    _chunk_row_placeholders,
 )
-from expressql.base import ensure_col
-from .utils import validate_monolist
+from expressql.base import ensure_col, col
+from .utils import validate_monolist, DEFAULT_MAX_PARAMS
 from .formatters import format_conditions
 from .formatters import _all_have_same_keys
 
 
+def excluded(column: SQLCol) -> SQLExpression:
+    """
+    References the value proposed for insertion inside an ON CONFLICT DO UPDATE clause.
+
+    Example:
+        >>> OnConflictQuery("UPDATE", ["id"], {"name": excluded("name")})
+    """
+    if isinstance(column, SQLExpression):
+        column = column.expression_value
+    return col(f"excluded.{column}")
+
+
+@lru_cache(maxsize=256)
+def _format_upsert_clause(conflict_cols: Tuple[str, ...], update_cols: Tuple[str, ...]) -> str:
+    conflict_target = ", ".join(conflict_cols)
+    if not update_cols:
+        return f"ON CONFLICT ({conflict_target}) DO NOTHING"
+    assignments = ", ".join(f"{column} = excluded.{column}" for column in update_cols)
+    return f"ON CONFLICT ({conflict_target}) DO UPDATE SET {assignments}"
+
+
 def build_insert_query(
     table_name: str,
     values: Union[Dict[str, Any], List[Dict[str, Any]]],
@@ -61,15 +85,11 @@ def build_insert_query(
     # --- Prepare placeholders and parameters ---
     rows_placeholder = []
     all_params = []
+    width = len(col_names)
+    plain_template = _plain_row_template(width)
     for row in values:
-        row_exprs = [ensure_sql_expression(row[col]) for col in col_names]
-        ph_strings = []
-        row_params = []
-        for expr in row_exprs:
-            ph, params = expr.placeholder_pair()
-            ph_strings.append(ph)
-            row_params.extend(params)
-        rows_placeholder.append(f"({', '.join(ph_strings)})")
+        row_ph, row_params = _row_placeholder([row[name] for name in col_names], width, plain_template)
+        rows_placeholder.append(row_ph)
         all_params.extend(row_params)
 
     values_clause = ", ".join(rows_placeholder)
@@ -95,6 +115,96 @@ def build_insert_query(
     return query, all_params
 
 
+def _format_insert_prefix(
+    table_name: str,
+    columns: List[SQLCol],
+    or_action: Optional[str] = None,
+    ignore_forbidden_chars: bool = False,
+) -> str:
+    """Renders `INSERT [OR action] INTO "table" (columns) VALUES `, shared by every row of a bulk insert."""
+    table_name = _format_table_name(table_name, validate=not ignore_forbidden_chars)
+    if not columns:
+        raise ValueError("Columns must be provided for a chunked INSERT.")
+    col_list = [_normalize_column(column, ignore_forbidden_chars=ignore_forbidden_chars) for column in columns]
+    return f"INSERT{_format_or_clause(or_action)} INTO {table_name} ({', '.join(col_list)}) VALUES "
+
+
+def build_insert_chunks(
+    table_name: str,
+    columns: List[SQLCol],
+    rows: Iterable[Iterable[Any]],
+    or_action: Optional[str] = None,
+    on_conflict: Optional["OnConflictQuery"] = None,
+    returning: Optional[Union[SQLCol, List[SQLCol]]] = None,
+    max_params: int = DEFAULT_MAX_PARAMS,
+    ignore_forbidden_chars: bool = False,
+) -> Iterator[Tuple[str, List[Any]]]:
+    """
+    Builds a bulk INSERT as a sequence of multi-row statements that each stay under `max_params`.
+
+    Rows are consumed lazily, so generators of any size can be streamed. The
+    statement prefix and the ON CONFLICT / RETURNING suffix are rendered once
+    and shared by every chunk.
+
+    Args:
+        table_name: The name of the table.
+        columns: The inserted columns.
+        rows: An iterable of value rows, in column order.
+        or_action: Optional OR action like "REPLACE" or "IGNORE".
+        on_conflict: Optional OnConflictQuery instance, repeated on every chunk.
+        returning: Optional returning clause.
+        max_params: Maximum number of bound parameters per statement.
+        ignore_forbidden_chars: If True, skip name validation.
+
+    Yields:
+        Tuples of (query string, parameters list), one per chunk.
+    """
+    prefix = _format_insert_prefix(table_name, columns, or_action, ignore_forbidden_chars)
+    width = len(columns)
+
+    if on_conflict:
+        conflict_clause, conflict_params = on_conflict.placeholder_pair()
+    else:
+        conflict_clause, conflict_params = "", []
+    returning_clause = _format_returning(returning, ignore_forbidden_chars)
+    suffix = " ".join(part for part in (conflict_clause, returning_clause.strip()) if part)
+    if suffix:
+        suffix = " " + suffix
+
+    for chunk_placeholders, chunk_params in _chunk_row_placeholders(rows, width, max_params - len(conflict_params)):
+        yield prefix + ", ".join(chunk_placeholders) + suffix, chunk_params + conflict_params
+
+
+def build_insert_template(
+    table_name: str,
+    columns: List[SQLCol],
+    or_action: Optional[str] = None,
+    on_conflict: Optional["OnConflictQuery"] = None,
+    ignore_forbidden_chars: bool = False,
+) -> str:
+    """
+    Builds a single-row INSERT with one plain placeholder per column, for `executemany`.
+
+    Args:
+        table_name: The name of the table.
+        columns: The inserted columns.
+        or_action: Optional OR action like "REPLACE" or "IGNORE".
+        on_conflict: Optional OnConflictQuery instance; it must not bind parameters of its own.
+        ignore_forbidden_chars: If True, skip name validation.
+
+    Returns:
+        The query string, e.g. 'INSERT INTO "t" (a, b) VALUES (?, ?)'.
+    """
+    prefix = _format_insert_prefix(table_name, columns, or_action, ignore_forbidden_chars)
+    query = prefix + _plain_row_template(len(columns))
+    if on_conflict:
+        conflict_clause, conflict_params = on_conflict.placeholder_pair()
+        if conflict_params:
+            raise ValueError("An ON CONFLICT clause with bound parameters cannot be used with executemany.")
+        query += f" {conflict_clause}"
+    return query
+
+
 class OnConflictQuery:
     """
     Class to handle ON CONFLICT clauses in SQL queries.
@@ -113,11 +223,37 @@ class OnConflictQuery:
         set_clauses: Union[List[Tuple], Dict] = None,
         condition: SQLCondition = None,
     ) -> None:
+        self.update_cols = None
         self.DO(do_what)
         self.SET(set_clauses)
         self.WHERE(condition)
         conflict_cols = [ensure_col(col) for col in conflict_cols]
         self._conflict_cols = conflict_cols
+        self._rendered = None
+
+    @classmethod
+    def upsert(
+        cls,
+        conflict_cols: List[SQLCol],
+        update_cols: List[SQLCol],
+        condition: SQLCondition = None,
+    ) -> "OnConflictQuery":
+        """
+        Builds an `ON CONFLICT (...) DO UPDATE SET c = excluded.c` clause.
+
+        The rendered clause is cached per (conflict columns, update columns),
+        so every upsert statement over the same column set reuses it. With no
+        update columns the clause becomes `DO NOTHING`.
+        """
+        update_names = tuple(col.expression_value if isinstance(col, SQLExpression) else col for col in update_cols)
+        query = cls(
+            "UPDATE" if update_names else "NOTHING",
+            conflict_cols,
+            {name: excluded(name) for name in update_names},
+            condition,
+        )
+        query.update_cols = update_names
+        return query
 
     @property
     def conflict_cols(self) -> List[SQLCol]:
@@ -133,20 +269,29 @@ class OnConflictQuery:
         validate_monolist(*value, monotype=SQLCol)
         conflict_cols = [ensure_col(col) for col in value]
         self._conflict_cols = conflict_cols
+        self._rendered = None
 
     def __repr__(self):
         return f"<OnConflictQuery do_what='{self.do_what}'>"
 
+    def _collect_references(self, refs: Any) -> None:
+        refs.add_columns(self.conflict_cols)
+        refs.add_columns(list(self.set_clauses))
+        refs.add(list(self.set_clauses.values()))
+        refs.add(self.condition)
+
     def WHERE(self, condition: SQLCondition) -> "OnConflictQuery":
         if not isinstance(condition, SQLCondition) and condition is not None:
             raise TypeError("Condition must be an instance of SQLCondition.")
         self.condition = condition
+        self._rendered = None
         return self
 
     def DO(self, do_what: str) -> "OnConflictQuery":
         if do_what.upper() not in self.valid_do_what:
             raise ValueError(f"Invalid action: {do_what}. Valid actions are: {self.valid_do_what}")
         self.do_what = do_what.upper()
+        self._rendered = None
         return self
 
     def SET(self, *args, **kwargs) -> "OnConflictQuery":
@@ -165,13 +310,28 @@ class OnConflictQuery:
                 set_dict[arg[0]] = arg[1]
         set_dict.update(kwargs)
         self.set_clauses = set_dict
-        print(set_dict)
+        self.update_cols = None
+        self._rendered = None
         return self
 
-    def placeholder_pair(self) -> str:
+    def placeholder_pair(self) -> Tuple[str, List[Any]]:
         """
         Returns a string representation of the ON CONFLICT clause.
+        The result is cached until the clause is modified.
         """
+        if self._rendered is None:
+            self._rendered = self._build()
+        clause, injections = self._rendered
+        return clause, list(injections)
+
+    def _build(self) -> Tuple[str, List[Any]]:
+        if self.update_cols is not None:
+            conflict_names = tuple(col.expression_value for col in self.conflict_cols)
+            clause = _format_upsert_clause(conflict_names, self.update_cols)
+            if not self.update_cols or not self.condition:
+                return clause, []
+            condition_clause, condition_injections = format_conditions(self.condition)
+            return f"{clause}{condition_clause}", list(condition_injections)
         if self.do_what == "NOTHING":
             return "ON CONFLICT DO NOTHING", []
         elif self.do_what == "UPDATE":
@@ -1,6 +1,6 @@
 # record_queries/select.py
 
-from typing import List, Tuple, Any, Optional, Union
+from typing import List, Tuple, Any, Optional, Union, Dict
 from ..dependencies import SQLCondition
 from ..utils import All
 from .formatters import (
@@ -11,10 +11,12 @@ from .formatters import (
     _format_group_by,
     _format_having,
     _format_limit_offset,
+    _format_limit_offset_placeholders,
     _format_order_by,
     _format_table_name,
 )
 from ..validators import validate_name
+from .window import Window, _format_windows
 
 
 def build_select_query(
@@ -29,14 +31,20 @@ def build_select_query(
     having: Optional[SQLCondition] = None,
     joins: Optional[List["JoinQuery"]] = None,  # type hint correction
     ignore_forbidden_chars: bool = False,
+    bind_limit_offset: bool = False,
+    windows: Optional[Dict[str, Window]] = None,
 ) -> Tuple[str, List[Any]]:
     columns_str, column_placeholders = collect_column_placeholders(columns, ignore_forbidden_chars)
 
     where_clause, where_params = _format_conditions(condition)
     group_by_clause = _format_group_by(group_by, ignore_forbidden_chars)
     having_clause, having_params = _format_having(having)
+    window_clause, window_params = _format_windows(windows, ignore_forbidden_chars)
     order_str = _format_order_by(order_by, criteria)
-    limit_offset_str = _format_limit_offset(limit, offset)
+    if bind_limit_offset:
+        limit_offset_str, limit_offset_params = _format_limit_offset_placeholders(limit, offset)
+    else:
+        limit_offset_str, limit_offset_params = _format_limit_offset(limit, offset), []
 
     table_name = _format_table_name(table_name, validate=not ignore_forbidden_chars)
     query = f"SELECT {columns_str} FROM {table_name}"
@@ -45,9 +53,10 @@ def build_select_query(
     query += where_clause
     query += group_by_clause
     query += having_clause
+    query += window_clause
     query += order_str + limit_offset_str
 
-    all_params = column_placeholders + where_params + join_params + having_params
+    all_params = column_placeholders + join_params + where_params + having_params + window_params + limit_offset_params
     return query, all_params
 
 
@@ -74,6 +83,10 @@ class JoinQuery:
         self.alias = alias
         self.ignore_forbidden_chars = ignore_forbidden_chars
 
+    def _collect_references(self, refs: Any) -> None:
+        refs.add_table(self.table_name)
+        refs.add(self.on)
+
     def placeholder_pair(self) -> Tuple[str, List[Any]]:
         condition_str, params = self.on.placeholder_pair()
         table_expr = _format_table_name(self.table_name, validate=not self.ignore_forbidden_chars)
@@ -1,13 +1,18 @@
-from typing import List, Tuple, Any, Optional, Union, Dict
-from ..dependencies import SQLCondition
+from typing import List, Tuple, Any, Optional, Union, Dict, Iterable, Iterator
+from ..dependencies import SQLCondition, FalseCondition
 from .formatters import (
     SQLCol,
     _format_conditions,
     _format_table_name,
     format_set_clause,
     _format_returning,
+    _normalize_column,
+    _chunk_row_placeholders,
 )
 from .formatters import normalize_update_values
+from .utils import DEFAULT_MAX_PARAMS
+
+VALUES_SOURCE_NAME = "v"
 
 
 def build_update_query(
@@ -43,3 +48,68 @@ def build_update_query(
     all_params = set_params + where_params
 
     return query, all_params
+
+
+def build_update_from_values_chunks(
+    table_name: str,
+    columns: List[SQLCol],
+    key_columns: List[SQLCol],
+    rows: Iterable[Iterable[Any]],
+    values: Optional[Dict[str, Any]] = None,
+    condition: Optional[SQLCondition] = None,
+    returning: Optional[Union[SQLCol, List[SQLCol]]] = None,
+    max_params: Optional[int] = DEFAULT_MAX_PARAMS,
+    ignore_forbidden_chars: bool = False,
+) -> Iterator[Tuple[str, List[Any]]]:
+    """
+    Builds a bulk UPDATE that takes a different value per row from a VALUES source.
+
+    SQLite does not accept a column list on a subquery alias (`AS v(k, c)`), so
+    the rows are bound through an equivalent CTE:
+    `WITH v(k, c) AS (VALUES (?, ?), ...) UPDATE t SET c = v.c FROM v WHERE t.k = v.k`.
+    Requires UPDATE ... FROM support (SQLite 3.33+).
+
+    Args:
+        table_name: Name of the table.
+        columns: The columns of each row, key columns included.
+        key_columns: The columns matching a source row to a table row.
+        rows: An iterable of value rows, in column order, consumed lazily.
+        values: Optional extra column-value pairs set on every matched row.
+        condition: Optional condition further restricting the updated rows.
+        returning: Optional RETURNING clause.
+        max_params: Maximum number of bound parameters per statement, or None for a single statement.
+        ignore_forbidden_chars: If True, skip name validation.
+
+    Yields:
+        Tuples of (query string, parameters list), one per chunk.
+    """
+    table_name = _format_table_name(table_name, validate=not ignore_forbidden_chars)
+    col_list = [_normalize_column(column, ignore_forbidden_chars=ignore_forbidden_chars) for column in columns]
+    key_list = [_normalize_column(column, ignore_forbidden_chars=ignore_forbidden_chars) for column in key_columns]
+    if not key_list:
+        raise ValueError("At least one key column must be provided.")
+    missing = [key for key in key_list if key not in col_list]
+    if missing:
+        raise ValueError(f"Key columns {missing} are not among the row columns {col_list}.")
+    source = VALUES_SOURCE_NAME
+    assignments = [f"{column} = {source}.{column}" for column in col_list if column not in key_list]
+    set_params = []
+    if values:
+        extra_clause, set_params = format_set_clause(normalize_update_values(values))
+        assignments.append(extra_clause[len("SET "):])
+    if not assignments:
+        raise ValueError("No columns left to update besides the key columns.")
+
+    match = " AND ".join(f"{table_name}.{key} = {source}.{key}" for key in key_list)
+    condition_params = []
+    if condition and not isinstance(condition, FalseCondition):
+        condition_str, condition_params = condition.placeholder_pair()
+        match = f"{match} AND ({condition_str})"
+    returning_clause = _format_returning(returning, ignore_forbidden_chars)
+
+    prefix = f"WITH {source}({', '.join(col_list)}) AS (VALUES "
+    suffix = f") UPDATE {table_name} SET {', '.join(assignments)} FROM {source} WHERE {match}{returning_clause}"
+    fixed_params = list(set_params) + list(condition_params)
+    budget = max_params - len(fixed_params) if max_params is not None else None
+    for chunk_placeholders, chunk_params in _chunk_row_placeholders(rows, len(col_list), budget):
+        yield prefix + ", ".join(chunk_placeholders) + suffix, chunk_params + fixed_params
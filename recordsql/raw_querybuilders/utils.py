@@ -1,5 +1,8 @@
 from typing import Type, Union, Iterable
 
+# SQLite's historical SQLITE_MAX_VARIABLE_NUMBER; builds since 3.32 allow 32766.
+DEFAULT_MAX_PARAMS = 999
+
 
 def enlist(items, decompose_string=False, decompose_bytes=True, *, unpack=True) -> list:
     if any(
@@ -0,0 +1,201 @@
+# record_queries/window.py
+
+import re
+from typing import List, Tuple, Any, Optional, Union, Dict
+from ..dependencies import SQLExpression
+from ..validators import validate_name
+from .formatters import SQLCol, SQLOrderBy, _collect_order_by, _format_order_by, ensure_list
+
+FRAME_TYPES = {"ROWS", "RANGE", "GROUPS"}
+_FIXED_BOUNDS = {"UNBOUNDED PRECEDING", "CURRENT ROW", "UNBOUNDED FOLLOWING"}
+_OFFSET_BOUND_PATTERN = re.compile(r"^(\d+) (PRECEDING|FOLLOWING)$")
+
+
+def _format_frame_bound(bound: Union[int, str]) -> str:
+    """
+    Formats a window frame bound.
+
+    Integers are offsets from the current row: negative values are PRECEDING,
+    positive values are FOLLOWING and 0 is CURRENT ROW. Strings must be one of
+    the SQL bound forms, e.g. "UNBOUNDED PRECEDING" or "3 FOLLOWING".
+    """
+    if isinstance(bound, bool):
+        raise TypeError("Frame bound must be an integer or a string.")
+    if isinstance(bound, int):
+        if bound == 0:
+            return "CURRENT ROW"
+        return f"{abs(bound)} {'PRECEDING' if bound < 0 else 'FOLLOWING'}"
+    if isinstance(bound, str):
+        normalized = " ".join(bound.upper().split())
+        if normalized in _FIXED_BOUNDS or _OFFSET_BOUND_PATTERN.match(normalized):
+            return normalized
+        raise ValueError(f"Invalid frame bound: {bound}")
+    raise TypeError("Frame bound must be an integer or a string.")
+
+
+def _format_frame(frame: Optional[Tuple[str, Union[int, str], Optional[Union[int, str]]]]) -> str:
+    if not frame:
+        return ""
+    frame_type, start, end = frame
+    frame_type = frame_type.strip().upper()
+    if frame_type not in FRAME_TYPES:
+        raise ValueError(f"Unsupported frame type: {frame_type}")
+    if end is None:
+        return f"{frame_type} {_format_frame_bound(start)}"
+    return f"{frame_type} BETWEEN {_format_frame_bound(start)} AND {_format_frame_bound(end)}"
+
+
+def _collect_partition_placeholders(
+    partition_by: Optional[Union[SQLCol, List[SQLCol]]], ignore_forbidden_chars: bool = False
+) -> Tuple[str, List[Any]]:
+    if not partition_by:
+        return "", []
+    parts = []
+    params = []
+    for item in ensure_list(partition_by, unpack_iterable=True):
+        if isinstance(item, str):
+            item = item.strip()
+            if not ignore_forbidden_chars:
+                validate_name(item, allow_dot=True)
+            parts.append(item)
+        elif isinstance(item, SQLExpression):
+            item_str, item_params = item.placeholder_pair(include_alias=False)
+            parts.append(item_str)
+            params.extend(item_params)
+        else:
+            raise TypeError("partition_by must contain strings or SQL expressions.")
+    return "PARTITION BY " + ", ".join(parts), params
+
+
+def build_window_spec(
+    base: Optional[str] = None,
+    partition_by: Optional[Union[SQLCol, List[SQLCol]]] = None,
+    order_by: Optional[Union[SQLOrderBy, List[SQLOrderBy]]] = None,
+    criteria: Union[str, List[str]] = "DESC",
+    frame: Optional[Tuple[str, Union[int, str], Optional[Union[int, str]]]] = None,
+    ignore_forbidden_chars: bool = False,
+) -> Tuple[str, List[Any]]:
+    """
+    Builds the body of a window definition (the part inside OVER (...) or WINDOW name AS (...)).
+
+    Args:
+        base: Optional name of a window this one extends.
+        partition_by: Optional PARTITION BY columns or expressions.
+        order_by: Optional ORDER BY columns.
+        criteria: Sorting criteria for the ORDER BY columns.
+        frame: Optional (frame type, start bound, end bound) triple.
+        ignore_forbidden_chars: If True, skip name validation.
+
+    Returns:
+        Tuple of (window spec string, parameters list).
+    """
+    parts = []
+    if base:
+        if not ignore_forbidden_chars:
+            validate_name(base)
+        parts.append(base)
+    partition_str, params = _collect_partition_placeholders(partition_by, ignore_forbidden_chars)
+    if partition_str:
+        parts.append(partition_str)
+    order_str = _format_order_by(order_by, criteria).strip()
+    if order_str:
+        parts.append(order_str)
+    frame_str = _format_frame(frame)
+    if frame_str:
+        parts.append(frame_str)
+    return " ".join(parts), params
+
+
+class Window:
+    """
+    A window definition for window functions.
+
+    Used inline through `over(func, window)` or registered by name with
+    `SelectQuery.WINDOW(name=window)` and referenced as `over(func, "name")`.
+
+    Example:
+        >>> by_dept = Window().PARTITION_BY("department").ORDER_BY(("salary", "DESC"))
+        >>> by_dept.placeholder_pair()
+        ('PARTITION BY department ORDER BY salary DESC', [])
+    """
+
+    def __init__(
+        self,
+        partition_by: Optional[Union[SQLCol, List[SQLCol]]] = None,
+        order_by: Optional[List[SQLOrderBy]] = None,
+        criteria: Optional[List[str]] = None,
+        frame: Optional[Tuple[str, Union[int, str], Optional[Union[int, str]]]] = None,
+        base: Optional[str] = None,
+        ignore_forbidden_chars: bool = False,
+    ) -> None:
+        self.partition_by = partition_by
+        self.order_by = order_by
+        self.criteria = criteria
+        self.frame = frame
+        self.base = base
+        self.ignore_forbidden_chars = ignore_forbidden_chars
+
+    def PARTITION_BY(self, *columns: SQLCol) -> "Window":
+        self.partition_by = list(columns) or None
+        return self
+
+    def ORDER_BY(self, *items: Union[SQLOrderBy, Tuple[SQLOrderBy, str]]) -> "Window":
+        order_by, criteria = _collect_order_by(items)
+        self.order_by = order_by or None
+        self.criteria = criteria or None
+        return self
+
+    def ROWS_BETWEEN(self, start: Union[int, str], end: Union[int, str] = "CURRENT ROW") -> "Window":
+        self.frame = ("ROWS", start, end)
+        return self
+
+    def RANGE_BETWEEN(self, start: Union[int, str], end: Union[int, str] = "CURRENT ROW") -> "Window":
+        self.frame = ("RANGE", start, end)
+        return self
+
+    def GROUPS_BETWEEN(self, start: Union[int, str], end: Union[int, str] = "CURRENT ROW") -> "Window":
+        self.frame = ("GROUPS", start, end)
+        return self
+
+    def _collect_references(self, refs: Any) -> None:
+        refs.add_columns(self.partition_by)
+        refs.add_columns(self.order_by)
+
+    def placeholder_pair(self) -> Tuple[str, List[Any]]:
+        return build_window_spec(
+            base=self.base,
+            partition_by=self.partition_by,
+            order_by=self.order_by,
+            criteria=self.criteria or "DESC",
+            frame=self.frame,
+            ignore_forbidden_chars=self.ignore_forbidden_chars,
+        )
+
+    def copy(self) -> "Window":
+        return Window(
+            partition_by=self.partition_by,
+            order_by=self.order_by,
+            criteria=self.criteria,
+            frame=self.frame,
+            base=self.base,
+            ignore_forbidden_chars=self.ignore_forbidden_chars,
+        )
+
+    def __repr__(self) -> str:
+        return f"Window({self.placeholder_pair()[0]!r})"
+
+
+def _format_windows(
+    windows: Optional[Dict[str, Window]], ignore_forbidden_chars: bool = False
+) -> Tuple[str, List[Any]]:
+    if not windows:
+        return "", []
+    clauses = []
+    params = []
+    for name, window in windows.items():
+        if not ignore_forbidden_chars:
+            validate_name(name)
+        spec, spec_params = window.placeholder_pair()
+        clauses.append(f"{name} AS ({spec})")
+        params.extend(spec_params)
+    return " WINDOW " + ", ".join(clauses), params
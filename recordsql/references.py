@@ -0,0 +1,132 @@
+"""
+Structural dependency extraction for recordsql queries.
+
+Queries report the tables and columns they touch by walking their own
+attributes and the expressql trees inside them; no SQL text is parsed.
+
+Key Classes:
+    - References: Accumulates table and column names while walking a query
+    - ReferencesMixin: Adds memoized `referenced_tables()` / `referenced_columns()`
+"""
+from typing import Any, FrozenSet, Set, Tuple
+from .dependencies import SQLExpression
+from .utils import All
+
+_MEMO_ATTRIBUTE = "_references_memo"
+
+
+class References:
+    """
+    Accumulates the tables and columns referenced by a query tree.
+    """
+
+    __slots__ = ("tables", "columns", "_seen")
+
+    def __init__(self) -> None:
+        self.tables: Set[str] = set()
+        self.columns: Set[str] = set()
+        self._seen: Set[int] = set()
+
+    def add_table(self, table_name: Any) -> None:
+        if isinstance(table_name, SQLExpression):
+            table_name = table_name.expression_value
+        if isinstance(table_name, str) and table_name:
+            self.tables.add(table_name.strip())
+
+    def add_column(self, column: Any) -> None:
+        """Adds a column given by name, as an expression, or a subquery / expression used as a column."""
+        if isinstance(column, str):
+            column = column.strip()
+            if column and column != "*":
+                self.columns.add(column)
+        elif column is not None and not isinstance(column, All):
+            self.add(column)
+
+    def add_columns(self, columns: Any) -> None:
+        if columns is None:
+            return
+        if isinstance(columns, (list, tuple, set, frozenset)):
+            for column in columns:
+                self.add_column(column)
+        else:
+            self.add_column(columns)
+
+    def add(self, node: Any) -> None:
+        """
+        Walks any node: a recordsql object with `_collect_references`, or an expressql tree.
+        """
+        if node is None or isinstance(node, (str, bytes, int, float)):
+            return
+        if isinstance(node, (list, tuple, set, frozenset)):
+            for item in node:
+                self.add(item)
+            return
+        if isinstance(node, dict):
+            for item in node.values():
+                self.add(item)
+            return
+        # Containers may be temporaries whose id gets reused, so only nodes are tracked
+        if id(node) in self._seen:
+            return
+        self._seen.add(id(node))
+        if isinstance(node, ReferencesMixin):
+            tables, columns = node._references()
+            self.tables.update(tables)
+            self.columns.update(columns)
+            return
+        collect = getattr(type(node), "_collect_references", None)
+        if collect is not None:
+            collect(node, self)
+            return
+        if isinstance(node, SQLExpression) and node.expression_type == "column":
+            self.add_column(node.expression_value)
+            return
+        if type(node).__module__.startswith("expressql") and hasattr(node, "__dict__"):
+            for name, value in vars(node).items():
+                if name != "_alias":  # an output name, not a referenced column
+                    self.add(value)
+
+
+class ReferencesMixin:
+    """
+    Provides `referenced_tables()` and `referenced_columns()`.
+
+    Subclasses implement `_collect_references(refs)`. The result is memoized on
+    the node and dropped whenever one of its attributes is reassigned, which is
+    how every builder method records changes.
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name != _MEMO_ATTRIBUTE:
+            self.__dict__.pop(_MEMO_ATTRIBUTE, None)
+        super().__setattr__(name, value)
+
+    def _collect_references(self, refs: References) -> None:
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def _references(self) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        memo = self.__dict__.get(_MEMO_ATTRIBUTE)
+        if memo is None:
+            refs = References()
+            refs._seen.add(id(self))
+            self._collect_references(refs)
+            memo = (frozenset(refs.tables), frozenset(refs.columns))
+            self.__dict__[_MEMO_ATTRIBUTE] = memo
+        return memo
+
+    def referenced_tables(self) -> FrozenSet[str]:
+        """
+        Returns the names of the tables the query reads or writes, subqueries included.
+        CTE names are not tables and are left out.
+        Returns:
+            FrozenSet[str]: The table names, as written in the query.
+        """
+        return self._references()[0]
+
+    def referenced_columns(self) -> FrozenSet[str]:
+        """
+        Returns the names of the columns the query mentions anywhere, subqueries included.
+        Returns:
+            FrozenSet[str]: The column names, as written (possibly qualified, e.g. "users.id").
+        """
+        return self._references()[1]
@@ -0,0 +1,139 @@
+"""
+Slow-query log for queries executed through an Engine.
+
+Key Classes:
+    - SlowQueryLog: An Instrumentation that keeps, per query shape, how often it
+      ran above a threshold, the total time and the worst sample
+
+Example:
+    >>> slow_log = SlowQueryLog(threshold_ms=50)
+    >>> with instrumented(slow_log):
+    ...     run_workload(engine)
+    >>> slow_log.to_json("slow_queries.json")
+"""
+from __future__ import annotations
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from .instrumentation import Instrumentation, QueryEvent, normalize_sql
+
+
+class _SlowEntry:
+    __slots__ = ("fingerprint", "query_type", "table", "sql", "count", "total_ns", "worst_ns", "worst_sample")
+
+    def __init__(self, event: QueryEvent) -> None:
+        self.fingerprint = event.fingerprint
+        self.query_type = event.query_type
+        self.table = event.table
+        self.sql = normalize_sql(event.sql)
+        self.count = 0
+        self.total_ns = 0
+        self.worst_ns = -1
+        self.worst_sample: Dict[str, Any] = {}
+
+    def record(self, event: QueryEvent) -> None:
+        self.count += 1
+        self.total_ns += event.exec_ns
+        if event.exec_ns > self.worst_ns:
+            self.worst_ns = event.exec_ns
+            self.worst_sample = {
+                "sql": event.sql,
+                "param_count": event.param_count,
+                "build_ns": event.build_ns,
+                "exec_ns": event.exec_ns,
+                "at": time.time(),
+            }
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "query_type": self.query_type,
+            "table": self.table,
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.total_ns / self.count / 1e6,
+            "worst_ms": self.worst_ns / 1e6,
+            "worst_sample": dict(self.worst_sample),
+        }
+
+
+class SlowQueryLog(Instrumentation):
+    """
+    Records executions slower than `threshold_ms`, grouped by normalized SQL fingerprint.
+
+    Holds at most `max_entries` shapes. When full, a new shape replaces the one
+    with the least total time, if it is not itself cheaper, so the log keeps the
+    shapes worth indexing or caching first. Executions served from the engine
+    cache are ignored. Safe to share between threads.
+    """
+
+    def __init__(self, threshold_ms: float = 100.0, max_entries: int = 1000) -> None:
+        if threshold_ms < 0:
+            raise ValueError("threshold_ms cannot be negative.")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.threshold_ms = threshold_ms
+        self.max_entries = max_entries
+        self.dropped = 0
+        self._threshold_ns = int(threshold_ms * 1e6)
+        self._entries: Dict[str, _SlowEntry] = {}
+        self._lock = threading.Lock()
+
+    def on_execute(self, event: QueryEvent) -> None:
+        if event.cached or event.exec_ns < self._threshold_ns:
+            return
+        with self._lock:
+            entry = self._entries.get(event.fingerprint)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    cheapest = min(self._entries.values(), key=lambda item: item.total_ns)
+                    if cheapest.total_ns > event.exec_ns:
+                        self.dropped += 1
+                        return
+                    del self._entries[cheapest.fingerprint]
+                    self.dropped += cheapest.count
+                entry = self._entries[event.fingerprint] = _SlowEntry(event)
+            entry.record(event)
+
+    def entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the recorded shapes, most total time first.
+        Args:
+            limit (Optional[int]): Maximum number of shapes to return.
+        Returns:
+            List[Dict[str, Any]]: Keys fingerprint, query_type, table, sql (normalized), count,
+                total_ms, mean_ms, worst_ms and worst_sample.
+        """
+        with self._lock:
+            rows = [entry.as_dict() for entry in self._entries.values()]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows[:limit] if limit is not None else rows
+
+    def to_json(self, path: Optional[str] = None, indent: Optional[int] = 2) -> str:
+        """
+        Exports the log as JSON, and writes it to `path` if given.
+        Returns:
+            str: The JSON document.
+        """
+        document = json.dumps(
+            {"threshold_ms": self.threshold_ms, "dropped": self.dropped, "queries": self.entries()},
+            indent=indent,
+        )
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(document)
+        return document
+
+    def clear(self) -> None:
+        """Forgets every recorded shape."""
+        with self._lock:
+            self._entries.clear()
+            self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"SlowQueryLog(threshold_ms={self.threshold_ms}, entries={len(self)})"
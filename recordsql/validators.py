@@ -6,6 +6,7 @@ from inspect import signature
 from .types import SQLCol
 from typing import Any, Union, Iterable, Callable, List
 from .dependencies import SQLExpression
+from .profiling import profile_namespace
 
 
 def validate_table_name(
@@ -202,6 +203,10 @@ def get_forbidden_words_in(name: str):
     return [kw for kw in keywords if kw in tokens]
 
 
+_VALID_NAMES: set = set()
+_VALID_NAMES_MAXSIZE = 4096
+
+
 def validate_name(
     name: str,
     *,
@@ -223,6 +228,29 @@ def validate_name(
     if not isinstance(name, str):
         raise TypeError("Name must be a string.")
 
+    # Validation of a string is pure, so names that passed once are remembered
+    key = (name, validate_chars, validate_words, validate_len, allow_dot, allow_dollar, max_len,
+           frozenset(forgiven_chars) if forgiven_chars else None, allow_digit)
+    if key in _VALID_NAMES:
+        return
+    _validate_name_string(name, validate_chars, validate_words, validate_len, allow_dot, allow_dollar, max_len,
+                          forgiven_chars, allow_digit)
+    if len(_VALID_NAMES) >= _VALID_NAMES_MAXSIZE:
+        _VALID_NAMES.clear()
+    _VALID_NAMES.add(key)
+
+
+def _validate_name_string(
+    name: str,
+    validate_chars: bool,
+    validate_words: bool,
+    validate_len: bool,
+    allow_dot: bool,
+    allow_dollar: bool,
+    max_len: int,
+    forgiven_chars,
+    allow_digit: bool,
+) -> None:
     if is_number(name):
         raise ValueError("Column name cannot be a number.")
 
@@ -363,3 +391,6 @@ def validate_column_names(
             max_len=max_len,
             forgiven_chars=forgiven_chars,
         )
+
+
+profile_namespace(globals())
@@ -0,0 +1,77 @@
+"""Tests for batched queries"""
+import sqlite3
+import pytest
+from recordsql import batch, SELECT, COUNT, EXISTS, col, cols
+
+
+@pytest.fixture
+def conn():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, age INTEGER)")
+    connection.executemany(
+        "INSERT INTO users (name, age) VALUES (?, ?)",
+        [("Ann", 31), ("Bob", 17), ("Cid", 45)],
+    )
+    yield connection
+    connection.close()
+
+
+@pytest.mark.batch
+class TestBatch:
+    """Test combining queries into a single statement"""
+
+    def test_batch_renders_union_all(self):
+        """Test that members are joined with UNION ALL and a discriminator"""
+        age = col("age")
+        query = batch(COUNT().FROM("users").WHERE(age > 18), EXISTS().FROM("users").WHERE(age > 40))
+        sql, params = query.placeholder_pair()
+        assert sql.startswith("SELECT 0 AS batch_index, * FROM (SELECT COUNT(*)")
+        assert " UNION ALL SELECT 1, * FROM (SELECT EXISTS(" in sql
+        assert params == [18, 40]
+
+    def test_batch_pads_narrow_members(self):
+        """Test that narrower members are padded with NULLs"""
+        name, age = cols("name", "age")
+        query = batch(COUNT().FROM("users"), SELECT(name, age).FROM("users"))
+        sql, _ = query.placeholder_pair()
+        assert "SELECT 0 AS batch_index, *, NULL FROM" in sql
+        assert query.widths == [1, 2]
+
+    def test_batch_split_roundtrip(self, conn):
+        """Test that split routes rows back to each query"""
+        name, age = cols("name", "age")
+        query = batch(
+            COUNT().FROM("users").WHERE(age > 18),
+            SELECT(name, age).FROM("users").WHERE(age < 40).ORDER_BY(age, "ASC"),
+            EXISTS().FROM("users").WHERE(name == "Zed"),
+        )
+        sql, params = query.placeholder_pair()
+        counts, rows, exists = query.split(conn.execute(sql, params))
+        assert counts == [(2,)]
+        assert rows == [("Bob", 17), ("Ann", 31)]
+        assert exists == [(0,)]
+
+    def test_batch_rejects_select_star(self):
+        """Test that SELECT * cannot be batched"""
+        query = batch(SELECT().FROM("users"))
+        with pytest.raises(ValueError):
+            query.placeholder_pair()
+
+    def test_batch_rejects_writes(self):
+        """Test that only read queries are accepted"""
+        from recordsql import DELETE
+
+        with pytest.raises(TypeError):
+            batch(DELETE("users"))
+
+    def test_batch_counts_columns_of_raw_strings(self, conn):
+        """Test commas inside function calls and literals do not count as extra columns"""
+        first = SELECT("COALESCE(name, 'a, b')").FROM("users").WHERE(col("age") > 40)
+        second = SELECT("name, substr(name, 1, 2)").FROM("users").WHERE(col("age") < 18)
+        first.ignore_forbidden_chars = second.ignore_forbidden_chars = True
+        query = batch(first, second)
+        assert query.widths == [1, 2]
+        sql, params = query.placeholder_pair()
+        first, second = query.split(conn.execute(sql, params))
+        assert first == [("Cid",)]
+        assert second == [("Bob", "Bo")]
@@ -0,0 +1,102 @@
+"""Tests for compound (UNION / INTERSECT / EXCEPT) queries"""
+import sqlite3
+import pytest
+from recordsql import SELECT, WITH, CompoundQuery, col, cols
+
+
+@pytest.mark.compound
+class TestCompoundBasic:
+    """Test basic compound query functionality"""
+
+    def test_union_all(self):
+        """Test UNION ALL of two selects"""
+        query = SELECT("id").FROM("users").UNION_ALL(SELECT("id").FROM("admins"))
+        sql, params = query.placeholder_pair()
+        assert isinstance(query, CompoundQuery)
+        assert sql == 'SELECT id FROM "users" UNION ALL SELECT id FROM "admins"'
+        assert params == []
+
+    @pytest.mark.parametrize("method, keyword", [("UNION", "UNION"), ("INTERSECT", "INTERSECT"), ("EXCEPT", "EXCEPT")])
+    def test_operators(self, method, keyword):
+        """Test each compound operator"""
+        query = getattr(SELECT("id").FROM("a"), method)(SELECT("id").FROM("b"))
+        sql, _ = query.placeholder_pair()
+        assert f' {keyword} SELECT id FROM "b"' in sql
+
+    def test_params_follow_member_order(self):
+        """Test that parameters are concatenated in member order"""
+        age = col("age")
+        query = (
+            SELECT("id").FROM("users").WHERE(age > 18)
+            .UNION(SELECT("id").FROM("admins").WHERE(age < 65))
+            .EXCEPT(SELECT("id").FROM("bans").WHERE(age == 30))
+        )
+        _, params = query.placeholder_pair()
+        assert params == [18, 65, 30]
+
+
+@pytest.mark.compound
+class TestCompoundAdvanced:
+    """Test compound-level clauses and member wrapping"""
+
+    def test_compound_order_by_and_limit(self):
+        """Test ORDER BY / LIMIT applying to the whole compound"""
+        query = (
+            SELECT("id").FROM("users").UNION_ALL(SELECT("id").FROM("admins"))
+            .ORDER_BY("id", "ASC").LIMIT(10).OFFSET(5)
+        )
+        sql, _ = query.placeholder_pair()
+        assert sql.endswith('SELECT id FROM "admins" ORDER BY id ASC LIMIT 10 OFFSET 5')
+
+    def test_compound_bound_limit(self):
+        """Test bound LIMIT at compound level is appended after member params"""
+        query = SELECT("id").FROM("users").WHERE(col("age") > 18).UNION(SELECT("id").FROM("admins"))
+        sql, params = query.LIMIT(3, bind=True).placeholder_pair()
+        assert sql.endswith("LIMIT ?")
+        assert params == [18, 3]
+
+    def test_member_with_limit_is_wrapped(self):
+        """Test that members with LIMIT are wrapped in a subquery"""
+        query = SELECT("id").FROM("users").UNION_ALL(SELECT("id").FROM("admins").LIMIT(1))
+        sql, _ = query.placeholder_pair()
+        assert 'UNION ALL SELECT * FROM (SELECT id FROM "admins" LIMIT 1)' in sql
+
+    def test_render_cache_invalidation(self):
+        """Test that the render cache refreshes on attribute changes"""
+        query = SELECT("id").FROM("users").UNION(SELECT("id").FROM("admins"))
+        first, _ = query.placeholder_pair()
+        assert query.placeholder_pair()[0] is first
+        query.LIMIT(2)
+        assert query.placeholder_pair()[0].endswith("LIMIT 2")
+
+    def test_compound_as_cte(self):
+        """Test compound query used as a subquery column source"""
+        query = SELECT("id").FROM("users").UNION(SELECT("id").FROM("admins")).AS("people")
+        sql, _ = query.placeholder_pair()
+        assert sql.endswith(") AS people")
+
+    def test_copy_is_independent(self):
+        """Test that copies do not share members"""
+        query = SELECT("id").FROM("users").UNION(SELECT("id").FROM("admins"))
+        copied = query.copy()
+        query.members[1].WHERE(col("id") > 1)
+        query._up_to_date = False
+        assert copied.placeholder_pair()[1] == []
+        assert query.placeholder_pair()[1] == [1]
+
+    def test_rejects_non_select_member(self):
+        """Test that only SelectQuery members are accepted"""
+        with pytest.raises(TypeError):
+            SELECT("id").FROM("users").UNION("SELECT 1")
+
+    def test_executes_in_sqlite(self):
+        """Test the rendered compound against SQLite"""
+        name, age = cols("name", "age")
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (name TEXT, age INTEGER)")
+        conn.executemany("INSERT INTO users VALUES (?, ?)", [("Ann", 31), ("Bob", 17), ("Cid", 45)])
+        adults = SELECT(name).FROM("users").WHERE(age > 18)
+        seniors = SELECT(name).FROM("users").WHERE(age > 40).ORDER_BY(name, "ASC").LIMIT(1)
+        query = WITH(adults.AS("adults")).SELECT(name).FROM("adults").EXCEPT(seniors).ORDER_BY(name, "ASC")
+        sql, params = query.placeholder_pair()
+        assert conn.execute(sql, params).fetchall() == [("Ann",)]
@@ -1,6 +1,8 @@
 """Tests for COUNT queries"""
+import sqlite3
 import pytest
-from recordsql import COUNT, col, cols, text
+from recordsql import COUNT, batch, col, cols, text, StatEstimateCount, CachedCount, CounterTableCount
+from recordsql.query import count_strategies
 
 
 @pytest.mark.count
@@ -134,3 +136,179 @@ class TestCountAdvanced:
         assert "SELECT COUNT(*)" in sql
         assert "WHERE" in sql
         assert "Electronics" in params
+
+
+@pytest.mark.count
+class TestCountStrategies:
+    """Test the selectable COUNT strategies"""
+
+    def _connection(self, rows=20):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, age INTEGER)")
+        conn.execute("CREATE INDEX users_age ON users (age)")
+        conn.executemany("INSERT INTO users (age) VALUES (?)", [(i,) for i in range(rows)])
+        conn.commit()
+        return conn
+
+    def test_exact_is_default(self):
+        """Test count() runs the exact query by default"""
+        conn = self._connection()
+        assert COUNT("users").count(conn) == 20
+        assert COUNT("users").WHERE(col("age") >= 15).count(conn) == 5
+
+    def test_stat_estimate(self):
+        """Test the sqlite_stat1 estimate and its fallback"""
+        conn = self._connection()
+        query = COUNT("users").STRATEGY(StatEstimateCount())
+        assert query.count(conn) == 20  # no ANALYZE yet, falls back to the exact count
+        conn.execute("ANALYZE")
+        conn.executemany("INSERT INTO users (age) VALUES (?)", [(i,) for i in range(5)])
+        assert query.count(conn) == 20  # stale but cheap
+        assert COUNT("users").WHERE(col("age") < 3).STRATEGY(StatEstimateCount()).count(conn) == 6
+
+    def test_cached_count(self):
+        """Test TTL cached counts are keyed by SQL and parameters"""
+        conn = self._connection()
+        cache = CachedCount(ttl=60)
+        assert COUNT("users").WHERE(col("age") < 10).STRATEGY(cache).count(conn) == 10
+        conn.execute("DELETE FROM users WHERE age < 5")
+        assert COUNT("users").WHERE(col("age") < 10).STRATEGY(cache).count(conn) == 10
+        assert COUNT("users").WHERE(col("age") < 8).STRATEGY(cache).count(conn) == 3
+        assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+        cache.invalidate()
+        assert COUNT("users").WHERE(col("age") < 10).STRATEGY(cache).count(conn) == 5
+
+    def test_cached_count_expires(self, monkeypatch):
+        """Test cached counts expire after the TTL"""
+        conn = self._connection()
+        clock = [100.0]
+        monkeypatch.setattr(count_strategies.time, "monotonic", lambda: clock[0])
+        query = COUNT("users").STRATEGY(CachedCount(ttl=5))
+        assert query.count(conn) == 20
+        conn.execute("DELETE FROM users WHERE age < 5")
+        clock[0] += 4
+        assert query.count(conn) == 20
+        clock[0] += 2
+        assert query.count(conn) == 15
+
+    def test_cached_count_maxsize(self):
+        """Test the cache evicts the least recently used entries"""
+        conn = self._connection()
+        cache = CachedCount(maxsize=2)
+        for age in (1, 2, 3):
+            COUNT("users").WHERE(col("age") < age).STRATEGY(cache).count(conn)
+        assert len(cache) == 2
+
+    def test_counter_table(self):
+        """Test the trigger-maintained counter table"""
+        conn = self._connection()
+        counter = CounterTableCount()
+        query = COUNT("users").STRATEGY(counter)
+        assert query.count(conn) == 20  # not installed, falls back
+        counter.install(conn, "users")
+        conn.executemany("INSERT INTO users (age) VALUES (?)", [(i,) for i in range(3)])
+        conn.execute("DELETE FROM users WHERE age = 0")
+        assert query.count(conn) == 21
+        assert conn.execute("SELECT n FROM recordsql_row_counts WHERE tbl = 'users'").fetchone() == (21,)
+        assert COUNT("users").WHERE(col("age") == 1).STRATEGY(counter).count(conn) == 2
+        counter.uninstall(conn, "users")
+        conn.execute("INSERT INTO users (age) VALUES (1)")
+        assert query.count(conn) == 22
+
+    def test_counter_table_with_replace(self):
+        """Test INSERT OR REPLACE on an existing key keeps the counter equal to COUNT(*)"""
+        conn = self._connection()
+        counter = CounterTableCount()
+        counter.install(conn, "users")
+        conn.execute("INSERT OR REPLACE INTO users (id, age) VALUES (1, 99)")
+        conn.executemany("INSERT OR REPLACE INTO users (id, age) VALUES (?, ?)", [(2, 1), (500, 1)])
+        query = COUNT("users").STRATEGY(counter)
+        assert query.count(conn) == conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 21
+        other = sqlite3.connect(":memory:")
+        CounterTableCount.prepare(other)
+        assert other.execute("PRAGMA recursive_triggers").fetchone() == (1,)
+
+    def test_strategies_only_fall_back_on_missing_tables(self):
+        """Test errors other than a missing stat or counter table are not swallowed"""
+        conn = self._connection()
+        conn.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            StatEstimateCount().estimate("users", conn)
+        with pytest.raises(sqlite3.ProgrammingError):
+            COUNT("users").STRATEGY(CounterTableCount()).count(conn)
+
+    def test_strategy_validation(self):
+        """Test STRATEGY rejects non-strategies and grouped counts need placeholder_pair"""
+        with pytest.raises(TypeError):
+            COUNT("users").STRATEGY("exact")
+        with pytest.raises(ValueError):
+            COUNT("users").GROUP_BY("age").count(self._connection())
+        with pytest.raises(ValueError):
+            CachedCount(ttl=0)
+
+
+@pytest.mark.count
+class TestCountGroupedAndMulti:
+    """Test BY() and COUNT.multi()"""
+
+    def _connection(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, dept TEXT, role TEXT, active INTEGER)")
+        rows = [("eng", "dev", 1), ("eng", "dev", 0), ("eng", "lead", 1), ("ops", "dev", 1)]
+        conn.executemany("INSERT INTO users (dept, role, active) VALUES (?, ?, ?)", rows)
+        return conn
+
+    def test_by_selects_keys(self):
+        """Test BY selects the group keys alongside the count"""
+        sql, params = COUNT("users").WHERE(col("active") == 1).BY("dept").placeholder_pair()
+        assert sql == 'SELECT dept, COUNT(*) FROM "users" WHERE active = ? GROUP BY dept'
+        assert params == [1]
+
+    def test_by_counts(self):
+        """Test BY results map back to their keys"""
+        conn = self._connection()
+        assert COUNT("users").BY("dept").counts(conn) == {"eng": 3, "ops": 1}
+        by_role = COUNT("users").BY("dept", "role").counts(conn)
+        assert by_role == {("eng", "dev"): 2, ("eng", "lead"): 1, ("ops", "dev"): 1}
+
+    def test_multi_sql(self):
+        """Test COUNT.multi renders one conditional count per name"""
+        query = COUNT.multi({"active": col("active") == 1, "leads": col("role") == "lead"}, "users")
+        sql, params = query.WHERE(col("dept") == "eng").placeholder_pair()
+        assert sql == (
+            "SELECT COUNT(CASE WHEN active = ? THEN 1 END) AS active, "
+            'COUNT(CASE WHEN role = ? THEN 1 END) AS leads FROM "users" WHERE dept = ?'
+        )
+        assert params == [1, "lead", "eng"]
+
+    def test_multi_counts(self):
+        """Test multi counts in one scan, alone and per group"""
+        conn = self._connection()
+        counters = {"active": col("active") == 1, "devs": col("role") == "dev"}
+        assert COUNT.multi(counters, "users").counts(conn) == {"active": 3, "devs": 3}
+        assert COUNT.multi(counters).FROM("users").BY("dept").counts(conn) == {
+            "eng": {"active": 2, "devs": 2},
+            "ops": {"active": 1, "devs": 1},
+        }
+        assert COUNT.multi(counters, "users").WHERE(col("dept") == "none").counts(conn) == {"active": 0, "devs": 0}
+
+    def test_multi_in_batch(self):
+        """Test multi and grouped counts report their width to batch()"""
+        conn = self._connection()
+        query = COUNT("users").COUNTERS(active=col("active") == 1, inactive=col("active") == 0)
+        grouped = COUNT("users").BY("dept")
+        assert (query.result_width, grouped.result_width) == (2, 2)
+        combined = batch(query, grouped, COUNT("users"))
+        multi_rows, grouped_rows, total_rows = combined.split(conn.execute(*combined.placeholder_pair()))
+        assert query.map_rows(multi_rows) == {"active": 3, "inactive": 1}
+        assert grouped.map_rows(grouped_rows) == {"eng": 3, "ops": 1}
+        assert total_rows == [(4,)]
+
+    def test_multi_validation(self):
+        """Test counters must be named conditions"""
+        with pytest.raises(ValueError):
+            COUNT("users").COUNTERS({})
+        with pytest.raises(TypeError):
+            COUNT.multi({"x": 1}, "users").placeholder_pair()
+        with pytest.raises(ValueError):
+            COUNT.multi({"a": col("active") == 1}, "users").count(self._connection())
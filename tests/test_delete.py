@@ -1,6 +1,8 @@
 """Tests for DELETE queries"""
+import sqlite3
 import pytest
 from recordsql import DELETE, col, cols, text
+from recordsql.raw_querybuilders.utils import DEFAULT_MAX_PARAMS
 
 
 @pytest.mark.delete
@@ -142,3 +144,139 @@ class TestDeleteAdvanced:
         assert "1 year" in params
         assert 1000 in params
         assert 0 in params
+
+
+@pytest.mark.delete
+class TestDeleteWhereKeys:
+    """Test chunked DELETE by key sets"""
+
+    def _connection(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE scores (user_id INTEGER, game_id INTEGER, score INTEGER)")
+        rows = [(u, g, u * g) for u in range(10) for g in range(10)]
+        conn.executemany("INSERT INTO scores VALUES (?, ?, ?)", rows)
+        return conn
+
+    def test_where_keys_single_column(self):
+        """Test a single key column renders an IN list"""
+        sql, params = DELETE("users").WHERE_KEYS("id", [1, 2, 3]).placeholder_pair()
+        assert sql == 'DELETE FROM "users" WHERE id IN (?, ?, ?)'
+        assert params == [1, 2, 3]
+
+    def test_where_keys_composite(self):
+        """Test composite keys render row values"""
+        sql, params = DELETE("scores").WHERE_KEYS(["user_id", "game_id"], [(1, 2), (3, 4)]).placeholder_pair()
+        assert sql == 'DELETE FROM "scores" WHERE (user_id, game_id) IN (VALUES (?, ?), (?, ?))'
+        assert params == [1, 2, 3, 4]
+
+    def test_where_keys_chunks_with_condition(self):
+        """Test chunking keeps the WHERE condition on every chunk"""
+        query = DELETE("users").WHERE_KEYS("id", range(5), chunk_size=2).WHERE(col("active") == 0)
+        chunks = list(query.placeholder_chunks())
+        assert [params for _, params in chunks] == [[0, 1, 0], [2, 3, 0], [4, 0]]
+        assert chunks[0][0] == 'DELETE FROM "users" WHERE id IN (?, ?) AND (active = ?)'
+
+    def test_where_keys_default_chunks_leave_room_for_condition(self):
+        """Test auto-sized chunks stay under the parameter limit with the WHERE condition's parameters"""
+        condition = (col("active") == 0) & (col("age") > 1) & (col("age") < 9)
+        query = DELETE("users").WHERE_KEYS("id", range(2000)).WHERE(condition)
+        chunks = list(query.placeholder_chunks())
+        assert all(len(params) <= DEFAULT_MAX_PARAMS for _, params in chunks)
+        assert sum(len(params) - 3 for _, params in chunks) == 2000
+        assert len(chunks[0][1]) == DEFAULT_MAX_PARAMS
+
+    def test_where_keys_generator_renders_twice(self):
+        """Test keys from a generator are kept for every render"""
+        query = DELETE("users").WHERE_KEYS("id", (key for key in [1, 2]))
+        assert query.placeholder_pair() == query.placeholder_pair()
+        assert query.placeholder_pair()[1] == [1, 2]
+        assert list(query.placeholder_chunks()) == [query.placeholder_pair()]
+
+    def test_where_keys_pair_respects_param_limit(self):
+        """Test placeholder_pair refuses keys that need several statements"""
+        with pytest.raises(ValueError, match="placeholder_chunks"):
+            DELETE("users").WHERE_KEYS("id", range(DEFAULT_MAX_PARAMS + 1)).placeholder_pair()
+        with pytest.raises(ValueError, match="placeholder_chunks"):
+            DELETE("users").WHERE_KEYS("id", range(5), chunk_size=2).placeholder_pair()
+        assert DELETE("users").WHERE_KEYS("id", range(2), chunk_size=2).placeholder_pair()[1] == [0, 1]
+
+    def test_where_keys_executes(self):
+        """Test chunked composite-key deletes against SQLite"""
+        conn = self._connection()
+        keys = ((u, g) for u in range(10) for g in range(5))
+        for sql, params in DELETE("scores").WHERE_KEYS(["user_id", "game_id"], keys, chunk_size=7).placeholder_chunks():
+            conn.execute(sql, params)
+        assert conn.execute("SELECT COUNT(*) FROM scores").fetchone() == (50,)
+        assert conn.execute("SELECT MIN(game_id) FROM scores").fetchone() == (5,)
+
+    def test_stream_returning(self):
+        """Test RETURNING rows are streamed back across chunks"""
+        conn = self._connection()
+        query = DELETE("scores").WHERE_KEYS("user_id", [1, 2, 3], chunk_size=1).WHERE(col("game_id") < 2)
+        rows = list(query.RETURNING("user_id", "game_id").stream_returning(conn))
+        assert sorted(rows) == [(1, 0), (1, 1), (2, 0), (2, 1), (3, 0), (3, 1)]
+        assert conn.execute("SELECT COUNT(*) FROM scores").fetchone() == (94,)
+
+    def test_where_keys_errors(self):
+        """Test WHERE_KEYS validation"""
+        with pytest.raises(ValueError):
+            DELETE("users").WHERE_KEYS("id", []).placeholder_pair()
+        with pytest.raises(ValueError):
+            list(DELETE("users").WHERE_KEYS("id", [1], chunk_size=0).placeholder_chunks())
+        with pytest.raises(ValueError):
+            list(DELETE("users").WHERE_KEYS("id", [1]).stream_returning(sqlite3.connect(":memory:")))
+        assert list(DELETE("users").WHERE_KEYS("id", []).placeholder_chunks()) == []
+
+
+@pytest.mark.delete
+class TestDeletePurge:
+    """Test the batched purge helper"""
+
+    def _connection(self, rows=25):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT)")
+        conn.executemany("INSERT INTO events (kind) VALUES (?)", [("old" if i % 5 else "new",) for i in range(rows)])
+        conn.commit()
+        return conn
+
+    def test_batch_placeholder_pair(self):
+        """Test the rowid-bounded batch DELETE"""
+        sql, params = DELETE("events").WHERE(col("kind") == "old").batch_placeholder_pair(100)
+        assert sql == (
+            'DELETE FROM "events" WHERE rowid IN (SELECT rowid FROM "events" WHERE kind = ? LIMIT ?)'
+        )
+        assert params == ["old", 100]
+
+    def test_purge_in_batches(self):
+        """Test purge deletes every matching row in bounded batches"""
+        conn = self._connection()
+        progress = list(DELETE("events").WHERE(col("kind") == "old").purge(conn, batch_size=8))
+        assert [p.deleted for p in progress] == [8, 8, 4]
+        assert [p.batches for p in progress] == [1, 2, 3]
+        assert progress[-1].total_deleted == 20
+        assert progress[-1].elapsed_seconds >= progress[-1].batch_seconds
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone() == (5,)
+
+    def test_purge_stops_on_empty_batch(self):
+        """Test purge stops after an exact multiple of the batch size"""
+        conn = self._connection(rows=10)
+        progress = list(DELETE("events").purge(conn, batch_size=5))
+        assert [p.deleted for p in progress] == [5, 5, 0]
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone() == (0,)
+
+    def test_purge_is_lazy(self):
+        """Test each batch only runs when the next progress report is requested"""
+        conn = self._connection()
+        purge = DELETE("events").purge(conn, batch_size=10)
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone() == (25,)
+        assert next(purge).total_deleted == 10
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone() == (15,)
+
+    def test_purge_errors(self):
+        """Test purge validation"""
+        with pytest.raises(ValueError):
+            DELETE("events").batch_placeholder_pair(0)
+        with pytest.raises(ValueError):
+            DELETE("events").RETURNING("id").batch_placeholder_pair(10)
+        with pytest.raises(ValueError):
+            DELETE("events").WHERE_KEYS("id", [1]).batch_placeholder_pair(10)
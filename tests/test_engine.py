@@ -0,0 +1,544 @@
+"""Tests for the execution engine"""
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from recordsql import (
+    SELECT, INSERT, UPDATE, DELETE, COUNT, EXISTS, WITH, col, Engine, ResultCache, Router, ShardedWriter, Writer,
+    WriteResult,
+)
+from recordsql.engine import cache as cache_module
+
+
+def _connection():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, team_id INTEGER)")
+    conn.execute("CREATE TABLE teams (id INTEGER PRIMARY KEY, title TEXT)")
+    conn.execute("CREATE TABLE logs (id INTEGER PRIMARY KEY, message TEXT)")
+    conn.executemany("INSERT INTO teams VALUES (?, ?)", [(1, "core"), (2, "ops")])
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?)", [(1, "ann", 1), (2, "bob", 2)])
+    conn.commit()
+    return conn
+
+
+@pytest.mark.engine
+class TestResultCache:
+    """Test the result cache and its invalidation"""
+
+    def test_reads_are_cached(self):
+        """Test repeated reads are served from the cache"""
+        conn = _connection()
+        engine = Engine(conn, cache=ResultCache())
+        query = SELECT("name").FROM("users").ORDER_BY(("id", "ASC"))
+        assert engine.fetchall(query) == [("ann",), ("bob",)]
+        conn.execute("DELETE FROM users")  # bypasses the engine, so the cache is not told
+        assert engine.fetchall(query) == [("ann",), ("bob",)]
+        assert (engine.cache.hits, engine.cache.misses) == (1, 1)
+
+    def test_writes_invalidate_their_table(self):
+        """Test writes through the engine drop only the entries reading their table"""
+        engine = Engine(_connection(), cache=ResultCache())
+        users = COUNT("users")
+        teams = COUNT("teams")
+        assert (engine.scalar(users), engine.scalar(teams)) == (2, 2)
+        engine.execute(INSERT("name", "team_id").INTO("users").VALUES("cyd", 1))
+        assert len(engine.cache) == 1
+        assert (engine.scalar(users), engine.scalar(teams)) == (3, 2)
+        engine.execute(UPDATE("users").SET(name="dan").WHERE(col("id") == 3))
+        assert engine.fetchone(SELECT("name").FROM("users").WHERE(col("id") == 3)) == ("dan",)
+        engine.execute(DELETE("users").WHERE(col("id") == 3))
+        assert engine.scalar(EXISTS().FROM("users").WHERE(col("id") == 3)) == 0
+
+    def test_join_and_with_tables_are_tracked(self):
+        """Test JOIN and WITH subquery tables are invalidation keys"""
+        engine = Engine(_connection(), cache=ResultCache())
+        joined = SELECT("users.name", "teams.title").FROM("users").INNER_JOIN(
+            "teams", on=col("users.team_id") == col("teams.id")
+        )
+        cte = WITH(SELECT("id").FROM("teams").AS("t")).SELECT("id").FROM("t")
+        engine.fetchall(joined)
+        engine.fetchall(cte)
+        assert cache_module._query_tables(cte) == {"teams"}
+        assert engine.invalidate("logs") == 0
+        assert engine.invalidate("TEAMS") == 2
+
+    def test_ttl_and_maxsize(self, monkeypatch):
+        """Test entries expire after the TTL and the cache stays bounded"""
+        clock = [0.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+        cache = ResultCache(maxsize=2, ttl=10)
+        for i in range(3):
+            cache.put((f"q{i}", ()), [(i,)], ["users"])
+        assert len(cache) == 2
+        assert cache.get(("q0", ())) is None
+        assert cache.get(("q2", ())) == [(2,)]
+        clock[0] = 11
+        assert cache.get(("q2", ())) is None
+        assert len(cache) == 1
+
+    def test_reads_racing_an_invalidation_are_not_cached(self):
+        """Test rows read while their table was invalidated are returned but not stored"""
+        engine = Engine(_connection(), cache=ResultCache())
+        fetch_rows = engine._fetch_rows
+
+        def racing_fetch(sql, params):
+            rows = fetch_rows(sql, params)
+            engine.invalidate("users")  # a write commits after the read
+            return rows
+
+        engine._fetch_rows = racing_fetch
+        assert engine.scalar(COUNT("users")) == 2
+        assert engine.scalar(COUNT("teams")) == 2
+        assert len(engine.cache) == 1
+
+    def test_put_checks_the_generation(self):
+        """Test put skips rows older than an invalidation or a clear"""
+        cache = ResultCache()
+        generation = cache.generation(["Users"])
+        cache.invalidate_tables(["logs"])
+        cache.put(("q0", ()), [(0,)], ["users"], generation)
+        assert cache.get(("q0", ())) == [(0,)]
+        cache.invalidate_tables(['"USERS"'])
+        cache.put(("q1", ()), [(1,)], ["users"], generation)
+        generation = cache.generation(["users"])
+        cache.clear()
+        cache.put(("q2", ()), [(2,)], ["users"], generation)
+        assert len(cache) == 0
+
+    def test_without_cache(self):
+        """Test the engine executes directly without a cache"""
+        engine = Engine(_connection())
+        assert engine.scalar(COUNT("users")) == 2
+        assert engine.invalidate("users") == 0
+
+    def test_cache_validation(self):
+        """Test cache bounds are validated"""
+        with pytest.raises(ValueError):
+            ResultCache(maxsize=0)
+        with pytest.raises(ValueError):
+            ResultCache(ttl=0)
+
+
+def _database(tmp_path):
+    path = str(tmp_path / "app.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT UNIQUE, team_id INTEGER)")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?)", [(1, "ann", 1), (2, "bob", 2)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.mark.engine
+class TestRouter:
+    """Test read/write splitting and the group-committing writer"""
+
+    def test_reads_use_read_only_connections(self, tmp_path):
+        """Test reads go through the mode=ro pool"""
+        with Router(_database(tmp_path), readers=2) as router:
+            assert router.fetchall(SELECT("name").FROM("users").ORDER_BY(("id", "ASC"))) == [("ann",), ("bob",)]
+            with router.reader() as reader:
+                with pytest.raises(sqlite3.OperationalError):
+                    reader.execute("DELETE FROM users")
+
+    def test_writes_are_committed_and_visible(self, tmp_path):
+        """Test writes are committed before their result is returned"""
+        path = _database(tmp_path)
+        with Router(path) as router:
+            result = router.execute(INSERT("name", "team_id").INTO("users").VALUES("cyd", 1))
+            assert isinstance(result, WriteResult)
+            assert (result.rowcount, result.lastrowid) == (1, 3)
+            assert router.scalar(COUNT("users")) == 3
+        other = sqlite3.connect(path)
+        assert other.execute("SELECT COUNT(*) FROM users").fetchone() == (3,)
+
+    def test_returning_rows(self, tmp_path):
+        """Test RETURNING rows come back on the write result"""
+        with Router(_database(tmp_path)) as router:
+            rows = router.fetchall(DELETE().FROM("users").WHERE(col("id") == 1).RETURNING("name"))
+            assert rows == [("ann",)]
+
+    def test_concurrent_submits_are_grouped(self, tmp_path):
+        """Test submits from many threads all commit, in fewer or equal commits"""
+        with Router(_database(tmp_path)) as router:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                futures = list(pool.map(
+                    lambda i: router.submit(INSERT("name").INTO("users").VALUES(f"user{i}")), range(50)
+                ))
+            results = [future.result() for future in futures]
+            assert sorted(result.lastrowid for result in results) == list(range(3, 53))
+            assert router.writer.statements == 50
+            assert 1 <= router.writer.commits <= 50
+            assert router.scalar(COUNT("users")) == 52
+
+    def test_failing_statement_only_fails_its_future(self, tmp_path):
+        """Test a constraint error rolls back only its own statement"""
+        with Router(_database(tmp_path)) as router:
+            router.writer.pause()
+            bad = router.submit(INSERT("name").INTO("users").VALUES("ann"))
+            good = router.submit(INSERT("name").INTO("users").VALUES("dee"))
+            router.writer.resume()
+            with pytest.raises(sqlite3.IntegrityError):
+                bad.result()
+            assert good.result().rowcount == 1
+            assert router.writer.commits == 1
+            assert router.scalar(COUNT("users")) == 3
+
+    def test_writes_invalidate_cache(self, tmp_path):
+        """Test the cache is invalidated before the write result is returned"""
+        with Router(_database(tmp_path), cache=ResultCache()) as router:
+            query = COUNT("users")
+            assert router.scalar(query) == 2
+            router.execute(UPDATE("users").SET(name="zed").WHERE(col("id") == 1))
+            router.execute(DELETE().FROM("users").WHERE(col("id") == 2))
+            assert router.scalar(query) == 1
+            assert router.cache.misses == 2
+
+    def test_failing_on_commit_only_fails_its_future(self, tmp_path):
+        """Test an on_commit error is passed to its future and the writer keeps running"""
+        conn = sqlite3.connect(_database(tmp_path), isolation_level=None, check_same_thread=False)
+        writer = Writer(conn)
+
+        def broken():
+            raise RuntimeError("callback failed")
+
+        writer.pause()
+        bad = writer.submit("INSERT INTO users (name) VALUES (?)", ["dee"], on_commit=broken)
+        good = writer.submit("INSERT INTO users (name) VALUES (?)", ["eve"])
+        writer.resume()
+        with pytest.raises(RuntimeError):
+            bad.result()
+        assert good.result().rowcount == 1
+        assert writer.submit("DELETE FROM users WHERE id = ?", [1]).result().rowcount == 1
+        writer.close()
+        assert conn.execute("SELECT name FROM users ORDER BY id").fetchall() == [("bob",), ("dee",), ("eve",)]
+
+    def test_routing_validation(self, tmp_path):
+        """Test invalid arguments and closed writers"""
+        path = _database(tmp_path)
+        with pytest.raises(ValueError):
+            Router(path, readers=0)
+        router = Router(path)
+        with pytest.raises(TypeError):
+            router.submit(SELECT("name").FROM("users"))
+        router.close()
+        with pytest.raises(RuntimeError):
+            router.writer.submit("DELETE FROM users", [])
+
+
+@pytest.mark.engine
+class TestWriterCoalescing:
+    """Test merging of single-row inserts by the writer"""
+
+    def test_single_row_inserts_are_merged(self, tmp_path):
+        """Test consecutive inserts become one statement, each caller keeping its own lastrowid"""
+        with Router(_database(tmp_path)) as router:
+            router.writer.pause()
+            futures = [router.submit(INSERT("name", "team_id").INTO("users").VALUES(f"u{i}", i)) for i in range(5)]
+            router.writer.resume()
+            results = [future.result() for future in futures]
+            assert [(result.rowcount, result.lastrowid) for result in results] == [(1, i) for i in range(3, 8)]
+            assert router.writer.merged == 4
+            rows = router.fetchall(SELECT("id", "name").FROM("users").WHERE(col("id") >= 3).ORDER_BY(("id", "ASC")))
+            assert rows == [(i + 3, f"u{i}") for i in range(5)]
+
+    def test_order_is_preserved_across_other_writes(self, tmp_path):
+        """Test only consecutive inserts with the same columns are merged"""
+        with Router(_database(tmp_path)) as router:
+            writer = router.writer
+            writer.pause()
+            futures = [
+                router.submit(INSERT("name").INTO("users").VALUES("a")),
+                router.submit(INSERT("name").INTO("users").VALUES("b")),
+                router.submit(DELETE().FROM("users").WHERE(col("name") == "b")),
+                router.submit(INSERT("name").INTO("users").VALUES("b")),
+                router.submit(INSERT("name", "team_id").INTO("users").VALUES("c", 1)),
+            ]
+            writer.resume()
+            assert [future.result().rowcount for future in futures] == [1, 1, 1, 1, 1]
+            assert writer.merged == 1
+            assert (writer.commits, writer.statements) == (1, 5)
+            assert router.scalar(COUNT("users")) == 5
+
+    def test_unmergeable_inserts(self, tmp_path):
+        """Test explicit keys, OR actions and RETURNING are executed one by one"""
+        with Router(_database(tmp_path)) as router:
+            router.writer.pause()
+            futures = [
+                router.submit(INSERT("id", "name").INTO("users").VALUES(10, "x")),
+                router.submit(INSERT("id", "name").INTO("users").VALUES(20, "y")),
+                router.submit(INSERT("name").INTO("users").VALUES("ann").OR_IGNORE()),
+                router.submit(INSERT("name").INTO("users").VALUES("z").RETURNING("id")),
+            ]
+            router.writer.resume()
+            results = [future.result() for future in futures]
+            assert [result.lastrowid for result in results[:2]] == [10, 20]
+            assert results[2].rowcount == 0
+            assert results[3].rows == [(21,)]
+            assert router.writer.merged == 0
+
+    def test_failed_merge_falls_back_to_single_rows(self, tmp_path):
+        """Test a constraint error inside a merged insert only fails its own caller"""
+        with Router(_database(tmp_path)) as router:
+            router.writer.pause()
+            futures = [router.submit(INSERT("name").INTO("users").VALUES(name)) for name in ("dee", "ann", "eve")]
+            router.writer.resume()
+            assert futures[0].result().lastrowid == 3
+            with pytest.raises(sqlite3.IntegrityError):
+                futures[1].result()
+            assert futures[2].result().lastrowid == 4
+            assert router.writer.merged == 0
+            assert router.scalar(COUNT("users")) == 4
+
+    def test_schema_changes_reset_rowid_lookups(self, tmp_path):
+        """Test a table recreated WITHOUT ROWID is no longer merged, through the writer or after a reset"""
+        conn = sqlite3.connect(str(tmp_path / "items.db"), isolation_level=None, check_same_thread=False)
+        writer = Writer(conn)
+
+        def insert_batch(*names):
+            writer.pause()
+            futures = [writer.submit_query(INSERT("name").INTO("items").VALUES(name)) for name in names]
+            writer.resume()
+            return [future.result() for future in futures]
+
+        writer.submit("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)", []).result()
+        insert_batch("a", "b")
+        assert writer.merged == 1
+        writer.submit("DROP TABLE items", []).result()
+        writer.submit("CREATE TABLE items (name TEXT PRIMARY KEY) WITHOUT ROWID", []).result()
+        insert_batch("c", "d")
+        assert writer.merged == 1
+        other = sqlite3.connect(str(tmp_path / "items.db"), isolation_level=None)
+        other.execute("DROP TABLE items")
+        other.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        other.close()
+        writer.reset_schema_cache()
+        assert [result.lastrowid for result in insert_batch("e", "f")] == [1, 2]
+        assert writer.merged == 2
+        writer.close()
+
+    def test_max_params_and_delay(self, tmp_path):
+        """Test merged statements stay under max_params and late writes join the batch"""
+        conn = sqlite3.connect(_database(tmp_path), isolation_level=None, check_same_thread=False)
+        writer = Writer(conn, max_params=4, max_delay=0.2)
+        futures = [writer.submit_query(INSERT("name", "team_id").INTO("users").VALUES(f"u{i}", i)) for i in range(5)]
+        assert [future.result().lastrowid for future in futures] == list(range(3, 8))
+        assert writer.commits == 1
+        assert writer.merged == 2  # groups of 2, 2 and 1 rows
+        writer.close()
+        with pytest.raises(ValueError):
+            Writer(conn, max_delay=-1)
+        writer = Writer(conn)
+        with pytest.raises(TypeError):
+            writer.submit_query(SELECT("name").FROM("users"))
+        writer.close()
+
+
+@pytest.mark.engine
+class TestTransactions:
+    """Test engine transactions and savepoints"""
+
+    def test_commit_and_stats(self):
+        """Test a block commits once and reports its statements and time"""
+        reports = []
+        engine = Engine(_connection(), on_transaction=reports.append)
+        with engine.transaction("IMMEDIATE") as tx:
+            engine.execute(INSERT("name").INTO("users").VALUES("cyd"))
+            engine.execute(INSERT("name").INTO("users").VALUES("dee"))
+            assert engine.scalar(COUNT("users")) == 4
+            assert engine.connection.in_transaction
+        assert not engine.connection.in_transaction
+        assert (tx.committed, tx.statements, tx.depth, tx.mode) == (True, 3, 0, "IMMEDIATE")
+        assert tx.elapsed_seconds > 0
+        assert reports == [tx] and engine.last_transaction is tx
+
+    def test_rollback_on_error(self):
+        """Test an exception rolls back the whole block and is re-raised"""
+        engine = Engine(_connection())
+        with pytest.raises(RuntimeError):
+            with engine.transaction():
+                engine.execute(DELETE().FROM("users"))
+                raise RuntimeError("boom")
+        assert engine.scalar(COUNT("users")) == 2
+        assert engine.last_transaction.committed is False
+        assert engine.current_transaction is None
+
+    def test_nested_savepoints(self):
+        """Test an inner block rolls back alone and counts toward the outer one"""
+        engine = Engine(_connection())
+        with engine.transaction() as outer:
+            engine.execute(INSERT("name").INTO("users").VALUES("cyd"))
+            with pytest.raises(ValueError):
+                with engine.transaction() as inner:
+                    assert inner.depth == 1
+                    engine.execute(DELETE().FROM("users"))
+                    raise ValueError
+            with engine.transaction():
+                engine.execute(UPDATE("users").SET(name="ANN").WHERE(col("id") == 1))
+        assert (outer.committed, inner.committed, outer.statements) == (True, False, 3)
+        assert engine.fetchall(SELECT("name").FROM("users").ORDER_BY(("id", "ASC"))) == [("ANN",), ("bob",), ("cyd",)]
+
+    def test_rollback_drops_cached_reads(self):
+        """Test reads cached inside a rolled-back block are not served afterwards"""
+        engine = Engine(_connection(), cache=ResultCache())
+        query = COUNT("users")
+        with pytest.raises(RuntimeError):
+            with engine.transaction():
+                engine.execute(DELETE().FROM("users"))
+                assert engine.scalar(query) == 0
+                raise RuntimeError
+        assert engine.scalar(query) == 2
+
+    def test_joins_outer_transaction(self):
+        """Test a transaction already open on the connection is joined through a savepoint"""
+        conn = _connection()
+        conn.execute("DELETE FROM logs")  # opens an implicit transaction
+        engine = Engine(conn)
+        with engine.transaction() as tx:
+            engine.execute(INSERT("name").INTO("users").VALUES("cyd"))
+        assert tx.depth == 1 and conn.in_transaction
+        conn.rollback()
+        assert engine.scalar(COUNT("users")) == 2
+
+    def test_busy_retry(self, tmp_path):
+        """Test BEGIN is retried with backoff while another connection holds the write lock"""
+        path = _database(tmp_path)
+        blocker = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        blocker.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(0.1, lambda: blocker.execute("COMMIT"))
+        release.start()
+        engine = Engine(sqlite3.connect(path, timeout=0))
+        with engine.transaction("IMMEDIATE", retries=10, backoff=0.02) as tx:
+            engine.execute(INSERT("name").INTO("users").VALUES("cyd"))
+        release.join()
+        assert tx.committed and tx.retries >= 1
+        assert tx.wait_seconds > 0
+
+    def test_busy_gives_up(self, tmp_path):
+        """Test the busy error is raised once the retries run out"""
+        path = _database(tmp_path)
+        blocker = sqlite3.connect(path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        engine = Engine(sqlite3.connect(path, timeout=0))
+        with pytest.raises(sqlite3.OperationalError):
+            with engine.transaction("IMMEDIATE", retries=2, backoff=0.001):
+                pass
+        blocker.execute("ROLLBACK")
+
+    def test_validation(self, tmp_path):
+        """Test invalid modes and router transactions"""
+        engine = Engine(_connection())
+        with pytest.raises(ValueError):
+            with engine.transaction("LAZY"):
+                pass
+        with Router(_database(tmp_path)) as router:
+            with pytest.raises(TypeError):
+                router.transaction()
+
+
+def _shards(tmp_path, count=3, **kwargs):
+    paths = [str(tmp_path / f"shard_{index}.db") for index in range(count)]
+    shards = ShardedWriter(paths, key="user_id", **kwargs)
+    shards.execute_all("CREATE TABLE events (user_id INTEGER, kind TEXT, UNIQUE (user_id, kind))")
+    return shards
+
+
+def _shard_rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT user_id, kind FROM events ORDER BY user_id, kind").fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.mark.engine
+class TestShardedWriter:
+    """Test inserts routed to several SQLite files by a key column"""
+
+    def test_hash_routing(self, tmp_path):
+        """Test every row lands in the shard of its key and counts are merged per shard"""
+        rows = [(user_id, kind) for user_id in range(30) for kind in ("a", "b")]
+        with _shards(tmp_path, batch_size=7) as shards:
+            load = shards.insert(INSERT("user_id", "kind").INTO("events").VALUES(*rows))
+            assert load.total == 60
+            assert shards.rows == list(load.rows)
+            assert load.rows_per_second > 0
+        for index, path in enumerate(shards.paths):
+            stored = _shard_rows(path)
+            assert len(stored) == load.rows[index]
+            assert all(user_id % 3 == index for user_id, _ in stored)
+        assert sorted(row for path in shards.paths for row in _shard_rows(path)) == rows
+
+    def test_range_routing_and_conflicts(self, tmp_path):
+        """Test range bounds pick the shard and OR actions apply on every shard"""
+        with _shards(tmp_path, bounds=[10, 20]) as shards:
+            assert [shards.shard_for(key) for key in (-5, 9, 10, 19, 20, 99)] == [0, 0, 1, 1, 2, 2]
+            shards.insert(INSERT.from_frame({"user_id": [1, 15, 25], "kind": ["a", "a", "a"]}, "events"))
+            load = shards.insert(
+                INSERT.from_frame({"user_id": [1, 2, 15], "kind": ["a", "a", "a"]}, "events", or_action="IGNORE")
+            )
+            assert load.rows == (1, 0, 0)
+        assert [len(_shard_rows(path)) for path in shards.paths] == [2, 1, 1]
+
+    def test_string_keys_are_stable(self, tmp_path):
+        """Test string keys are routed by a process-independent hash"""
+        with _shards(tmp_path, count=2) as shards:
+            assert shards.shard_for("alice") == 663665735 % 2  # zlib.crc32(b"alice")
+            assert shards.shard_for(b"x") == shards.shard_for(b"x")
+            with pytest.raises(ValueError):
+                shards.shard_for(None)
+
+    def test_queued_batches_are_bounded(self, tmp_path):
+        """Test routing waits once max_pending batches are queued"""
+        rows = [(user_id, "a") for user_id in range(40)]
+        with _shards(tmp_path, count=2, batch_size=2, max_pending=3) as shards:
+            queued = []
+            for writer in shards.writers:
+                writer.pause()
+                submit_many = writer.submit_many
+                writer.submit_many = lambda *args, submit_many=submit_many: queued.append(1) or submit_many(*args)
+            query = INSERT("user_id", "kind").INTO("events").VALUES(*rows)
+            routing = threading.Thread(target=shards.submit, args=(query,))
+            routing.start()
+            routing.join(0.2)
+            assert routing.is_alive()
+            assert len(queued) == 4  # the oldest batch it waits on, plus max_pending
+            for writer in shards.writers:
+                writer.resume()
+            routing.join()
+            load = shards.insert(INSERT("user_id", "kind").INTO("events").VALUES(*rows).OR_IGNORE())
+            assert load.total == 0
+        assert sum(len(_shard_rows(path)) for path in shards.paths) == 40
+
+    def test_numeric_keys_route_alike(self, tmp_path):
+        """Test 42, "42" and 42.0 go to the same shard for hash and numeric range routing"""
+        with _shards(tmp_path, count=5) as shards:
+            assert len({shards.shard_for(key) for key in (42, "42", " 42", 42.0, "42.0")}) == 1
+            assert shards.shard_for("4.5") == shards.shard_for(4.5)
+            assert shards.shard_for("nan") == 1810114945 % 5  # zlib.crc32(b"nan"): not a finite number, routed as text
+        (tmp_path / "range").mkdir()
+        with _shards(tmp_path / "range", count=3, bounds=[10, 20]) as shards:
+            assert [shards.shard_for(key) for key in ("9", "15", 15.0, "20")] == [0, 1, 1, 2]
+
+    def test_failed_batch_is_reported(self, tmp_path):
+        """Test a failing batch raises once the other batches are done"""
+        with _shards(tmp_path, count=2) as shards:
+            with pytest.raises(sqlite3.IntegrityError):
+                shards.insert(INSERT("user_id", "kind").INTO("events").VALUES((0, "a"), (0, "a"), (1, "a")))
+            assert [len(_shard_rows(path)) for path in shards.paths] == [0, 1]
+
+    def test_validation(self, tmp_path):
+        """Test bad shard layouts and inserts are rejected"""
+        with pytest.raises(ValueError):
+            ShardedWriter([], key="user_id")
+        with pytest.raises(ValueError):
+            ShardedWriter([str(tmp_path / "a.db"), str(tmp_path / "b.db")], key="user_id", bounds=[1, 2])
+        with pytest.raises(ValueError):
+            ShardedWriter([str(tmp_path / "a.db")], key="user_id", max_pending=0)
+        with _shards(tmp_path, count=2) as shards:
+            with pytest.raises(ValueError):
+                shards.insert(INSERT("kind").INTO("events").VALUES("a"))
+            with pytest.raises(ValueError):
+                shards.insert(INSERT("user_id").INTO("events").VALUES(1).RETURNING("user_id"))
+            with pytest.raises(TypeError):
+                shards.insert(SELECT("user_id").FROM("events"))
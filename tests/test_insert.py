@@ -1,6 +1,10 @@
 """Tests for INSERT queries"""
+import datetime
+import gzip
+import json
+import sqlite3
 import pytest
-from recordsql import INSERT, col
+from recordsql import INSERT, Engine, OnConflictQuery, excluded, col
 
 
 @pytest.mark.insert
@@ -146,3 +150,291 @@ class TestInsertAdvanced:
         assert len(col_value) == 2
         assert col_value[0] == {"name": "Alice", "age": 28}
         assert col_value[1] == {"name": "Bob", "age": 32}
+
+
+@pytest.mark.insert
+class TestInsertUpsert:
+    """Test the UPSERT fast path and chunked bulk inserts"""
+
+    def _connection(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, age INTEGER)")
+        return conn
+
+    def test_upsert_all_non_key(self):
+        """Test UPSERT updates every non-key column from excluded"""
+        query = INSERT("id", "name", "age").INTO("users").VALUES(1, "John", 25).UPSERT(keys=["id"])
+        sql, params = query.placeholder_pair()
+        assert sql.endswith("ON CONFLICT (id) DO UPDATE SET name = excluded.name, age = excluded.age")
+        assert params == [1, "John", 25]
+
+    def test_upsert_explicit_columns_and_where(self):
+        """Test UPSERT with an explicit update list and a WHERE condition"""
+        query = INSERT("id", "name", "age").INTO("users").VALUES(1, "John", 25)
+        query.UPSERT(keys="id", update=["age"], where=col("age") < 99)
+        sql, params = query.placeholder_pair()
+        assert "ON CONFLICT (id) DO UPDATE SET age = excluded.age WHERE age < ?" in sql
+        assert params == [1, "John", 25, 99]
+
+    def test_upsert_no_update_columns_is_do_nothing(self):
+        """Test UPSERT with nothing to update renders DO NOTHING on the key"""
+        sql, _ = INSERT("id").INTO("users").VALUES(1).UPSERT(keys=["id"]).placeholder_pair()
+        assert sql.endswith("ON CONFLICT (id) DO NOTHING")
+
+    def test_upsert_requires_columns(self):
+        """Test UPSERT with all_non_key needs the inserted columns"""
+        with pytest.raises(ValueError):
+            INSERT().INTO("users").UPSERT(keys=["id"])
+
+    def test_on_conflict_render_is_cached(self):
+        """Test the ON CONFLICT clause is rendered once and invalidated on change"""
+        on_conflict = OnConflictQuery("UPDATE", ["id"], {"name": excluded("name")})
+        first = on_conflict.placeholder_pair()
+        assert first == ("ON CONFLICT (id) DO UPDATE SET name = excluded.name", [])
+        first[1].append("mutated")
+        assert on_conflict.placeholder_pair()[1] == []
+        on_conflict.SET({"age": 1})
+        assert on_conflict.placeholder_pair() == ("ON CONFLICT (id) DO UPDATE SET age = ?", [1])
+
+    def test_upsert_executes(self):
+        """Test UPSERT against SQLite inserts then updates"""
+        conn = self._connection()
+        for row in [(1, "John", 25), (1, "Johnny", 26)]:
+            conn.execute(*INSERT("id", "name", "age").INTO("users").VALUES(*row).UPSERT(keys=["id"]).placeholder_pair())
+        assert conn.execute("SELECT id, name, age FROM users").fetchall() == [(1, "Johnny", 26)]
+
+    def test_placeholder_chunks_split_by_max_params(self):
+        """Test chunked inserts stay under max_params and keep the conflict clause"""
+        query = INSERT("id", "name", "age").INTO("users").UPSERT(keys=["id"])
+        rows = ((i, f"user{i}", i) for i in range(10))
+        chunks = list(query.placeholder_chunks(rows=rows, max_params=9))
+        assert len(chunks) == 4
+        for sql, params in chunks:
+            assert len(params) <= 9
+            assert sql.endswith("DO UPDATE SET name = excluded.name, age = excluded.age")
+        assert chunks[0][0].count("(?, ?, ?)") == 3
+        assert chunks[-1][1] == [9, "user9", 9]
+
+    def test_placeholder_chunks_execute(self):
+        """Test chunked upserts against SQLite"""
+        conn = self._connection()
+        query = INSERT("id", "name", "age").INTO("users").UPSERT(keys=["id"])
+        for rows in ([(i, "old", i) for i in range(50)], [(i, "new", i) for i in range(25, 75)]):
+            for sql, params in query.placeholder_chunks(rows=rows, max_params=30):
+                conn.execute(sql, params)
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone() == (75,)
+        assert conn.execute("SELECT COUNT(*) FROM users WHERE name = 'new'").fetchone() == (50,)
+
+    def test_placeholder_chunks_defaults_to_values(self):
+        """Test chunks fall back to the rows given to VALUES"""
+        query = INSERT("name", "age").INTO("users").VALUES(("Alice", 28), ("Bob", 32))
+        chunks = list(query.placeholder_chunks(max_params=2))
+        assert [params for _, params in chunks] == [["Alice", 28], ["Bob", 32]]
+        assert chunks[0][0] == 'INSERT INTO "users" (name, age) VALUES (?, ?)'
+
+    def test_placeholder_chunks_clause_spacing(self):
+        """Test ON CONFLICT and RETURNING are joined by single spaces, with no trailing space"""
+        query = INSERT("id", "name").INTO("users").OR_IGNORE().RETURNING("id")
+        sql, _ = next(query.placeholder_chunks(rows=[(1, "Ann")]))
+        assert sql == 'INSERT OR IGNORE INTO "users" (id, name) VALUES (?, ?) RETURNING id'
+
+    def test_placeholder_chunks_row_width_mismatch(self):
+        """Test chunked inserts reject rows of the wrong width"""
+        query = INSERT("name", "age").INTO("users")
+        with pytest.raises(ValueError):
+            list(query.placeholder_chunks(rows=[("Alice",)]))
+
+
+def _measurements():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE m (sensor TEXT, ts TEXT, value REAL, PRIMARY KEY (sensor, ts))")
+    return conn
+
+
+@pytest.mark.insert
+class TestInsertFromFrame:
+    """Test bulk inserts from columnar frames"""
+
+    def test_column_mapping(self):
+        """Test a mapping of columns is inserted with executemany, NaN as NULL and dates as ISO text"""
+        conn = _measurements()
+        frame = {
+            "sensor": ["a", "b", "c"],
+            "ts": [datetime.date(2024, 1, 1), datetime.datetime(2024, 1, 2, 3, 4), "2024-01-03"],
+            "value": [1.5, float("nan"), 3],
+        }
+        query = INSERT.from_frame(frame, "m")
+        assert query.columns == ["sensor", "ts", "value"]
+        assert len(query.row_source) == 3
+        assert query.executemany(conn) == 3
+        assert conn.execute("SELECT * FROM m ORDER BY sensor").fetchall() == [
+            ("a", "2024-01-01", 1.5), ("b", "2024-01-02T03:04:00", None), ("c", "2024-01-03", 3.0)
+        ]
+
+    def test_row_source_is_reusable(self):
+        """Test the row view can be iterated more than once and feeds placeholder_chunks"""
+        query = INSERT.from_frame({"sensor": ["a", "b", "c"], "value": [1, 2, 3]}, "m", columns=["value", "sensor"])
+        assert list(query.row_source) == list(query.row_source) == [(1, "a"), (2, "b"), (3, "c")]
+        chunks = list(query.placeholder_chunks(max_params=4))
+        assert [params for _, params in chunks] == [[1, "a", 2, "b"], [3, "c"]]
+
+    def test_placeholder_pair_renders_the_row_source(self):
+        """Test small row sources render as one statement and run through Engine.execute"""
+        query = INSERT.from_frame({"sensor": ["a", "b"], "ts": ["t", "t"], "value": [1.0, 2.0]}, "m")
+        sql, params = query.placeholder_pair()
+        assert sql.startswith('INSERT INTO "m" (sensor, ts, value) VALUES')
+        assert params == ["a", "t", 1.0, "b", "t", 2.0]
+        conn = _measurements()
+        assert Engine(conn).execute(query).rowcount == 2
+        assert conn.execute("SELECT COUNT(*) FROM m").fetchone() == (2,)
+        with pytest.raises(ValueError, match="executemany"):
+            INSERT.from_frame({"sensor": ["a"] * 1000}, "m").placeholder_pair()
+        with pytest.raises(ValueError, match="empty"):
+            INSERT.from_frame({"sensor": []}, "m").placeholder_pair()
+
+    def test_upsert_and_or_action(self):
+        """Test upserts and OR actions are rendered in the executemany statement"""
+        conn = _measurements()
+        INSERT.from_frame({"sensor": ["a"], "ts": ["t"], "value": [1.0]}, "m").executemany(conn)
+        frame = {"sensor": ["a", "b"], "ts": ["t", "t"], "value": [9.0, 2.0]}
+        INSERT.from_frame(frame, "m").UPSERT(keys=["sensor", "ts"]).executemany(conn)
+        assert conn.execute("SELECT sensor, value FROM m ORDER BY sensor").fetchall() == [("a", 9.0), ("b", 2.0)]
+        assert INSERT.from_frame(frame, "m", or_action="IGNORE").executemany(conn, commit=False) == 0
+
+    def test_validation(self):
+        """Test invalid frames and executemany misuse"""
+        with pytest.raises(TypeError):
+            INSERT.from_frame([("a", 1)], "m")
+        with pytest.raises(ValueError):
+            INSERT.from_frame({"a": [1, 2], "b": [1]}, "m")
+        with pytest.raises(ValueError):
+            INSERT.from_frame({"a": [1]}, "m", columns=["b"])
+        with pytest.raises(ValueError):
+            INSERT.from_frame({"bad name": [1]}, "m")
+        query = INSERT.from_frame({"sensor": ["a"]}, "m").RETURNING("sensor")
+        with pytest.raises(ValueError):
+            query.executemany(_measurements())
+        query = INSERT.from_frame({"sensor": ["a"]}, "m").ON_CONFLICT(
+            "UPDATE", ["sensor"], set={"value": 1}
+        )
+        with pytest.raises(ValueError):
+            query.executemany(_measurements())
+
+    def test_numpy_structured_array(self):
+        """Test a structured array with NaN and datetime64 columns"""
+        numpy = pytest.importorskip("numpy")
+        array = numpy.array(
+            [("a", "2024-01-01T00:00", 1.5), ("b", "NaT", numpy.nan)],
+            dtype=[("sensor", "U8"), ("ts", "datetime64[m]"), ("value", "f8")],
+        )
+        conn = _measurements()
+        INSERT.from_frame(array, "m").executemany(conn)
+        assert conn.execute("SELECT * FROM m ORDER BY sensor").fetchall() == [
+            ("a", "2024-01-01T00:00", 1.5), ("b", None, None)
+        ]
+
+    def test_pandas_dataframe(self):
+        """Test a DataFrame with nullable and datetime columns"""
+        pandas = pytest.importorskip("pandas")
+        frame = pandas.DataFrame({
+            "sensor": ["a", "b"],
+            "ts": pandas.to_datetime(["2024-01-01", None]),
+            "value": pandas.array([1, None], dtype="Int64"),
+        })
+        conn = _measurements()
+        INSERT.from_frame(frame, "m").executemany(conn)
+        rows = conn.execute("SELECT * FROM m ORDER BY sensor").fetchall()
+        assert rows[0][0] == "a" and rows[0][1].startswith("2024-01-01") and rows[0][2] == 1
+        assert rows[1] == ("b", None, None)
+
+
+@pytest.mark.insert
+class TestInsertFromFile:
+    """Test streaming bulk inserts from CSV and JSON Lines files"""
+
+    def test_csv(self, tmp_path):
+        """Test a CSV file is loaded with its header, empty fields as NULL and chunked parsing"""
+        path = tmp_path / "m.csv"
+        path.write_text("sensor,ts,value\na,t1,1.5\nb,t1,\nc,t2,3\n")
+        query = INSERT.from_file(path, "m", chunk_rows=2)
+        assert query.columns == ["sensor", "ts", "value"]
+        assert list(query.row_source.chunks()) == [[("a", "t1", "1.5"), ("b", "t1", None)], [("c", "t2", "3")]]
+        conn = _measurements()
+        assert query.executemany(conn) == 3
+        assert conn.execute("SELECT * FROM m ORDER BY sensor").fetchall() == [
+            ("a", "t1", 1.5), ("b", "t1", None), ("c", "t2", 3.0)
+        ]
+
+    def test_column_mapping_and_types(self, tmp_path):
+        """Test a mapping renames and reorders file columns and converters run per column"""
+        path = tmp_path / "m.csv"
+        path.write_text("Value,Sensor,Extra,Time\n1,a,x,t1\n2,b,y,t2\n")
+        query = INSERT.from_file(
+            path, "m", columns={"Sensor": "sensor", "Time": "ts", "Value": "value"}, types={"value": float}
+        )
+        assert query.columns == ["sensor", "ts", "value"]
+        assert list(query.row_source) == [("a", "t1", 1.0), ("b", "t2", 2.0)]
+        headerless = tmp_path / "m.txt"
+        headerless.write_text("a,t1,1\n")
+        query = INSERT.from_file(headerless, "m", columns=["sensor", "ts", "value"], format="csv", header=False)
+        assert list(query.row_source) == [("a", "t1", "1")]
+
+    def test_jsonl_gzip_upsert(self, tmp_path):
+        """Test a gzip-compressed JSON Lines file upserted through an OnConflictQuery"""
+        path = tmp_path / "m.jsonl.gz"
+        records = [{"sensor": "a", "ts": "t1", "value": 1.0}, {"sensor": "a", "ts": "t1", "value": 2.0},
+                   {"sensor": "b", "ts": "t1"}]
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write("\n".join(json.dumps(record) for record in records) + "\n\n")
+        upsert = OnConflictQuery.upsert(["sensor", "ts"], ["value"])
+        conn = _measurements()
+        INSERT.from_file(path, "m", on_conflict=upsert).executemany(conn)
+        assert conn.execute("SELECT * FROM m ORDER BY sensor").fetchall() == [("a", "t1", 2.0), ("b", "t1", None)]
+
+    def test_failing_row_rolls_back_the_file(self, tmp_path):
+        """Test a UNIQUE violation on row 3 leaves no rows and no open transaction, in every connection mode"""
+        path = tmp_path / "m.csv"
+        path.write_text("sensor,ts,value\na,t1,1\nb,t1,2\na,t1,3\n")
+        for isolation_level in (None, "DEFERRED"):
+            conn = sqlite3.connect(":memory:", isolation_level=isolation_level)
+            conn.execute("CREATE TABLE m (sensor TEXT, ts TEXT, value REAL, PRIMARY KEY (sensor, ts))")
+            with pytest.raises(sqlite3.IntegrityError):
+                INSERT.from_file(path, "m").executemany(conn)
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM m").fetchone() == (0,)
+
+    def test_transaction_handling(self, tmp_path):
+        """Test commit=False leaves the rows uncommitted and an outer transaction keeps its own writes"""
+        path = tmp_path / "m.csv"
+        path.write_text("sensor,ts,value\na,t1,1\na,t1,2\n")
+        conn = sqlite3.connect(":memory:", isolation_level=None)
+        conn.execute("CREATE TABLE m (sensor TEXT, ts TEXT, value REAL, PRIMARY KEY (sensor, ts))")
+        assert INSERT.from_file(path, "m", or_action="IGNORE").executemany(conn, commit=False) == 1
+        assert conn.in_transaction
+        conn.rollback()
+        assert conn.execute("SELECT COUNT(*) FROM m").fetchone() == (0,)
+        conn.execute("BEGIN")
+        conn.execute("INSERT INTO m VALUES ('z', 't0', 0)")
+        with pytest.raises(sqlite3.IntegrityError):
+            INSERT.from_file(path, "m").executemany(conn, commit=False)
+        assert conn.in_transaction
+        conn.commit()
+        assert conn.execute("SELECT sensor FROM m").fetchall() == [("z",)]
+
+    def test_validation(self, tmp_path):
+        """Test unknown formats, missing columns and misused arguments are rejected"""
+        path = tmp_path / "m.csv"
+        path.write_text("sensor,ts\n")
+        with pytest.raises(ValueError):
+            INSERT.from_file(tmp_path / "m.parquet", "m")
+        with pytest.raises(ValueError):
+            INSERT.from_file(path, "m", columns=["value"])
+        with pytest.raises(ValueError):
+            INSERT.from_file(path, "m", types={"value": float})
+        with pytest.raises(ValueError):
+            INSERT.from_file(path, "m", columns=["sensor"], header=False, format="csv", chunk_rows=0)
+        with pytest.raises(TypeError):
+            INSERT.from_file(path, "m", on_conflict="DO NOTHING")
+        assert list(INSERT.from_file(path, "m").row_source) == []
+        with pytest.raises(ValueError, match="empty"):
+            INSERT.from_file(path, "m").placeholder_pair()
@@ -0,0 +1,212 @@
+"""Tests for build and execution instrumentation"""
+import json
+import sqlite3
+import pytest
+from recordsql import (
+    SELECT, INSERT, COUNT, WITH, col, Engine, ResultCache,
+    Instrumentation, QueryEvent, LatencyAggregator, CompositeInstrumentation, SlowQueryLog,
+    fingerprint, normalize_sql, get_instrumentation, set_instrumentation, instrumented,
+)
+from recordsql.instrumentation import _percentile
+
+
+class Recorder(Instrumentation):
+    def __init__(self):
+        self.calls = []
+
+    def on_build_start(self, query):
+        self.calls.append(("start", type(query).__name__))
+
+    def on_build_end(self, event):
+        self.calls.append(("build", event))
+
+    def on_execute(self, event):
+        self.calls.append(("execute", event))
+
+
+def _engine(cache=None):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO users (name) VALUES (?)", [("ann",), ("bob",)])
+    return Engine(conn, cache=cache)
+
+
+@pytest.mark.instrumentation
+class TestBuildHooks:
+    """Test the hooks around placeholder_pair"""
+
+    def test_disabled_by_default(self):
+        """Test no instrumentation is active unless installed"""
+        assert get_instrumentation() is None
+        assert SELECT("name").FROM("users").placeholder_pair()[0] == 'SELECT name FROM "users"'
+
+    def test_build_events(self):
+        """Test a build reports its query type, table, fingerprint and parameter count"""
+        recorder = Recorder()
+        with instrumented(recorder):
+            sql, params = SELECT("name").FROM("users").WHERE(col("id") > 3).placeholder_pair()
+        assert get_instrumentation() is None
+        assert recorder.calls[0] == ("start", "SelectQuery")
+        kind, event = recorder.calls[1]
+        assert kind == "build" and isinstance(event, QueryEvent)
+        assert (event.query_type, event.table, event.param_count, event.exec_ns) == ("SELECT", "users", 1, 0)
+        assert event.sql == sql and event.fingerprint == fingerprint(sql)
+        assert event.build_ns > 0
+
+    def test_nested_builds_report_once(self):
+        """Test subqueries and CTEs are part of the outer build"""
+        recorder = Recorder()
+        inner = SELECT("id").FROM("users").WHERE(col("name") == "ann")
+        with instrumented(recorder):
+            WITH(ann=inner).SELECT("*").FROM("ann").placeholder_pair()
+            COUNT("users").placeholder_pair()
+        builds = [event for kind, event in recorder.calls if kind == "build"]
+        assert [event.query_type for event in builds] == ["SELECT", "COUNT"]
+
+    def test_fingerprint_ignores_values_and_spacing(self):
+        """Test queries differing only in values share a fingerprint"""
+        first, _ = SELECT("name").FROM("users").WHERE(col("id") == 1).placeholder_pair()
+        second, _ = SELECT("name").FROM("users").WHERE(col("id") == 2).placeholder_pair()
+        assert fingerprint(first) == fingerprint(second) == fingerprint(first.replace(" ", "  "))
+        assert fingerprint(first) != fingerprint('SELECT id FROM "users"')
+
+    def test_set_instrumentation_validation(self):
+        """Test only Instrumentation instances can be installed"""
+        with pytest.raises(TypeError):
+            set_instrumentation(object())
+        previous = set_instrumentation(Instrumentation())
+        assert previous is None
+        assert isinstance(set_instrumentation(None), Instrumentation)
+
+
+@pytest.mark.instrumentation
+class TestExecuteHooks:
+    """Test the hooks around engine calls and the latency aggregator"""
+
+    def test_execute_events(self):
+        """Test engine reads and writes report build and execution times"""
+        recorder = Recorder()
+        engine = _engine(cache=ResultCache())
+        query = SELECT("name").FROM("users")
+        with instrumented(recorder):
+            engine.fetchall(query)
+            engine.fetchall(query)
+            engine.execute(INSERT("name").INTO("users").VALUES("cyd"))
+        events = [event for kind, event in recorder.calls if kind == "execute"]
+        assert [(event.query_type, event.cached) for event in events] == [
+            ("SELECT", False), ("SELECT", True), ("INSERT", False)
+        ]
+        assert all(event.exec_ns > 0 and event.build_ns > 0 for event in events)
+        assert events[2].param_count == 1
+
+    def test_aggregator_report(self):
+        """Test the aggregator groups events by shape with percentiles"""
+        aggregator = LatencyAggregator()
+        engine = _engine()
+        with instrumented(aggregator):
+            for user_id in range(10):
+                engine.fetchall(SELECT("name").FROM("users").WHERE(col("id") == user_id))
+            engine.scalar(COUNT("users"))
+        report = aggregator.report()
+        assert len(aggregator) == 2
+        select = next(row for row in report if row["query_type"] == "SELECT")
+        assert (select["table"], select["builds"], select["executions"]) == ("users", 10, 10)
+        assert 0 < select["exec_p50_ns"] <= select["exec_p99_ns"]
+        assert 0 < select["build_p50_ns"] <= select["build_p99_ns"]
+        aggregator.reset()
+        assert aggregator.report() == []
+
+    def test_aggregator_bounds(self):
+        """Test shapes beyond max_shapes are dropped and samples are bounded"""
+        aggregator = LatencyAggregator(samples=3, max_shapes=1)
+        with instrumented(aggregator):
+            for _ in range(5):
+                SELECT("name").FROM("users").placeholder_pair()
+            SELECT("id").FROM("users").placeholder_pair()
+        (row,) = aggregator.report()
+        assert row["builds"] == 5
+        assert aggregator.dropped == 1
+        with pytest.raises(ValueError):
+            LatencyAggregator(samples=0)
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        samples = list(range(1, 101))
+        assert (_percentile(samples, 0.5), _percentile(samples, 0.99)) == (50, 99)
+        assert _percentile([7], 0.99) == 7
+        assert _percentile([], 0.5) == 0
+
+
+def _event(sql, exec_ns, cached=False):
+    return QueryEvent(SELECT("*").FROM("users"), sql, [1, 2], build_ns=10, exec_ns=exec_ns, cached=cached)
+
+
+@pytest.mark.instrumentation
+class TestSlowQueryLog:
+    """Test SQL normalization and the slow-query log"""
+
+    def test_normalize_sql(self):
+        """Test literals are removed and IN / VALUES lists are collapsed"""
+        assert normalize_sql(
+            'SELECT  name FROM "t1" WHERE id IN (?, ?, ?) AND note = \'it\'\'s\' LIMIT 10 OFFSET 2.5'
+        ) == 'SELECT name FROM "t1" WHERE id IN (?+) AND note = ? LIMIT ? OFFSET ?'
+        assert normalize_sql('INSERT INTO "t" (a, b) VALUES (?, ?), (?, ?)') == 'INSERT INTO "t" (a, b) VALUES (?+)'
+        assert normalize_sql("SELECT x2, t.c1 FROM t WHERE a in (?)") == "SELECT x2, t.c1 FROM t WHERE a IN (?+)"
+
+    def test_in_lists_share_a_fingerprint(self):
+        """Test IN lists of different lengths are one query shape"""
+        short, _ = SELECT("name").FROM("users").WHERE(col("id").isin([1, 2])).placeholder_pair()
+        long, _ = SELECT("name").FROM("users").WHERE(col("id").isin([1, 2, 3, 4])).placeholder_pair()
+        assert short != long
+        assert fingerprint(short) == fingerprint(long)
+
+    def test_records_only_slow_executions(self):
+        """Test executions under the threshold and cache hits are ignored"""
+        log = SlowQueryLog(threshold_ms=1)
+        log.on_execute(_event("SELECT * FROM users WHERE id IN (?, ?)", 500_000))
+        log.on_execute(_event("SELECT * FROM users WHERE id IN (?, ?)", 5_000_000, cached=True))
+        assert len(log) == 0
+        log.on_execute(_event("SELECT * FROM users WHERE id IN (?, ?)", 2_000_000))
+        log.on_execute(_event("SELECT * FROM users WHERE id IN (?, ?, ?)", 6_000_000))
+        (entry,) = log.entries()
+        assert (entry["count"], entry["total_ms"], entry["worst_ms"], entry["mean_ms"]) == (2, 8.0, 6.0, 4.0)
+        assert entry["sql"] == "SELECT * FROM users WHERE id IN (?+)"
+        assert entry["worst_sample"]["sql"] == "SELECT * FROM users WHERE id IN (?, ?, ?)"
+        assert entry["worst_sample"]["param_count"] == 2
+
+    def test_bounded_by_total_time(self):
+        """Test a full log keeps the shapes with the most total time"""
+        log = SlowQueryLog(threshold_ms=0, max_entries=2)
+        log.on_execute(_event("SELECT a FROM t", 5))
+        log.on_execute(_event("SELECT b FROM t", 50))
+        log.on_execute(_event("SELECT c FROM t", 1))
+        log.on_execute(_event("SELECT d FROM t", 20))
+        assert [entry["sql"] for entry in log.entries()] == ["SELECT b FROM t", "SELECT d FROM t"]
+        assert log.dropped == 2
+        assert len(log.entries(limit=1)) == 1
+        log.clear()
+        assert len(log) == 0 and log.dropped == 0
+
+    def test_engine_and_json_export(self, tmp_path):
+        """Test engine executions are logged and exported as JSON"""
+        log = SlowQueryLog(threshold_ms=0)
+        aggregator = LatencyAggregator()
+        engine = _engine()
+        with instrumented(CompositeInstrumentation(log, aggregator)):
+            for user_id in (1, 2):
+                engine.fetchall(SELECT("name").FROM("users").WHERE(col("id") == user_id))
+        assert len(aggregator) == 1
+        path = tmp_path / "slow.json"
+        document = json.loads(log.to_json(str(path)))
+        assert document == json.loads(path.read_text())
+        (query,) = document["queries"]
+        assert (query["query_type"], query["table"], query["count"]) == ("SELECT", "users", 2)
+
+    def test_validation(self):
+        """Test invalid arguments"""
+        with pytest.raises(ValueError):
+            SlowQueryLog(threshold_ms=-1)
+        with pytest.raises(ValueError):
+            SlowQueryLog(max_entries=0)
+        with pytest.raises(TypeError):
+            CompositeInstrumentation(object())
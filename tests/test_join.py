@@ -1,4 +1,5 @@
 """Tests for JOIN operations"""
+import sqlite3
 import pytest
 from recordsql import SELECT, WITH, cols, col, num
 
@@ -169,3 +170,23 @@ class TestJoinAdvanced:
         assert "INNER JOIN" in sql
         assert "LEFT JOIN" in sql
         assert "RIGHT JOIN" in sql
+
+    def test_join_params_precede_where_params(self):
+        """Test that ON parameters are ordered before WHERE parameters"""
+        age = col("age")
+        query = SELECT().FROM("users").INNER_JOIN(table_name="prices", on=(num(7) == col("store_id"))).WHERE(age > 18)
+        sql, params = query.placeholder_pair()
+        assert sql.index("ON ?") < sql.index("WHERE")
+        assert params == [7, 18]
+
+    def test_join_params_bind_to_their_placeholders(self):
+        """Test that a query with ON and WHERE parameters returns the right rows when executed"""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER, age INTEGER)")
+        conn.execute("CREATE TABLE prices (store_id INTEGER, amount INTEGER)")
+        conn.executemany("INSERT INTO users VALUES (?, ?)", [(7, 30), (18, 10)])
+        conn.executemany("INSERT INTO prices VALUES (?, ?)", [(7, 1), (18, 2)])
+        query = SELECT("amount").FROM("users").INNER_JOIN(
+            table_name="prices", on=(num(7) == col("store_id"))
+        ).WHERE(col("age") > 18)
+        assert conn.execute(*query.placeholder_pair()).fetchall() == [(1,)]
@@ -0,0 +1,131 @@
+"""Tests for opt-in builder profiling"""
+import os
+import subprocess
+import sys
+import pytest
+from recordsql import profiling
+from recordsql.profiling import Profiler, profile_class, profile_namespace
+
+_SCRIPT = """
+from recordsql import SELECT, col
+from recordsql.profiling import PROFILER
+for user_id in range(3):
+    SELECT("name").FROM("users").WHERE(col("id") == user_id).placeholder_pair()
+calls = {row["name"]: row["calls"] for row in PROFILER.report()}
+print(
+    calls["SelectQuery.WHERE"],
+    calls["SelectQuery.placeholder_pair"],
+    calls["recordsql.raw_querybuilders.formatters._format_table_name"],
+)
+"""
+
+_NORMALIZE_SCRIPT = """
+from recordsql import INSERT
+from recordsql.profiling import PROFILER
+for user_id in range(3):
+    INSERT("id", "name").INTO("users").VALUES(user_id, "ann")
+calls = {row["name"]: row["calls"] for row in PROFILER.report()}
+normalize = "recordsql.query.utils.normalize_args"
+print(calls[normalize + "(InsertQuery.VALUES)"], normalize in calls)
+"""
+
+
+def _run(script, setting):
+    env = dict(os.environ)
+    env.pop(profiling.PROFILE_ENV_VAR, None)
+    if setting is not None:
+        env[profiling.PROFILE_ENV_VAR] = setting
+    return subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+
+
+@pytest.mark.profiling
+class TestProfiler:
+    """Test the profiler and its wrapping helpers"""
+
+    def test_record_and_report(self):
+        """Test calls and times are accumulated per name, most total time first"""
+        profiler = Profiler()
+        profiler.record("fast", 1_000)
+        profiler.record("slow", 5_000_000)
+        profiler.record("fast", 3_000)
+        assert profiler.report() == [
+            {"name": "slow", "calls": 1, "total_ms": 5.0, "mean_us": 5000.0},
+            {"name": "fast", "calls": 2, "total_ms": 0.004, "mean_us": 2.0},
+        ]
+        table = profiler.format_report()
+        assert table.splitlines()[0].split() == ["name", "calls", "total", "ms", "mean", "us"]
+        assert "slow" in table.splitlines()[2]
+        profiler.reset()
+        assert len(profiler) == 0
+
+    def test_profile_namespace_and_class(self):
+        """Test module functions and fluent methods are wrapped only when forced or enabled"""
+        profiler = Profiler()
+
+        def helper(value):
+            return value * 2
+
+        namespace = {"__name__": __name__, "helper": helper, "constant": 3}
+        assert profile_namespace(namespace, profiler) == (1 if profiling.ENABLED else 0)
+        assert profile_namespace(namespace, profiler, force=True) >= 1
+        assert namespace["helper"](2) == 4 and namespace["constant"] == 3
+
+        class Query:
+            def WHERE(self):
+                return self
+
+            def placeholder_pair(self):
+                return "", []
+
+            def copy(self):
+                return self
+
+        assert profile_class(Query, profiler, force=True) == 2
+        query = Query()
+        query.WHERE().placeholder_pair()
+        query.copy()
+        assert {row["name"] for row in profiler.report()} == {
+            f"{__name__}.helper", "Query.WHERE", "Query.placeholder_pair"
+        }
+
+    def test_errors_are_still_recorded(self):
+        """Test a raising call is counted and the error propagates"""
+        profiler = Profiler()
+        failing = profiler.wrap(lambda: 1 / 0, "failing")
+        with pytest.raises(ZeroDivisionError):
+            failing()
+        assert profiler.report()[0]["calls"] == 1
+
+
+@pytest.mark.profiling
+class TestProfilingEnvironment:
+    """Test profiling toggled by the environment variable"""
+
+    def test_enabled_profiles_builders_and_formatters(self):
+        """Test builder methods and formatters are counted and a table is printed at exit"""
+        result = _run(_SCRIPT, "1")
+        assert result.stdout.split() == ["3", "3", "3"]
+        assert "recordsql profile" in result.stderr
+        assert "SelectQuery.FROM" in result.stderr
+
+    def test_report_file(self, tmp_path):
+        """Test a path in the variable receives the report"""
+        path = tmp_path / "profile.txt"
+        _run(_SCRIPT, str(path))
+        assert "recordsql.raw_querybuilders.formatters._format_table_name" in path.read_text()
+
+    def test_normalize_args_times_each_call(self):
+        """Test argument normalization is recorded per decorated function, not per decoration"""
+        assert _run(_NORMALIZE_SCRIPT, "1").stdout.split() == ["3", "False"]
+
+    def test_disabled_wraps_nothing(self):
+        """Test nothing is profiled without the variable"""
+        script = (
+            "from recordsql import SELECT\n"
+            "from recordsql.profiling import PROFILER\n"
+            "SELECT('name').FROM('users').placeholder_pair()\n"
+            "print(len(PROFILER))\n"
+        )
+        result = _run(script, None)
+        assert result.stdout.strip() == "0" and result.stderr == ""
+        assert _run(script, "0").stdout.strip() == "0"
@@ -0,0 +1,92 @@
+"""Tests for referenced_tables() / referenced_columns()"""
+import pytest
+from recordsql import (
+    SELECT,
+    INSERT,
+    UPDATE,
+    DELETE,
+    COUNT,
+    EXISTS,
+    WITH,
+    Func,
+    Window,
+    col,
+    over,
+)
+
+
+@pytest.mark.references
+class TestReferences:
+    """Test structural dependency extraction"""
+
+    def test_select_with_join_and_where(self):
+        """Test a SELECT reports its table, JOIN table and every column"""
+        query = (
+            SELECT("users.name", "teams.title")
+            .FROM("users")
+            .INNER_JOIN("teams", on=col("users.team_id") == col("teams.id"))
+            .WHERE(col("users.active") == 1)
+            .ORDER_BY("users.name")
+        )
+        assert query.referenced_tables() == {"users", "teams"}
+        assert query.referenced_columns() == {
+            "users.name",
+            "teams.title",
+            "users.team_id",
+            "teams.id",
+            "users.active",
+        }
+
+    def test_select_star_and_expressions(self):
+        """Test * is not a column and expressions are walked"""
+        query = SELECT("*", Func("SUM", col("amount")).AS("total")).FROM("orders").GROUP_BY("customer_id")
+        assert query.referenced_columns() == {"amount", "customer_id"}
+
+    def test_with_subqueries_and_cte_names(self):
+        """Test WITH subqueries are walked and CTE names are not tables"""
+        recent = SELECT("user_id").FROM("orders").WHERE(col("ts") > 100).AS("recent")
+        query = WITH(recent).SELECT("name").FROM("recent").INNER_JOIN("users", on=col("users.id") == col("user_id"))
+        assert query.referenced_tables() == {"orders", "users"}
+        assert {"ts", "user_id", "name", "users.id"} <= query.referenced_columns()
+
+    def test_subquery_column_and_compound(self):
+        """Test subqueries used as columns and compound members"""
+        latest = SELECT(Func("MAX", col("ts"))).FROM("logins").AS("last_login")
+        query = SELECT("id", latest).FROM("users").UNION(SELECT("id", "ts").FROM("admins"))
+        assert query.referenced_tables() == {"users", "logins", "admins"}
+        assert query.referenced_columns() == {"id", "ts"}
+
+    def test_window_references(self):
+        """Test window partitions and orderings are columns"""
+        by_dept = Window().PARTITION_BY("dept").ORDER_BY(("salary", "DESC"))
+        query = SELECT("name", over(Func("RANK"), by_dept).AS("rank")).FROM("employees")
+        assert query.referenced_columns() == {"name", "dept", "salary"}
+
+    def test_write_queries(self):
+        """Test INSERT, UPDATE and DELETE references"""
+        upsert = INSERT("id", "name").INTO("users").VALUES(1, "ann").UPSERT(keys=["id"], where=col("locked") == 0)
+        assert upsert.referenced_tables() == {"users"}
+        assert upsert.referenced_columns() == {"id", "name", "excluded.name", "locked"}
+        update = UPDATE("users").SET(name=col("nickname")).WHERE(col("id") == 1).RETURNING("id")
+        assert update.referenced_columns() == {"name", "nickname", "id"}
+        bulk = UPDATE("users").FROM_VALUES([(1, "a")], key="id", columns=["id", "name"])
+        assert bulk.referenced_columns() == {"id", "name"}
+        delete = DELETE("sessions").WHERE_KEYS(["user_id", "device"], [(1, "x")])
+        assert delete.referenced_tables() == {"sessions"}
+        assert delete.referenced_columns() == {"user_id", "device"}
+
+    def test_count_and_exists(self):
+        """Test COUNT counters, groups and EXISTS conditions"""
+        counts = COUNT.multi({"active": col("active") == 1}, "users").BY("dept")
+        assert counts.referenced_columns() == {"active", "dept"}
+        assert EXISTS().FROM("bans").WHERE(col("user_id") == 3).referenced_tables() == {"bans"}
+
+    def test_memoized_until_changed(self):
+        """Test results are memoized per node and refreshed on change"""
+        query = SELECT("id").FROM("users")
+        first = query.referenced_tables()
+        assert query.referenced_tables() is first
+        query.FROM("accounts")
+        assert query.referenced_tables() == {"accounts"}
+        query.WHERE(col("owner") == 1)
+        assert query.referenced_columns() == {"id", "owner"}
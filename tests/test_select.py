@@ -1,6 +1,10 @@
 """Tests for SELECT queries"""
+import csv
+import gzip
+import json
+import sqlite3
 import pytest
-from recordsql import SELECT, cols, col, text, num
+from recordsql import SELECT, WITH, cols, col, text, num
 
 
 @pytest.mark.select
@@ -197,3 +201,185 @@ class TestSelectWithFunc:
         assert "SELECT name, age, email" in sql
 
         assert params == []
+
+
+@pytest.mark.select
+class TestSelectBoundLimit:
+    """Test LIMIT/OFFSET emitted as bound parameters"""
+
+    def test_bound_limit_offset(self):
+        """Test LIMIT ? OFFSET ? with values appended to params"""
+        age = col("age")
+        query = SELECT("name").FROM("users").WHERE(age > 18).LIMIT(10, bind=True).OFFSET(20)
+        sql, params = query.placeholder_pair()
+        assert sql.endswith("LIMIT ? OFFSET ?")
+        assert params == [18, 10, 20]
+
+    def test_bound_limit_sql_is_stable_across_pages(self):
+        """Test that each page renders the same SQL text"""
+        first = SELECT("name").FROM("users").LIMIT(10).OFFSET(0)
+        first.bind_limit_offset = True
+        second = first.copy_with(offset=10)
+        first_sql, first_params = first.placeholder_pair()
+        second_sql, second_params = second.placeholder_pair()
+        assert first_sql == second_sql
+        assert first_params == [10, 0]
+        assert second_params == [10, 10]
+
+    def test_bound_limit_in_with_subquery(self):
+        """Test bound LIMIT inside a WITH subquery keeps placeholder order"""
+        name, age = cols("name", "age")
+        inner = SELECT(name, age, bind_limit_offset=True).FROM("users").WHERE(age > 18).LIMIT(5)
+        query = WITH(inner.AS("adults")).SELECT(name).FROM("adults").WHERE(name == "Ann")
+        sql, params = query.placeholder_pair()
+        assert "LIMIT ?) SELECT" in sql
+        assert params == [18, 5, "Ann"]
+
+    def test_bound_limit_rejects_non_integer(self):
+        """Test that bound LIMIT still validates its value"""
+        query = SELECT().FROM("users").LIMIT("ten", bind=True)
+        with pytest.raises(ValueError):
+            query.placeholder_pair()
+
+
+def _readings():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE readings (id INTEGER, value REAL, label TEXT)")
+    conn.executemany(
+        "INSERT INTO readings VALUES (?, ?, ?)",
+        [(i, None if i % 4 == 3 else i / 2, f"r{i}") for i in range(10)],
+    )
+    return conn
+
+
+@pytest.mark.select
+class TestSelectColumnar:
+    """Test columnar result materialization"""
+
+    def test_lists_batches(self):
+        """Test batches follow fetchmany chunks and hold one list per column"""
+        reader = SELECT("id", "label").FROM("readings").column_batches(_readings(), "lists", batch_size=4)
+        assert reader.names == ["id", "label"]
+        batches = list(reader)
+        assert [len(batch["id"]) for batch in batches] == [4, 4, 2]
+        assert batches[0] == {"id": [0, 1, 2, 3], "label": ["r0", "r1", "r2", "r3"]}
+        assert reader.rows == 10
+
+    def test_lists_fetch_columns(self):
+        """Test fetch_columns concatenates every batch, and an empty result keeps its columns"""
+        query = SELECT("id", "value").FROM("readings").WHERE(col("id") < 4)
+        assert query.fetch_columns(_readings(), "lists", batch_size=3) == {
+            "id": [0, 1, 2, 3], "value": [0.0, 0.5, 1.0, None]
+        }
+        empty = SELECT("id").FROM("readings").WHERE(col("id") > 100).fetch_columns(_readings(), "lists")
+        assert empty == {"id": []}
+
+    def test_validation(self):
+        """Test unknown formats and batch sizes are rejected"""
+        query = SELECT("id").FROM("readings")
+        with pytest.raises(ValueError):
+            query.column_batches(_readings(), "parquet")
+        with pytest.raises(ValueError):
+            query.column_batches(_readings(), "lists", batch_size=0)
+
+    def test_numpy(self):
+        """Test NumPy columns: int64, float64 with NaN for NULL, object for text, across batches"""
+        numpy = pytest.importorskip("numpy")
+        columns = SELECT("id", "value", "label").FROM("readings").fetch_columns(_readings(), batch_size=3)
+        assert columns["id"].dtype == numpy.int64
+        assert columns["id"].tolist() == list(range(10))
+        assert columns["value"].dtype == numpy.float64
+        assert numpy.isnan(columns["value"][[3, 7]]).all()
+        assert columns["value"][2] == 1.0
+        assert columns["label"].dtype == object and columns["label"][9] == "r9"
+
+    def test_numpy_null_promotes_integers(self):
+        """Test an integer column that meets a NULL after the first batch becomes float64"""
+        numpy = pytest.importorskip("numpy")
+        conn = _readings()
+        conn.execute("INSERT INTO readings VALUES (NULL, 1.0, 'x')")
+        columns = SELECT("id").FROM("readings").fetch_columns(conn, batch_size=4)
+        assert columns["id"].dtype == numpy.float64
+        assert numpy.isnan(columns["id"][-1]) and columns["id"][9] == 9
+
+    def test_numpy_batches_keep_their_dtype(self):
+        """Test every batch keeps the first batch's dtype, a NULL in an int64 column raises, dtypes choose up front"""
+        numpy = pytest.importorskip("numpy")
+        conn = _readings()
+        conn.execute("INSERT INTO readings VALUES (NULL, 1, 'x')")
+        batches = list(SELECT("value", "label").FROM("readings").column_batches(conn, batch_size=4))
+        assert {batch["value"].dtype for batch in batches} == {numpy.dtype(numpy.float64)}
+        with pytest.raises(TypeError, match="dtypes"):
+            list(SELECT("id").FROM("readings").column_batches(conn, batch_size=4))
+        batches = list(SELECT("id").FROM("readings").column_batches(conn, batch_size=4, dtypes={"id": "float64"}))
+        assert {batch["id"].dtype for batch in batches} == {numpy.dtype(numpy.float64)}
+        assert numpy.isnan(batches[-1]["id"][-1]) and batches[0]["id"].tolist() == [0.0, 1.0, 2.0, 3.0]
+        columns = SELECT("id").FROM("readings").WHERE(col("id") > 100).fetch_columns(conn, dtypes={"id": "int64"})
+        assert columns["id"].dtype == numpy.int64
+        with pytest.raises(ValueError):
+            SELECT("id").FROM("readings").column_batches(conn, dtypes={"ts": "int64"})
+        with pytest.raises(ValueError):
+            SELECT("id").FROM("readings").column_batches(conn, "lists", dtypes={"id": "int64"})
+
+    def test_arrow(self):
+        """Test Arrow record batches keep the types inferred from the first batch"""
+        pyarrow = pytest.importorskip("pyarrow")
+        query = SELECT("id", "value", "label").FROM("readings")
+        batches = list(query.column_batches(_readings(), "arrow", batch_size=4))
+        assert all(isinstance(batch, pyarrow.RecordBatch) for batch in batches)
+        assert batches[0].schema == batches[-1].schema
+        table = query.fetch_columns(_readings(), "arrow", batch_size=4)
+        assert table.num_rows == 10
+        assert table.column("value").null_count == 2
+        assert table.column("label").to_pylist()[-1] == "r9"
+
+
+@pytest.mark.select
+class TestSelectExport:
+    """Test streaming CSV / JSON Lines export"""
+
+    def test_csv(self, tmp_path):
+        """Test a CSV export writes a header, every row and NULL as an empty field"""
+        path = tmp_path / "readings.csv"
+        stats = SELECT("id", "value", "label").FROM("readings").export(_readings(), path, batch=3)
+        assert (stats.rows, stats.batches, stats.format) == (10, 4, "csv")
+        assert stats.rows_per_second > 0
+        with open(path, newline="", encoding="utf-8") as file:
+            lines = list(csv.reader(file))
+        assert lines[0] == ["id", "value", "label"]
+        assert lines[1:5] == [["0", "0.0", "r0"], ["1", "0.5", "r1"], ["2", "1.0", "r2"], ["3", "", "r3"]]
+        assert len(lines) == 11
+
+    def test_jsonl_gzip_and_progress(self, tmp_path):
+        """Test a gzip-compressed JSON Lines export, BLOBs as hex and per-batch progress"""
+        conn = _readings()
+        conn.execute("CREATE TABLE blobs (id INTEGER, data BLOB)")
+        conn.execute("INSERT INTO blobs VALUES (1, x'00ff'), (2, NULL)")
+        path = tmp_path / "blobs.jsonl.gz"
+        progress = []
+        stats = SELECT("id", "data").FROM("blobs").export(conn, path, format="jsonl", batch=1, on_batch=progress.append)
+        assert [item.rows for item in progress] == [1, 2]
+        assert stats.rows == 2
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            assert [json.loads(line) for line in file] == [{"id": 1, "data": "00ff"}, {"id": 2, "data": None}]
+
+    def test_empty_and_validation(self, tmp_path):
+        """Test an empty result still writes the header, and bad formats or batches are rejected"""
+        path = tmp_path / "empty.csv"
+        stats = SELECT("id").FROM("readings").WHERE(col("id") > 100).export(_readings(), path)
+        assert (stats.rows, stats.batches) == (0, 0)
+        assert path.read_text() == "id\n"
+        with pytest.raises(ValueError):
+            SELECT("id").FROM("readings").export(_readings(), path, format="xml")
+        with pytest.raises(ValueError):
+            SELECT("id").FROM("readings").export(_readings(), path, batch=0)
+
+    def test_jsonl_rejects_duplicate_names(self, tmp_path):
+        """Test repeated column names are refused for JSON Lines, where they would collapse into one key"""
+        path = tmp_path / "dup.jsonl"
+        query = SELECT("id", "label", "id").FROM("readings")
+        with pytest.raises(ValueError, match="alias"):
+            query.export(_readings(), path, format="jsonl")
+        assert not path.exists()
+        query.export(_readings(), tmp_path / "dup.csv")
+        assert (tmp_path / "dup.csv").read_text().splitlines()[:2] == ["id,label,id", "0,r0,0"]
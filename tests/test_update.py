@@ -1,4 +1,5 @@
 """Tests for UPDATE queries"""
+import sqlite3
 import pytest
 from recordsql import UPDATE, cols, col, set_expr
 
@@ -154,3 +155,88 @@ class TestUpdateAdvanced:
         assert "RETURNING" in sql
         assert "active" in params
         assert 20 in params
+
+
+@pytest.mark.update
+class TestUpdateFromValues:
+    """Test bulk UPDATE ... FROM a VALUES source"""
+
+    def _connection(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, age INTEGER)")
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?)", [(i, f"user{i}", 20) for i in range(100)])
+        return conn
+
+    def test_from_values_sql(self):
+        """Test FROM_VALUES renders a VALUES CTE joined on the key"""
+        query = UPDATE("users").FROM_VALUES([(1, "Ann", 30), (2, "Bob", 40)], key="id", columns=["id", "name", "age"])
+        sql, params = query.placeholder_pair()
+        assert sql == (
+            'WITH v(id, name, age) AS (VALUES (?, ?, ?), (?, ?, ?)) '
+            'UPDATE "users" SET name = v.name, age = v.age FROM v WHERE "users".id = v.id'
+        )
+        assert params == [1, "Ann", 30, 2, "Bob", 40]
+
+    def test_from_values_dict_rows_with_set_where_returning(self):
+        """Test dict rows combined with SET, WHERE and RETURNING"""
+        query = (
+            UPDATE("users")
+            .FROM_VALUES([{"id": 1, "name": "Ann"}], key=["id"])
+            .SET(age=99)
+            .WHERE(col("users.age") > 10)
+            .RETURNING("id")
+        )
+        sql, params = query.placeholder_pair()
+        assert 'SET name = v.name, age = ? FROM v WHERE "users".id = v.id AND (users.age > ?) RETURNING id' in sql
+        assert params == [1, "Ann", 99, 10]
+
+    def test_from_values_chunks_respect_max_params(self):
+        """Test chunks from a generator respect max_params"""
+        query = UPDATE("users").FROM_VALUES(((i, f"new{i}") for i in range(10)), key="id", columns=["id", "name"])
+        chunks = query.placeholder_chunks(max_params=6)
+        sql, params = next(chunks)
+        assert params == [0, "new0", 1, "new1", 2, "new2"]
+        assert len(list(chunks)) == 3
+
+    def test_from_values_generator_renders_twice(self):
+        """Test rows from a generator are kept, so the query can be rendered again"""
+        query = UPDATE("users").FROM_VALUES(((i, f"new{i}") for i in range(3)), key="id", columns=["id", "name"])
+        assert query.placeholder_pair() == query.placeholder_pair()
+        assert [params for _, params in query.placeholder_chunks(max_params=4)] == [
+            [0, "new0", 1, "new1"], [2, "new2"]
+        ]
+
+    def test_from_values_pair_respects_param_limit(self):
+        """Test placeholder_pair refuses rows that need more than one statement"""
+        query = UPDATE("users").FROM_VALUES([(i, "x") for i in range(600)], key="id", columns=["id", "name"])
+        with pytest.raises(ValueError, match="placeholder_chunks"):
+            query.placeholder_pair()
+        assert len(list(query.placeholder_chunks())) == 2
+
+    def test_from_values_executes(self):
+        """Test chunked FROM_VALUES updates against SQLite"""
+        conn = self._connection()
+        rows = ([i, f"new{i}", i] for i in range(0, 100, 2))
+        query = UPDATE("users").FROM_VALUES(rows, key="id", columns=["id", "name", "age"])
+        for sql, params in query.placeholder_chunks(max_params=30):
+            conn.execute(sql, params)
+        assert conn.execute("SELECT COUNT(*) FROM users WHERE name LIKE 'new%'").fetchone() == (50,)
+        assert conn.execute("SELECT name, age FROM users WHERE id = 42").fetchone() == ("new42", 42)
+        assert conn.execute("SELECT name, age FROM users WHERE id = 43").fetchone() == ("user43", 20)
+
+    def test_from_values_composite_key(self):
+        """Test composite keys match on every key column"""
+        columns = ["user_id", "game_id", "score"]
+        query = UPDATE("scores").FROM_VALUES([(1, 2, 5)], key=["user_id", "game_id"], columns=columns)
+        sql, _ = query.placeholder_pair()
+        assert 'WHERE "scores".user_id = v.user_id AND "scores".game_id = v.game_id' in sql
+
+    def test_from_values_errors(self):
+        """Test FROM_VALUES validation"""
+        with pytest.raises(ValueError):
+            UPDATE("users").FROM_VALUES([(1, "Ann")], key="id").placeholder_pair()
+        with pytest.raises(ValueError):
+            UPDATE("users").FROM_VALUES([(1, "Ann")], key="uid", columns=["id", "name"]).placeholder_pair()
+        with pytest.raises(ValueError):
+            UPDATE("users").FROM_VALUES([], key="id", columns=["id", "name"]).placeholder_pair()
+        assert list(UPDATE("users").FROM_VALUES([], key="id", columns=["id"]).placeholder_chunks()) == []
@@ -0,0 +1,84 @@
+"""Tests for argument normalization and validation helpers"""
+import pytest
+from recordsql.dependencies import col
+from recordsql.types import SQLCol
+from recordsql.query import utils
+from recordsql.query.utils import normalize_args, _normalize_args, _resolve_types, enlist, validate_monolist
+from recordsql.validators import validate_name
+
+
+@pytest.mark.utils
+class TestNormalizeArgs:
+    """Test the dispatch of normalize_args"""
+
+    def test_dispatch_matches_reference(self):
+        """Test the decorator and _normalize_args agree for every argument shape and flag"""
+        samples = [(), ("a",), ("a", "b"), (["a", "b"],), (("a",),), (b"ab",), ({"k": 1},), (5,), (col("x"),),
+                   (range(3),), ({"a", "b"},)]
+        for flags in [{}, {"decompose_string": True}, {"decompose_bytes": True}, {"convert": False},
+                      {"ignore_dict": False}]:
+
+            @normalize_args(skip=1, **flags)
+            def method(self, *args):
+                return list(args)
+
+            for sample in samples:
+                assert method(None, *sample) == list(_normalize_args(*sample, **flags)), (sample, flags)
+            assert method(None, iter(["a", "b"])) == ["a", "b"]
+
+    def test_skip_and_kwargs(self):
+        """Test skipped arguments and keyword arguments pass through"""
+
+        @normalize_args(skip=2)
+        def method(first, second, *args, flag=False):
+            return first, second, args, flag
+
+        assert method(1, 2, ["a", "b"], flag=True) == (1, 2, ("a", "b"), True)
+        assert method(1, 2) == (1, 2, (), False)
+
+    def test_enlist(self):
+        """Test enlist for strings, bytes, iterables and scalars"""
+        assert enlist("ab") == ["ab"]
+        assert enlist("ab", decompose_string=True) == ["a", "b"]
+        assert enlist(b"ab") == [97, 98]
+        assert enlist(b"ab", decompose_bytes=False) == [b"ab"]
+        assert enlist(("a", "b")) == ["a", "b"]
+        assert enlist(("a", "b"), unpack=False) == [("a", "b")]
+        assert enlist(3) == [3]
+        assert utils._is_iterable_type(tuple) and not utils._is_iterable_type(int)
+
+
+@pytest.mark.utils
+class TestValidationCaches:
+    """Test the cached type resolution and name validation"""
+
+    def test_resolve_types_is_cached(self):
+        """Test Unions are unwrapped once and lists are accepted"""
+        utils._resolve_hashable_types.cache_clear()
+        assert str in _resolve_types(SQLCol)
+        _resolve_types(SQLCol)
+        assert utils._resolve_hashable_types.cache_info().hits == 1
+        assert _resolve_types([int, SQLCol])[0] is int
+        assert _resolve_types(None) is None
+        with pytest.raises(TypeError):
+            validate_monolist(1, 2, monotype=["int"])
+
+    def test_validate_monolist(self):
+        """Test mixed types are rejected"""
+        validate_monolist("a", "b", monotype=SQLCol)
+        with pytest.raises(TypeError):
+            validate_monolist("a", 1, monotype=SQLCol)
+        with pytest.raises(TypeError):
+            validate_monolist(1.5, 2.5, monotype=SQLCol)
+
+    def test_validate_name_remembers_valid_names_only(self):
+        """Test names are re-validated with other options and invalid names always raise"""
+        validate_name("users.id")
+        with pytest.raises(ValueError):
+            validate_name("users.id", allow_dot=False)
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                validate_name("select")
+        validate_name("a-b", forgiven_chars={"-"})
+        with pytest.raises(ValueError):
+            validate_name("a-b")
@@ -0,0 +1,98 @@
+"""Tests for window functions"""
+import sqlite3
+import pytest
+from recordsql import SELECT, WITH, Window, over, ROW_NUMBER, RANK, NTILE, LAG, Func, col, cols
+
+
+@pytest.fixture
+def conn():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE sales (dept TEXT, seller TEXT, amount INTEGER)")
+    connection.executemany(
+        "INSERT INTO sales VALUES (?, ?, ?)",
+        [("a", "ann", 10), ("a", "bob", 30), ("a", "cid", 20), ("b", "dan", 5), ("b", "eve", 15)],
+    )
+    yield connection
+    connection.close()
+
+
+@pytest.mark.window
+class TestWindowBasic:
+    """Test OVER clause rendering"""
+
+    def test_empty_over(self):
+        """Test a function over the whole result"""
+        sql, params = SELECT(over(Func("SUM", col("amount"))).AS("total")).FROM("sales").placeholder_pair()
+        assert sql == 'SELECT SUM(amount) OVER () AS total FROM "sales"'
+        assert params == []
+
+    def test_partition_and_order(self):
+        """Test PARTITION BY and ORDER BY inside OVER"""
+        window = Window().PARTITION_BY("dept").ORDER_BY((col("amount"), "DESC"))
+        sql, _ = SELECT("seller", over(RANK(), window).AS("rnk")).FROM("sales").placeholder_pair()
+        assert "RANK() OVER (PARTITION BY dept ORDER BY amount DESC) AS rnk" in sql
+
+    def test_rows_frame(self):
+        """Test ROWS BETWEEN frame bounds"""
+        window = Window().ORDER_BY(("seller", "ASC")).ROWS_BETWEEN("UNBOUNDED PRECEDING", 0)
+        spec, _ = window.placeholder_pair()
+        assert spec == "ORDER BY seller ASC ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW"
+        assert Window().ROWS_BETWEEN(-2, 2).placeholder_pair()[0] == "ROWS BETWEEN 2 PRECEDING AND 2 FOLLOWING"
+
+    def test_invalid_frame_bound(self):
+        """Test that unsafe frame bounds are rejected"""
+        with pytest.raises(ValueError):
+            Window().ROWS_BETWEEN("1; DROP TABLE x").placeholder_pair()
+
+    def test_function_params_are_kept(self):
+        """Test that function arguments are bound in column order"""
+        sql, params = (
+            SELECT(over(NTILE(4), Window().ORDER_BY("amount")).AS("quartile"))
+            .FROM("sales")
+            .WHERE(col("amount") > 1)
+            .placeholder_pair()
+        )
+        assert "NTILE(?) OVER (ORDER BY amount DESC)" in sql
+        assert params == [4, 1]
+
+
+@pytest.mark.window
+class TestWindowAdvanced:
+    """Test named windows and execution"""
+
+    def test_named_window_clause(self):
+        """Test WINDOW clause placement and references"""
+        query = (
+            SELECT("seller", over(ROW_NUMBER(), "w").AS("rn"), over(LAG(col("amount")), "w").AS("prev"))
+            .FROM("sales")
+            .WINDOW(w=Window().PARTITION_BY("dept").ORDER_BY(("amount", "ASC")))
+            .ORDER_BY("seller", "ASC")
+        )
+        sql, params = query.placeholder_pair()
+        assert "ROW_NUMBER() OVER w AS rn" in sql
+        assert "WINDOW w AS (PARTITION BY dept ORDER BY amount ASC) ORDER BY seller ASC" in sql
+        assert params == [1]
+
+    def test_window_function_in_order_by(self):
+        """Test ordering by a window function"""
+        ranked = over(RANK(), Window().ORDER_BY(("amount", "DESC")))
+        sql, _ = SELECT("seller").FROM("sales").ORDER_BY((ranked, "ASC")).placeholder_pair()
+        assert "ORDER BY RANK() OVER (ORDER BY amount DESC) ASC" in sql
+
+    def test_running_total(self, conn):
+        """Test a running total computed in SQLite"""
+        to_date = Window().ORDER_BY(("amount", "ASC")).ROWS_BETWEEN("UNBOUNDED PRECEDING")
+        running = over(Func("SUM", col("amount")), to_date)
+        sql, params = SELECT("amount", running.AS("total")).FROM("sales").ORDER_BY(("amount", "ASC")).placeholder_pair()
+        totals = [row[1] for row in conn.execute(sql, params)]
+        assert totals == [5, 15, 30, 50, 80]
+
+    def test_top_n_per_group(self, conn):
+        """Test top-N-per-group through a CTE"""
+        dept, seller, amount, rn = cols("dept", "seller", "amount", "rn")
+        ranked = SELECT(
+            dept, seller, over(ROW_NUMBER(), Window().PARTITION_BY(dept).ORDER_BY((amount, "DESC"))).AS("rn")
+        ).FROM("sales")
+        query = WITH(ranked.AS("ranked")).SELECT(dept, seller).FROM("ranked").WHERE(rn <= 1).ORDER_BY(("dept", "ASC"))
+        sql, params = query.placeholder_pair()
+        assert conn.execute(sql, params).fetchall() == [("a", "bob"), ("b", "eve")]
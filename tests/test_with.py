@@ -1,6 +1,7 @@
 """Tests for WITH (CTE) queries"""
+import sqlite3
 import pytest
-from recordsql import WITH, SELECT, cols, col, text
+from recordsql import WITH, SELECT, WithQuery, cols, col, num, text
 
 
 @pytest.mark.with_query
@@ -170,3 +171,78 @@ class TestWithAdvanced:
         assert "electronics AS" in sql
         assert "Electronics" in params
         assert "available" in params
+
+
+@pytest.mark.with_query
+class TestWithRecursive:
+    """Test recursive CTEs, column lists and materialization hints"""
+
+    def test_column_list_and_materialized(self):
+        """Test alias(a, b) AS MATERIALIZED (...)"""
+        name, age = cols("name", "age")
+        cte = WithQuery(SELECT(name, age).FROM("users"), "people", columns=["n", "a"]).MATERIALIZED()
+        sql, _ = WITH(cte).SELECT("n").FROM("people").placeholder_pair()
+        assert sql.startswith('WITH people(n, a) AS MATERIALIZED (SELECT name, age FROM "users")')
+
+    def test_not_materialized(self):
+        """Test NOT MATERIALIZED hint"""
+        cte = WithQuery(SELECT("id").FROM("users"), "ids").NOT_MATERIALIZED()
+        sql, _ = cte.placeholder_pair()
+        assert sql == 'WITH ids AS NOT MATERIALIZED (SELECT id FROM "users")'
+
+    def test_recursive_keyword_applies_to_clause(self):
+        """Test that one recursive CTE renders WITH RECURSIVE once"""
+        plain = WithQuery(SELECT("id").FROM("roots"), "r")
+        tree = WithQuery(SELECT("id").FROM("r").UNION_ALL(SELECT("id").FROM("tree")), "tree").RECURSIVE()
+        sql, _ = WITH(plain, tree).SELECT("id").FROM("tree").placeholder_pair()
+        assert sql.startswith("WITH RECURSIVE r AS (")
+        assert sql.count("RECURSIVE") == 1
+
+    def test_recursive_placeholder_order(self):
+        """Test anchor params precede recursive member params, then the outer query"""
+        node_id, parent_id, depth = cols("id", "parent_id", "depth")
+        anchor = SELECT(node_id, num(0)).FROM("nodes").WHERE(node_id == 1)
+        step = (
+            SELECT(col("nodes.id"), col("tree.depth") + 1)
+            .FROM("nodes")
+            .INNER_JOIN("tree", on=(parent_id == col("tree.id")))
+            .WHERE(col("tree.depth") < 5)
+        )
+        tree = WithQuery(anchor.UNION_ALL(step), "tree", columns=["id", "depth"])
+        query = WITH(tree, recursive=True).SELECT(node_id).FROM("tree").WHERE(depth > 0)
+        sql, params = query.placeholder_pair()
+        assert sql.startswith("WITH RECURSIVE tree(id, depth) AS (")
+        assert params == [0, 1, 1, 5, 0]
+
+    def test_recursive_flag_does_not_leak_into_reused_ctes(self):
+        """Test WITH(..., recursive=True) leaves the caller's CTE objects untouched"""
+        cte = WithQuery(SELECT("id").FROM("users"), "ids")
+        recursive_sql, _ = WITH(cte, recursive=True).SELECT("id").FROM("ids").placeholder_pair()
+        assert recursive_sql.startswith("WITH RECURSIVE ids AS (")
+        assert cte.recursive is False
+        sql, _ = WITH(cte).SELECT("id").FROM("ids").placeholder_pair()
+        assert sql.startswith("WITH ids AS (")
+
+    def test_recursive_tree_walk(self):
+        """Test walking a tree in a single statement"""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE nodes (id INTEGER PRIMARY KEY, parent_id INTEGER)")
+        conn.executemany("INSERT INTO nodes VALUES (?, ?)", [(1, None), (2, 1), (3, 2), (4, 2), (5, None)])
+        node_id, parent_id = cols("id", "parent_id")
+        anchor = SELECT(node_id).FROM("nodes").WHERE(node_id == 2)
+        step = SELECT(col("nodes.id")).FROM("nodes").INNER_JOIN("subtree", on=(parent_id == col("subtree.id")))
+        subtree = WithQuery(anchor.UNION_ALL(step), "subtree", columns=["id"], recursive=True)
+        sql, params = WITH(subtree).SELECT(node_id).FROM("subtree").ORDER_BY(node_id, "ASC").placeholder_pair()
+        assert conn.execute(sql, params).fetchall() == [(2,), (3,), (4,)]
+
+    def test_copy_keeps_cte_options(self):
+        """Test that WithQuery.copy keeps column list and hints"""
+        cte = WithQuery(SELECT("id").FROM("users"), "ids", columns=["x"], materialized=False, recursive=True)
+        copied = cte.copy()
+        assert copied.placeholder_pair() == cte.placeholder_pair()
+
+    def test_with_query_of_with_query(self):
+        """Test wrapping an existing WithQuery returns it unchanged"""
+        cte = WithQuery(SELECT("id").FROM("users"), "ids")
+        assert WithQuery(cte) is cte
+        assert cte.query is not cte